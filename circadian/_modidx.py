@@ -7,6 +7,34 @@ d = { 'settings': { 'branch': 'main',
                 'lib_path': 'circadian'},
   'syms': { 'circadian.cli': { 'circadian.cli.main_acto': ('api/cli.html#main_acto', 'circadian/cli.py'),
                                'circadian.cli.main_esri': ('api/cli.html#main_esri', 'circadian/cli.py')},
+            'circadian.entrainment': { 'circadian.entrainment._cell_executor': ( 'api/entrainment.html#_cell_executor',
+                                                                                 'circadian/entrainment.py'),
+                                       'circadian.entrainment._circular_mean': ( 'api/entrainment.html#_circular_mean',
+                                                                                 'circadian/entrainment.py'),
+                                       'circadian.entrainment._day_error': ('api/entrainment.html#_day_error', 'circadian/entrainment.py'),
+                                       'circadian.entrainment._entrained_states': ( 'api/entrainment.html#_entrained_states',
+                                                                                    'circadian/entrainment.py'),
+                                       'circadian.entrainment._entrainment_cells': ( 'api/entrainment.html#_entrainment_cells',
+                                                                                     'circadian/entrainment.py'),
+                                       'circadian.entrainment._midpoint': ('api/entrainment.html#_midpoint', 'circadian/entrainment.py'),
+                                       'circadian.entrainment._model_key': ('api/entrainment.html#_model_key', 'circadian/entrainment.py'),
+                                       'circadian.entrainment._simulate_cells': ( 'api/entrainment.html#_simulate_cells',
+                                                                                  'circadian/entrainment.py'),
+                                       'circadian.entrainment.entrainment_map': ( 'api/entrainment.html#entrainment_map',
+                                                                                  'circadian/entrainment.py'),
+                                       'circadian.entrainment.reentrainment_time': ( 'api/entrainment.html#reentrainment_time',
+                                                                                     'circadian/entrainment.py'),
+                                       'circadian.entrainment.stroboscopic_map': ( 'api/entrainment.html#stroboscopic_map',
+                                                                                   'circadian/entrainment.py')},
+            'circadian.kernels': { 'circadian.kernels._forger99_derv': ('api/kernels.html#_forger99_derv', 'circadian/kernels.py'),
+                                   'circadian.kernels._hannay19_derv': ('api/kernels.html#_hannay19_derv', 'circadian/kernels.py'),
+                                   'circadian.kernels._hannay19tp_derv': ('api/kernels.html#_hannay19tp_derv', 'circadian/kernels.py'),
+                                   'circadian.kernels._jewett99_derv': ('api/kernels.html#_jewett99_derv', 'circadian/kernels.py'),
+                                   'circadian.kernels._rk4_kernel': ('api/kernels.html#_rk4_kernel', 'circadian/kernels.py'),
+                                   'circadian.kernels._simulate_unchecked': ( 'api/kernels.html#_simulate_unchecked',
+                                                                              'circadian/kernels.py'),
+                                   'circadian.kernels.simulate': ('api/kernels.html#simulate', 'circadian/kernels.py'),
+                                   'circadian.kernels.simulate_batch': ('api/kernels.html#simulate_batch', 'circadian/kernels.py')},
             'circadian.lights': { 'circadian.lights.LightSchedule': ('api/lights.html#lightschedule', 'circadian/lights.py'),
                                   'circadian.lights.LightSchedule.Regular': ( 'api/lights.html#lightschedule.regular',
                                                                               'circadian/lights.py'),
@@ -20,21 +48,157 @@ d = { 'settings': { 'branch': 'main',
                                                                               'circadian/lights.py'),
                                   'circadian.lights.LightSchedule.__call__': ( 'api/lights.html#lightschedule.__call__',
                                                                                'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule.__eq__': ('api/lights.html#lightschedule.__eq__', 'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule.__hash__': ( 'api/lights.html#lightschedule.__hash__',
+                                                                               'circadian/lights.py'),
                                   'circadian.lights.LightSchedule.__init__': ( 'api/lights.html#lightschedule.__init__',
                                                                                'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule.__reduce__': ( 'api/lights.html#lightschedule.__reduce__',
+                                                                                 'circadian/lights.py'),
                                   'circadian.lights.LightSchedule.__sub__': ( 'api/lights.html#lightschedule.__sub__',
                                                                               'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule._exact_integral': ( 'api/lights.html#lightschedule._exact_integral',
+                                                                                      'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule._from_expression': ( 'api/lights.html#lightschedule._from_expression',
+                                                                                       'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule._func': ('api/lights.html#lightschedule._func', 'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule._hash_key': ( 'api/lights.html#lightschedule._hash_key',
+                                                                                'circadian/lights.py'),
                                   'circadian.lights.LightSchedule.concatenate_at': ( 'api/lights.html#lightschedule.concatenate_at',
                                                                                      'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule.expression': ( 'api/lights.html#lightschedule.expression',
+                                                                                 'circadian/lights.py'),
                                   'circadian.lights.LightSchedule.from_pulse': ( 'api/lights.html#lightschedule.from_pulse',
                                                                                  'circadian/lights.py'),
-                                  'circadian.lights.LightSchedule.plot': ('api/lights.html#lightschedule.plot', 'circadian/lights.py')},
-            'circadian.metrics': {'circadian.metrics.esri': ('api/metrics.html#esri', 'circadian/metrics.py')},
+                                  'circadian.lights.LightSchedule.from_samples': ( 'api/lights.html#lightschedule.from_samples',
+                                                                                   'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule.from_smooth_pulses': ( 'api/lights.html#lightschedule.from_smooth_pulses',
+                                                                                         'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule.from_spec': ( 'api/lights.html#lightschedule.from_spec',
+                                                                                'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule.integral': ( 'api/lights.html#lightschedule.integral',
+                                                                               'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule.plot': ('api/lights.html#lightschedule.plot', 'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule.sample': ('api/lights.html#lightschedule.sample', 'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule.time_above': ( 'api/lights.html#lightschedule.time_above',
+                                                                                 'circadian/lights.py'),
+                                  'circadian.lights.LightSchedule.to_spec': ( 'api/lights.html#lightschedule.to_spec',
+                                                                              'circadian/lights.py'),
+                                  'circadian.lights.ScheduleBank': ('api/lights.html#schedulebank', 'circadian/lights.py'),
+                                  'circadian.lights.ScheduleBank.__call__': ( 'api/lights.html#schedulebank.__call__',
+                                                                              'circadian/lights.py'),
+                                  'circadian.lights.ScheduleBank.__getitem__': ( 'api/lights.html#schedulebank.__getitem__',
+                                                                                 'circadian/lights.py'),
+                                  'circadian.lights.ScheduleBank.__init__': ( 'api/lights.html#schedulebank.__init__',
+                                                                              'circadian/lights.py'),
+                                  'circadian.lights.ScheduleBank.__len__': ('api/lights.html#schedulebank.__len__', 'circadian/lights.py'),
+                                  'circadian.lights.ScheduleBank.__repr__': ( 'api/lights.html#schedulebank.__repr__',
+                                                                              'circadian/lights.py'),
+                                  'circadian.lights.ScheduleBank._flat_table': ( 'api/lights.html#schedulebank._flat_table',
+                                                                                 'circadian/lights.py'),
+                                  'circadian.lights.ScheduleBank._from_structures': ( 'api/lights.html#schedulebank._from_structures',
+                                                                                      'circadian/lights.py'),
+                                  'circadian.lights._Combination': ('api/lights.html#_combination', 'circadian/lights.py'),
+                                  'circadian.lights._Combination.__call__': ( 'api/lights.html#_combination.__call__',
+                                                                              'circadian/lights.py'),
+                                  'circadian.lights._Combination.__init__': ( 'api/lights.html#_combination.__init__',
+                                                                              'circadian/lights.py'),
+                                  'circadian.lights._Combination.__repr__': ( 'api/lights.html#_combination.__repr__',
+                                                                              'circadian/lights.py'),
+                                  'circadian.lights._Combination._describe': ( 'api/lights.html#_combination._describe',
+                                                                               'circadian/lights.py'),
+                                  'circadian.lights._Combination.window': ('api/lights.html#_combination.window', 'circadian/lights.py'),
+                                  'circadian.lights._Function': ('api/lights.html#_function', 'circadian/lights.py'),
+                                  'circadian.lights._Function.__call__': ('api/lights.html#_function.__call__', 'circadian/lights.py'),
+                                  'circadian.lights._Function.__init__': ('api/lights.html#_function.__init__', 'circadian/lights.py'),
+                                  'circadian.lights._Function.__repr__': ('api/lights.html#_function.__repr__', 'circadian/lights.py'),
+                                  'circadian.lights._Function._describe': ('api/lights.html#_function._describe', 'circadian/lights.py'),
+                                  'circadian.lights._Periodic': ('api/lights.html#_periodic', 'circadian/lights.py'),
+                                  'circadian.lights._Periodic.__call__': ('api/lights.html#_periodic.__call__', 'circadian/lights.py'),
+                                  'circadian.lights._Periodic.__init__': ('api/lights.html#_periodic.__init__', 'circadian/lights.py'),
+                                  'circadian.lights._Periodic.__repr__': ('api/lights.html#_periodic.__repr__', 'circadian/lights.py'),
+                                  'circadian.lights._Periodic._describe': ('api/lights.html#_periodic._describe', 'circadian/lights.py'),
+                                  'circadian.lights._Piecewise': ('api/lights.html#_piecewise', 'circadian/lights.py'),
+                                  'circadian.lights._Piecewise.__call__': ('api/lights.html#_piecewise.__call__', 'circadian/lights.py'),
+                                  'circadian.lights._Piecewise.__init__': ('api/lights.html#_piecewise.__init__', 'circadian/lights.py'),
+                                  'circadian.lights._Piecewise.__repr__': ('api/lights.html#_piecewise.__repr__', 'circadian/lights.py'),
+                                  'circadian.lights._Piecewise._describe': ('api/lights.html#_piecewise._describe', 'circadian/lights.py'),
+                                  'circadian.lights._Piecewise.window': ('api/lights.html#_piecewise.window', 'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant': ('api/lights.html#_piecewiseconstant', 'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant.__call__': ( 'api/lights.html#_piecewiseconstant.__call__',
+                                                                                    'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant.__init__': ( 'api/lights.html#_piecewiseconstant.__init__',
+                                                                                    'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant.__repr__': ( 'api/lights.html#_piecewiseconstant.__repr__',
+                                                                                    'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant._describe': ( 'api/lights.html#_piecewiseconstant._describe',
+                                                                                     'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant._segment_index': ( 'api/lights.html#_piecewiseconstant._segment_index',
+                                                                                          'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant.antiderivative': ( 'api/lights.html#_piecewiseconstant.antiderivative',
+                                                                                          'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant.combine': ( 'api/lights.html#_piecewiseconstant.combine',
+                                                                                   'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant.compatible': ( 'api/lights.html#_piecewiseconstant.compatible',
+                                                                                      'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant.is_constant': ( 'api/lights.html#_piecewiseconstant.is_constant',
+                                                                                       'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant.shifted': ( 'api/lights.html#_piecewiseconstant.shifted',
+                                                                                   'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant.stitch': ( 'api/lights.html#_piecewiseconstant.stitch',
+                                                                                  'circadian/lights.py'),
+                                  'circadian.lights._PiecewiseConstant.window': ( 'api/lights.html#_piecewiseconstant.window',
+                                                                                  'circadian/lights.py'),
+                                  'circadian.lights._Samples': ('api/lights.html#_samples', 'circadian/lights.py'),
+                                  'circadian.lights._Samples.__call__': ('api/lights.html#_samples.__call__', 'circadian/lights.py'),
+                                  'circadian.lights._Samples.__init__': ('api/lights.html#_samples.__init__', 'circadian/lights.py'),
+                                  'circadian.lights._Samples.__repr__': ('api/lights.html#_samples.__repr__', 'circadian/lights.py'),
+                                  'circadian.lights._Samples._describe': ('api/lights.html#_samples._describe', 'circadian/lights.py'),
+                                  'circadian.lights._SmoothPulses': ('api/lights.html#_smoothpulses', 'circadian/lights.py'),
+                                  'circadian.lights._SmoothPulses.__call__': ( 'api/lights.html#_smoothpulses.__call__',
+                                                                               'circadian/lights.py'),
+                                  'circadian.lights._SmoothPulses.__init__': ( 'api/lights.html#_smoothpulses.__init__',
+                                                                               'circadian/lights.py'),
+                                  'circadian.lights._SmoothPulses.__repr__': ( 'api/lights.html#_smoothpulses.__repr__',
+                                                                               'circadian/lights.py'),
+                                  'circadian.lights._SmoothPulses._describe': ( 'api/lights.html#_smoothpulses._describe',
+                                                                                'circadian/lights.py'),
+                                  'circadian.lights._combine_expressions': ('api/lights.html#_combine_expressions', 'circadian/lights.py'),
+                                  'circadian.lights._concatenate_expressions': ( 'api/lights.html#_concatenate_expressions',
+                                                                                 'circadian/lights.py'),
+                                  'circadian.lights._describe_children': ('api/lights.html#_describe_children', 'circadian/lights.py'),
+                                  'circadian.lights._expression_from_spec': ( 'api/lights.html#_expression_from_spec',
+                                                                              'circadian/lights.py'),
+                                  'circadian.lights._expression_spec': ('api/lights.html#_expression_spec', 'circadian/lights.py'),
+                                  'circadian.lights._grid_method': ('api/lights.html#_grid_method', 'circadian/lights.py'),
+                                  'circadian.lights._is_zero': ('api/lights.html#_is_zero', 'circadian/lights.py'),
+                                  'circadian.lights._records_constructor': ('api/lights.html#_records_constructor', 'circadian/lights.py'),
+                                  'circadian.lights._repeat_expression': ('api/lights.html#_repeat_expression', 'circadian/lights.py'),
+                                  'circadian.lights._scale_expression': ('api/lights.html#_scale_expression', 'circadian/lights.py')},
+            'circadian.metrics': { 'circadian.metrics.IncrementalESRI': ('api/metrics.html#incrementalesri', 'circadian/metrics.py'),
+                                   'circadian.metrics.IncrementalESRI.__init__': ( 'api/metrics.html#incrementalesri.__init__',
+                                                                                   'circadian/metrics.py'),
+                                   'circadian.metrics.IncrementalESRI.__repr__': ( 'api/metrics.html#incrementalesri.__repr__',
+                                                                                   'circadian/metrics.py'),
+                                   'circadian.metrics.IncrementalESRI.load': ( 'api/metrics.html#incrementalesri.load',
+                                                                               'circadian/metrics.py'),
+                                   'circadian.metrics.IncrementalESRI.save': ( 'api/metrics.html#incrementalesri.save',
+                                                                               'circadian/metrics.py'),
+                                   'circadian.metrics.IncrementalESRI.update': ( 'api/metrics.html#incrementalesri.update',
+                                                                                 'circadian/metrics.py'),
+                                   'circadian.metrics._esri_chunk': ('api/metrics.html#_esri_chunk', 'circadian/metrics.py'),
+                                   'circadian.metrics._esri_parameter_checking': ( 'api/metrics.html#_esri_parameter_checking',
+                                                                                   'circadian/metrics.py'),
+                                   'circadian.metrics._esri_windows': ('api/metrics.html#_esri_windows', 'circadian/metrics.py'),
+                                   'circadian.metrics._window_light': ('api/metrics.html#_window_light', 'circadian/metrics.py'),
+                                   'circadian.metrics.esri': ('api/metrics.html#esri', 'circadian/metrics.py')},
             'circadian.models': { 'circadian.models.CircadianModel': ('api/models.html#circadianmodel', 'circadian/models.py'),
                                   'circadian.models.CircadianModel.__call__': ( 'api/models.html#circadianmodel.__call__',
                                                                                 'circadian/models.py'),
                                   'circadian.models.CircadianModel.__init__': ( 'api/models.html#circadianmodel.__init__',
                                                                                 'circadian/models.py'),
+                                  'circadian.models.CircadianModel._cbt_signal': ( 'api/models.html#circadianmodel._cbt_signal',
+                                                                                   'circadian/models.py'),
                                   'circadian.models.CircadianModel._default_initial_condition': ( 'api/models.html#circadianmodel._default_initial_condition',
                                                                                                   'circadian/models.py'),
                                   'circadian.models.CircadianModel._default_params': ( 'api/models.html#circadianmodel._default_params',
@@ -74,12 +238,25 @@ d = { 'settings': { 'branch': 'main',
                                                                                     'circadian/models.py'),
                                   'circadian.models.DynamicalTrajectory.__str__': ( 'api/models.html#dynamicaltrajectory.__str__',
                                                                                     'circadian/models.py'),
+                                  'circadian.models.DynamicalTrajectory._state': ( 'api/models.html#dynamicaltrajectory._state',
+                                                                                   'circadian/models.py'),
+                                  'circadian.models.DynamicalTrajectory._state_position': ( 'api/models.html#dynamicaltrajectory._state_position',
+                                                                                            'circadian/models.py'),
+                                  'circadian.models.DynamicalTrajectory._trusted': ( 'api/models.html#dynamicaltrajectory._trusted',
+                                                                                     'circadian/models.py'),
+                                  'circadian.models.DynamicalTrajectory.concat': ( 'api/models.html#dynamicaltrajectory.concat',
+                                                                                   'circadian/models.py'),
+                                  'circadian.models.DynamicalTrajectory.from_file': ( 'api/models.html#dynamicaltrajectory.from_file',
+                                                                                      'circadian/models.py'),
                                   'circadian.models.DynamicalTrajectory.get_batch': ( 'api/models.html#dynamicaltrajectory.get_batch',
                                                                                       'circadian/models.py'),
+                                  'circadian.models.DynamicalTrajectory.window': ( 'api/models.html#dynamicaltrajectory.window',
+                                                                                   'circadian/models.py'),
                                   'circadian.models.Forger99': ('api/models.html#forger99', 'circadian/models.py'),
                                   'circadian.models.Forger99.__init__': ('api/models.html#forger99.__init__', 'circadian/models.py'),
                                   'circadian.models.Forger99.__repr__': ('api/models.html#forger99.__repr__', 'circadian/models.py'),
                                   'circadian.models.Forger99.__str__': ('api/models.html#forger99.__str__', 'circadian/models.py'),
+                                  'circadian.models.Forger99._cbt_signal': ('api/models.html#forger99._cbt_signal', 'circadian/models.py'),
                                   'circadian.models.Forger99.amplitude': ('api/models.html#forger99.amplitude', 'circadian/models.py'),
                                   'circadian.models.Forger99.cbt': ('api/models.html#forger99.cbt', 'circadian/models.py'),
                                   'circadian.models.Forger99.derv': ('api/models.html#forger99.derv', 'circadian/models.py'),
@@ -90,6 +267,7 @@ d = { 'settings': { 'branch': 'main',
                                   'circadian.models.Hannay19.__init__': ('api/models.html#hannay19.__init__', 'circadian/models.py'),
                                   'circadian.models.Hannay19.__repr__': ('api/models.html#hannay19.__repr__', 'circadian/models.py'),
                                   'circadian.models.Hannay19.__str__': ('api/models.html#hannay19.__str__', 'circadian/models.py'),
+                                  'circadian.models.Hannay19._cbt_signal': ('api/models.html#hannay19._cbt_signal', 'circadian/models.py'),
                                   'circadian.models.Hannay19.amplitude': ('api/models.html#hannay19.amplitude', 'circadian/models.py'),
                                   'circadian.models.Hannay19.cbt': ('api/models.html#hannay19.cbt', 'circadian/models.py'),
                                   'circadian.models.Hannay19.derv': ('api/models.html#hannay19.derv', 'circadian/models.py'),
@@ -100,6 +278,8 @@ d = { 'settings': { 'branch': 'main',
                                   'circadian.models.Hannay19TP.__init__': ('api/models.html#hannay19tp.__init__', 'circadian/models.py'),
                                   'circadian.models.Hannay19TP.__repr__': ('api/models.html#hannay19tp.__repr__', 'circadian/models.py'),
                                   'circadian.models.Hannay19TP.__str__': ('api/models.html#hannay19tp.__str__', 'circadian/models.py'),
+                                  'circadian.models.Hannay19TP._cbt_signal': ( 'api/models.html#hannay19tp._cbt_signal',
+                                                                               'circadian/models.py'),
                                   'circadian.models.Hannay19TP.amplitude': ('api/models.html#hannay19tp.amplitude', 'circadian/models.py'),
                                   'circadian.models.Hannay19TP.cbt': ('api/models.html#hannay19tp.cbt', 'circadian/models.py'),
                                   'circadian.models.Hannay19TP.derv': ('api/models.html#hannay19tp.derv', 'circadian/models.py'),
@@ -110,6 +290,8 @@ d = { 'settings': { 'branch': 'main',
                                   'circadian.models.Hilaire07.__init__': ('api/models.html#hilaire07.__init__', 'circadian/models.py'),
                                   'circadian.models.Hilaire07.__repr__': ('api/models.html#hilaire07.__repr__', 'circadian/models.py'),
                                   'circadian.models.Hilaire07.__str__': ('api/models.html#hilaire07.__str__', 'circadian/models.py'),
+                                  'circadian.models.Hilaire07._cbt_signal': ( 'api/models.html#hilaire07._cbt_signal',
+                                                                              'circadian/models.py'),
                                   'circadian.models.Hilaire07.amplitude': ('api/models.html#hilaire07.amplitude', 'circadian/models.py'),
                                   'circadian.models.Hilaire07.cbt': ('api/models.html#hilaire07.cbt', 'circadian/models.py'),
                                   'circadian.models.Hilaire07.derv': ('api/models.html#hilaire07.derv', 'circadian/models.py'),
@@ -120,6 +302,7 @@ d = { 'settings': { 'branch': 'main',
                                   'circadian.models.Jewett99.__init__': ('api/models.html#jewett99.__init__', 'circadian/models.py'),
                                   'circadian.models.Jewett99.__repr__': ('api/models.html#jewett99.__repr__', 'circadian/models.py'),
                                   'circadian.models.Jewett99.__str__': ('api/models.html#jewett99.__str__', 'circadian/models.py'),
+                                  'circadian.models.Jewett99._cbt_signal': ('api/models.html#jewett99._cbt_signal', 'circadian/models.py'),
                                   'circadian.models.Jewett99.amplitude': ('api/models.html#jewett99.amplitude', 'circadian/models.py'),
                                   'circadian.models.Jewett99.cbt': ('api/models.html#jewett99.cbt', 'circadian/models.py'),
                                   'circadian.models.Jewett99.derv': ('api/models.html#jewett99.derv', 'circadian/models.py'),
@@ -140,15 +323,50 @@ d = { 'settings': { 'branch': 'main',
                                                                                   'circadian/models.py'),
                                   'circadian.models._positive_int_checking': ( 'api/models.html#_positive_int_checking',
                                                                                'circadian/models.py'),
+                                  'circadian.models._save_states_input_checking': ( 'api/models.html#_save_states_input_checking',
+                                                                                    'circadian/models.py'),
                                   'circadian.models._state_input_checking': ( 'api/models.html#_state_input_checking',
                                                                               'circadian/models.py'),
                                   'circadian.models._time_input_checking': ('api/models.html#_time_input_checking', 'circadian/models.py'),
                                   'circadian.models._wake_input_checking': ('api/models.html#_wake_input_checking', 'circadian/models.py')},
+            'circadian.parallel': { 'circadian.parallel.SimulationExecutor': ( 'api/parallel.html#simulationexecutor',
+                                                                               'circadian/parallel.py'),
+                                    'circadian.parallel.SimulationExecutor.__enter__': ( 'api/parallel.html#simulationexecutor.__enter__',
+                                                                                         'circadian/parallel.py'),
+                                    'circadian.parallel.SimulationExecutor.__exit__': ( 'api/parallel.html#simulationexecutor.__exit__',
+                                                                                        'circadian/parallel.py'),
+                                    'circadian.parallel.SimulationExecutor.__init__': ( 'api/parallel.html#simulationexecutor.__init__',
+                                                                                        'circadian/parallel.py'),
+                                    'circadian.parallel.SimulationExecutor.cancel': ( 'api/parallel.html#simulationexecutor.cancel',
+                                                                                      'circadian/parallel.py'),
+                                    'circadian.parallel.SimulationExecutor.run': ( 'api/parallel.html#simulationexecutor.run',
+                                                                                   'circadian/parallel.py'),
+                                    'circadian.parallel.SimulationExecutor.shutdown': ( 'api/parallel.html#simulationexecutor.shutdown',
+                                                                                        'circadian/parallel.py'),
+                                    'circadian.parallel._align_markers': ('api/parallel.html#_align_markers', 'circadian/parallel.py'),
+                                    'circadian.parallel._attach_shared_array': ( 'api/parallel.html#_attach_shared_array',
+                                                                                 'circadian/parallel.py'),
+                                    'circadian.parallel._batch_chunks': ('api/parallel.html#_batch_chunks', 'circadian/parallel.py'),
+                                    'circadian.parallel._create_shared_array': ( 'api/parallel.html#_create_shared_array',
+                                                                                 'circadian/parallel.py'),
+                                    'circadian.parallel._init_worker': ('api/parallel.html#_init_worker', 'circadian/parallel.py'),
+                                    'circadian.parallel._model_markers': ('api/parallel.html#_model_markers', 'circadian/parallel.py'),
+                                    'circadian.parallel._simulate_chunk': ('api/parallel.html#_simulate_chunk', 'circadian/parallel.py'),
+                                    'circadian.parallel.compare_models': ('api/parallel.html#compare_models', 'circadian/parallel.py')},
             'circadian.phasetools': { 'circadian.phasetools.cosinor': ('api/phasetools.html#cosinor', 'circadian/phasetools.py'),
                                       'circadian.phasetools.cosinor_goals': ( 'api/phasetools.html#cosinor_goals',
                                                                               'circadian/phasetools.py'),
                                       'circadian.phasetools.cosinor_phase': ( 'api/phasetools.html#cosinor_phase',
                                                                               'circadian/phasetools.py')},
+            'circadian.planning': { 'circadian.planning._dark_midpoints': ('api/planning.html#_dark_midpoints', 'circadian/planning.py'),
+                                    'circadian.planning._final_phase': ('api/planning.html#_final_phase', 'circadian/planning.py'),
+                                    'circadian.planning._phase_direction': ('api/planning.html#_phase_direction', 'circadian/planning.py'),
+                                    'circadian.planning._shiftwork_scores': ( 'api/planning.html#_shiftwork_scores',
+                                                                              'circadian/planning.py'),
+                                    'circadian.planning.forecast': ('api/planning.html#forecast', 'circadian/planning.py'),
+                                    'circadian.planning.optimize_shiftwork': ( 'api/planning.html#optimize_shiftwork',
+                                                                               'circadian/planning.py'),
+                                    'circadian.planning.plan_light': ('api/planning.html#plan_light', 'circadian/planning.py')},
             'circadian.plots': { 'circadian.plots.Actogram': ('api/plots.html#actogram', 'circadian/plots.py'),
                                  'circadian.plots.Actogram.__init__': ('api/plots.html#actogram.__init__', 'circadian/plots.py'),
                                  'circadian.plots.Actogram.addLightSchedule': ( 'api/plots.html#actogram.addlightschedule',
@@ -172,6 +390,10 @@ d = { 'settings': { 'branch': 'main',
             'circadian.prc': { 'circadian.prc.DosageResponseCurve': ('api/prc.html#dosageresponsecurve', 'circadian/prc.py'),
                                'circadian.prc.DosageResponseCurve.__init__': ( 'api/prc.html#dosageresponsecurve.__init__',
                                                                                'circadian/prc.py'),
+                               'circadian.prc.DosageResponseCurve.dosage_day1_schedule': ( 'api/prc.html#dosageresponsecurve.dosage_day1_schedule',
+                                                                                           'circadian/prc.py'),
+                               'circadian.prc.DosageResponseCurve.dosage_schedule': ( 'api/prc.html#dosageresponsecurve.dosage_schedule',
+                                                                                      'circadian/prc.py'),
                                'circadian.prc.DosageResponseCurve.light_dosage': ( 'api/prc.html#dosageresponsecurve.light_dosage',
                                                                                    'circadian/prc.py'),
                                'circadian.prc.DosageResponseCurve.light_dosage_day1': ( 'api/prc.html#dosageresponsecurve.light_dosage_day1',
@@ -180,6 +402,8 @@ d = { 'settings': { 'branch': 'main',
                                                                               'circadian/prc.py'),
                                'circadian.prc.IntensityResponseCurveLight.__init__': ( 'api/prc.html#intensityresponsecurvelight.__init__',
                                                                                        'circadian/prc.py'),
+                               'circadian.prc.IntensityResponseCurveLight.intensity_schedule': ( 'api/prc.html#intensityresponsecurvelight.intensity_schedule',
+                                                                                                 'circadian/prc.py'),
                                'circadian.prc.IntensityResponseCurveLight.light_intensity': ( 'api/prc.html#intensityresponsecurvelight.light_intensity',
                                                                                               'circadian/prc.py'),
                                'circadian.prc.PRCFinder': ('api/prc.html#prcfinder', 'circadian/prc.py'),
@@ -189,6 +413,14 @@ d = { 'settings': { 'branch': 'main',
                                'circadian.prc.PhaseResponseCurveLight': ('api/prc.html#phaseresponsecurvelight', 'circadian/prc.py'),
                                'circadian.prc.PhaseResponseCurveLight.__init__': ( 'api/prc.html#phaseresponsecurvelight.__init__',
                                                                                    'circadian/prc.py'),
+                               'circadian.prc.PhaseResponseCurveLight.amplitude_resetting_schedule': ( 'api/prc.html#phaseresponsecurvelight.amplitude_resetting_schedule',
+                                                                                                       'circadian/prc.py'),
+                               'circadian.prc.PhaseResponseCurveLight.czeiler_type0_schedule': ( 'api/prc.html#phaseresponsecurvelight.czeiler_type0_schedule',
+                                                                                                 'circadian/prc.py'),
+                               'circadian.prc.PhaseResponseCurveLight.hilaire_schedule': ( 'api/prc.html#phaseresponsecurvelight.hilaire_schedule',
+                                                                                           'circadian/prc.py'),
+                               'circadian.prc.PhaseResponseCurveLight.khalsa_schedule': ( 'api/prc.html#phaseresponsecurvelight.khalsa_schedule',
+                                                                                          'circadian/prc.py'),
                                'circadian.prc.PhaseResponseCurveLight.light_amplitude_resetting': ( 'api/prc.html#phaseresponsecurvelight.light_amplitude_resetting',
                                                                                                     'circadian/prc.py'),
                                'circadian.prc.PhaseResponseCurveLight.light_czeiler_type0': ( 'api/prc.html#phaseresponsecurvelight.light_czeiler_type0',
@@ -197,6 +429,22 @@ d = { 'settings': { 'branch': 'main',
                                                                                         'circadian/prc.py'),
                                'circadian.prc.PhaseResponseCurveLight.light_khalsa': ( 'api/prc.html#phaseresponsecurvelight.light_khalsa',
                                                                                        'circadian/prc.py'),
+                               'circadian.prc.ResponseCurve': ('api/prc.html#responsecurve', 'circadian/prc.py'),
+                               'circadian.prc.ResponseCurve.__call__': ('api/prc.html#responsecurve.__call__', 'circadian/prc.py'),
+                               'circadian.prc.ResponseCurve.__init__': ('api/prc.html#responsecurve.__init__', 'circadian/prc.py'),
+                               'circadian.prc.ResponseCurve.__repr__': ('api/prc.html#responsecurve.__repr__', 'circadian/prc.py'),
+                               'circadian.prc.ResponseCurveCache': ('api/prc.html#responsecurvecache', 'circadian/prc.py'),
+                               'circadian.prc.ResponseCurveCache.__init__': ( 'api/prc.html#responsecurvecache.__init__',
+                                                                              'circadian/prc.py'),
+                               'circadian.prc.ResponseCurveCache._key': ('api/prc.html#responsecurvecache._key', 'circadian/prc.py'),
+                               'circadian.prc.ResponseCurveCache._load_or_compute': ( 'api/prc.html#responsecurvecache._load_or_compute',
+                                                                                      'circadian/prc.py'),
+                               'circadian.prc.ResponseCurveCache._path': ('api/prc.html#responsecurvecache._path', 'circadian/prc.py'),
+                               'circadian.prc.ResponseCurveCache.clear': ('api/prc.html#responsecurvecache.clear', 'circadian/prc.py'),
+                               'circadian.prc.ResponseCurveCache.drc': ('api/prc.html#responsecurvecache.drc', 'circadian/prc.py'),
+                               'circadian.prc.ResponseCurveCache.irc': ('api/prc.html#responsecurvecache.irc', 'circadian/prc.py'),
+                               'circadian.prc.ResponseCurveCache.prc': ('api/prc.html#responsecurvecache.prc', 'circadian/prc.py'),
+                               'circadian.prc.ResponseCurveCache.surface': ('api/prc.html#responsecurvecache.surface', 'circadian/prc.py'),
                                'circadian.prc.RimmerLightPulseLight': ('api/prc.html#rimmerlightpulselight', 'circadian/prc.py'),
                                'circadian.prc.RimmerLightPulseLight.__init__': ( 'api/prc.html#rimmerlightpulselight.__init__',
                                                                                  'circadian/prc.py'),
@@ -204,6 +452,18 @@ d = { 'settings': { 'branch': 'main',
                                                                                           'circadian/prc.py'),
                                'circadian.prc.RimmerLightPulseLight.pulse_rimmer_start': ( 'api/prc.html#rimmerlightpulselight.pulse_rimmer_start',
                                                                                            'circadian/prc.py'),
+                               'circadian.prc.RimmerLightPulseLight.schedule': ( 'api/prc.html#rimmerlightpulselight.schedule',
+                                                                                 'circadian/prc.py'),
+                               'circadian.prc._default_cache_directory': ('api/prc.html#_default_cache_directory', 'circadian/prc.py'),
+                               'circadian.prc._first_and_last_cbt': ('api/prc.html#_first_and_last_cbt', 'circadian/prc.py'),
+                               'circadian.prc._linear_weights': ('api/prc.html#_linear_weights', 'circadian/prc.py'),
+                               'circadian.prc._phase_shifts': ('api/prc.html#_phase_shifts', 'circadian/prc.py'),
+                               'circadian.prc._protocol_cbt': ('api/prc.html#_protocol_cbt', 'circadian/prc.py'),
+                               'circadian.prc._protocol_light': ('api/prc.html#_protocol_light', 'circadian/prc.py'),
+                               'circadian.prc._protocol_response': ('api/prc.html#_protocol_response', 'circadian/prc.py'),
+                               'circadian.prc._protocol_spec': ('api/prc.html#_protocol_spec', 'circadian/prc.py'),
+                               'circadian.prc._pulse_protocol': ('api/prc.html#_pulse_protocol', 'circadian/prc.py'),
+                               'circadian.prc.compute_prc': ('api/prc.html#compute_prc', 'circadian/prc.py'),
                                'circadian.prc.get_pulse': ('api/prc.html#get_pulse', 'circadian/prc.py'),
                                'circadian.prc.heaviside': ('api/prc.html#heaviside', 'circadian/prc.py'),
                                'circadian.prc.make_pulse': ('api/prc.html#make_pulse', 'circadian/prc.py')},
@@ -0,0 +1,314 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/api/12_entrainment.ipynb.
+
+# %% auto 0
+__all__ = ['entrainment_map', 'stroboscopic_map', 'reentrainment_time']
+
+# %% ../nbs/api/12_entrainment.ipynb 4
+import warnings
+import itertools
+import contextlib
+import numpy as np
+import pandas as pd
+from typing import Tuple
+from collections import OrderedDict
+from .lights import LightSchedule, ScheduleBank
+from .models import CircadianModel, DynamicalTrajectory
+from .parallel import SimulationExecutor
+from .kernels import simulate_batch
+
+# %% ../nbs/api/12_entrainment.ipynb 6
+def _cell_executor(model: CircadianModel, # model to simulate
+                   n_workers: int, # number of worker processes
+                   ):
+    "Context manager yielding a `SimulationExecutor` shared by every batch, or None to simulate in this process"
+    if n_workers > 1:
+        return SimulationExecutor(model, n_workers=n_workers)
+    return contextlib.nullcontext()
+
+
+def _simulate_cells(model: CircadianModel, # model to simulate
+                    time: np.ndarray, # time points for integration
+                    initial_condition: np.ndarray, # initial states of the batch with shape (num_states, batch_size)
+                    light: np.ndarray, # light input with one column per batch member
+                    executor: SimulationExecutor=None, # pool of workers to spread the batch over. If None the batch is simulated in this process
+                    save_every: int=1, # store one out of every `save_every` time points
+                    ) -> DynamicalTrajectory:
+    "Simulate a batch in this process or spread over a pool of workers"
+    if executor is not None:
+        return executor.run(time, initial_condition, light, save_every=save_every)
+    return simulate_batch(model, time, initial_condition, light, save_every=save_every)
+
+
+def _circular_mean(values: np.ndarray, # values wrapped in [0, period)
+                   period: float, # period of the values
+                   ) -> float:
+    "Mean of periodic values, in [0, period)"
+    angle = np.angle(np.mean(np.exp(2j * np.pi * values / period)))
+    return np.mod(angle * period / (2 * np.pi), period)
+
+# %% ../nbs/api/12_entrainment.ipynb 7
+def _entrainment_cells(model: CircadianModel, # model to simulate
+                       lux: np.ndarray, # light intensity of each cell in lux
+                       period: np.ndarray, # period of the light schedule of each cell in hours
+                       light_fraction: float, # fraction of each period with the light on
+                       transient: float, # hours simulated before entrainment is measured
+                       cycles: int, # number of light cycles over which entrainment is measured
+                       drift_tolerance: float, # largest drift in hours per day of an entrained cell
+                       dt: float, # time step in hours
+                       executor: SimulationExecutor, # pool of workers shared by every batch, or None
+                       ) -> tuple: # locking status, phase angle of entrainment and drift of each cell
+    "Simulate every cell of the map in one batch and measure their entrainment"
+    schedules = [LightSchedule.from_pulse(float(l), 0.0, light_fraction * float(T), period=float(T)) for l, T in zip(lux, period)]
+    bank = ScheduleBank(schedules)
+    batch_condition = np.repeat(model._default_initial_condition[:, None], len(lux), axis=1)
+    # only the final state of the transient is kept
+    transient_time = np.arange(0.0, transient, dt)
+    trajectory = _simulate_cells(model, transient_time, batch_condition, bank(transient_time),
+                                 executor, save_every=len(transient_time) - 1)
+    start = transient_time[-1]
+    time = start + np.arange(0.0, (cycles + 1) * np.max(period) + dt, dt)
+    trajectory = _simulate_cells(model, time, trajectory.states[-1], bank(time), executor)
+    # stroboscopic phases at lights on, they stay put when the cell is entrained
+    first_cycle = np.ceil(start / period - 1e-9)
+    strobe_time = (first_cycle[None, :] + np.arange(cycles + 1)[:, None]) * period[None, :]
+    strobe_idxs = np.rint((strobe_time - start) / dt).astype(int)
+    phase = model.phase(trajectory)
+    strobe_phase = np.unwrap(np.take_along_axis(phase, strobe_idxs, axis=0), axis=0)
+    # drift of the internal clock against the light schedule in hours per day
+    drift = (strobe_phase[-1] - strobe_phase[0]) / (2 * np.pi) * 24.0 / (cycles * period) * 24.0
+    entrained = np.abs(drift) < drift_tolerance
+    # phase angle of entrainment as the mean time of the CBT minimum after lights on
+    phase_angle = np.full(len(lux), np.nan)
+    with warnings.catch_warnings():
+        # bright light can split minima, the circular mean smooths them out
+        warnings.simplefilter('ignore')
+        for member in np.flatnonzero(entrained):
+            cbt = model.cbt(trajectory.get_batch(int(member)))
+            if len(cbt) > 0:
+                phase_angle[member] = _circular_mean(np.mod(cbt, period[member]), period[member])
+    return entrained, phase_angle, drift
+
+# %% ../nbs/api/12_entrainment.ipynb 8
+def _midpoint(a: float, # first value
+              b: float, # second value
+              geometric: bool, # whether to take the geometric mean
+              ) -> float:
+    "Midpoint of two values, geometric for positive light intensities"
+    if geometric and a > 0 and b > 0:
+        return float(np.sqrt(a * b))
+    return 0.5 * (a + b)
+
+# %% ../nbs/api/12_entrainment.ipynb 10
+def entrainment_map(model: CircadianModel, # model to simulate. Must have a single light input
+                    lux_range: np.ndarray, # light intensities of the grid in lux
+                    period_range: np.ndarray, # periods of the light schedules of the grid in hours
+                    light_fraction: float=0.5, # fraction of each period with the light on
+                    refinements: int=2, # number of times the boundary between entrained and free running cells is bisected
+                    transient: float=960.0, # hours simulated before entrainment is measured
+                    cycles: int=10, # number of light cycles over which entrainment is measured
+                    drift_tolerance: float=0.05, # largest drift in hours per day of an entrained cell
+                    dt: float=0.1, # time step in hours
+                    n_workers: int=1, # number of worker processes. With a single worker the simulations run in this process
+                    ) -> pd.DataFrame: # one row per simulated cell with its `lux`, `period`, `entrained` status, `phase_angle`, `drift`, and refinement `level`
+    "Map the light intensities and periods of the light/dark cycles that entrain a model (its Arnold tongue)"
+    # input checking
+    if not isinstance(model, CircadianModel):
+        raise TypeError("model must be a CircadianModel")
+    if model._num_inputs != 1:
+        raise ValueError("model must have a single light input")
+    lux_range = np.unique(np.asarray(lux_range, dtype=float))
+    period_range = np.unique(np.asarray(period_range, dtype=float))
+    if lux_range.ndim != 1 or len(lux_range) == 0 or np.any(lux_range < 0):
+        raise ValueError("lux_range must be a nonempty 1D array of nonnegative values")
+    if period_range.ndim != 1 or len(period_range) == 0 or np.any(period_range <= 0):
+        raise ValueError("period_range must be a nonempty 1D array of positive values")
+    if not isinstance(light_fraction, (float, int)) or not 0 < light_fraction < 1:
+        raise ValueError("light_fraction must be between 0 and 1")
+    for value, name in [(refinements, "refinements"), (cycles, "cycles"), (n_workers, "n_workers")]:
+        if not isinstance(value, int) or value < 0:
+            raise ValueError(f"{name} must be a nonnegative int")
+    if cycles == 0 or n_workers == 0:
+        raise ValueError("cycles and n_workers must be positive")
+    if transient <= 0 or dt <= 0 or drift_tolerance <= 0:
+        raise ValueError("transient, dt, and drift_tolerance must be positive")
+    cells = {}
+    def measure(points, level, executor):
+        lux, period = np.array(points).T
+        results = _entrainment_cells(model, lux, period, light_fraction, transient, cycles, drift_tolerance, dt, executor)
+        for point, entrained, phase_angle, drift in zip(points, *results):
+            cells[point] = {'lux': point[0], 'period': point[1], 'entrained': bool(entrained),
+                            'phase_angle': phase_angle, 'drift': drift, 'level': level}
+    # a single pool of workers serves the grid and every refinement
+    with _cell_executor(model, n_workers) as executor:
+        measure(list(itertools.product(lux_range.tolist(), period_range.tolist())), 0, executor)
+        # neighboring cells along each axis of the grid
+        edges = [((a, T), (b, T)) for a, b in zip(lux_range[:-1], lux_range[1:]) for T in period_range]
+        edges += [((l, a), (l, b)) for a, b in zip(period_range[:-1], period_range[1:]) for l in lux_range]
+        edges = [(tuple(map(float, p)), tuple(map(float, q))) for p, q in edges]
+        for level in range(1, refinements + 1):
+            boundary = [(p, q) for p, q in edges if cells[p]['entrained'] != cells[q]['entrained']]
+            if len(boundary) == 0:
+                break
+            midpoints = [(_midpoint(p[0], q[0], geometric=True), _midpoint(p[1], q[1], geometric=False)) for p, q in boundary]
+            measure(list(dict.fromkeys(point for point in midpoints if point not in cells)), level, executor)
+            edges = [edge for (p, q), m in zip(boundary, midpoints) for edge in ((p, m), (m, q))]
+    return pd.DataFrame(list(cells.values())).sort_values(['period', 'lux'], ignore_index=True)
+
+# %% ../nbs/api/12_entrainment.ipynb 16
+def stroboscopic_map(model: CircadianModel, # model to simulate. Must have a single light input
+                     schedule: LightSchedule, # light schedule driving every initial state
+                     initial_states: np.ndarray, # initial states with shape (N, num_states), or a single state
+                     n_cycles: int, # number of cycles to advance
+                     period: float=24.0, # hours between consecutive iterates. Must be a multiple of dt
+                     start: float=0.0, # time of the schedule at which the initial states are given
+                     dt: float=0.1, # time step in hours
+                     n_workers: int=1, # number of worker processes. With a single worker the simulation runs in this process
+                     ) -> np.ndarray: # states after each cycle with shape (n_cycles, N, num_states)
+    "Iterate the stroboscopic map of a schedule, the state after every period, for many initial states at once"
+    # input checking
+    if not isinstance(model, CircadianModel):
+        raise TypeError("model must be a CircadianModel")
+    if model._num_inputs != 1:
+        raise ValueError("model must have a single light input")
+    if not isinstance(schedule, LightSchedule):
+        raise TypeError("schedule must be a LightSchedule")
+    initial_states = np.atleast_2d(np.asarray(initial_states, dtype=float))
+    if initial_states.ndim != 2 or initial_states.shape[1] != model._num_states:
+        raise ValueError(f"initial_states must have shape (N, {model._num_states})")
+    if not isinstance(n_cycles, int) or n_cycles <= 0:
+        raise ValueError("n_cycles must be a positive int")
+    if not isinstance(n_workers, int) or n_workers <= 0:
+        raise ValueError("n_workers must be a positive int")
+    if period <= 0 or dt <= 0:
+        raise ValueError("period and dt must be positive")
+    steps_per_cycle = int(round(period / dt))
+    if not np.isclose(steps_per_cycle * dt, period):
+        raise ValueError("period must be a multiple of dt")
+    # one integration through all cycles that only stores the state at the end of each of them
+    time = start + dt * np.arange(n_cycles * steps_per_cycle + 1)
+    with _cell_executor(model, n_workers) as executor:
+        trajectory = _simulate_cells(model, time, initial_states.T.copy(), schedule(time), executor, save_every=steps_per_cycle)
+        return np.transpose(trajectory.states[1:], (0, 2, 1))
+
+# %% ../nbs/api/12_entrainment.ipynb 21
+_ENTRAINED_CACHE_SIZE = 256 # number of entrained states memoised across calls
+_ENTRAINED_CACHE = OrderedDict()
+
+
+def _model_key(model: CircadianModel, # model to identify
+               ) -> tuple:
+    "Hashable key of a model class and its parameters"
+    return (type(model).__name__, tuple(sorted((name, float(value)) for name, value in model.parameters.items())))
+
+
+def _day_error(markers: np.ndarray, # marker times in hours
+               target: float, # target time of the day in hours
+               ) -> np.ndarray: # signed difference to the target in hours between -12 and 12
+    "Difference between the time of the day of markers and a target time"
+    return np.mod(markers - target + 12.0, 24.0) - 12.0
+
+
+def _entrained_states(model: CircadianModel, # model to simulate
+                      schedules: list, # light schedules to entrain to
+                      end: float, # time at which the entrained states are returned
+                      transient_days: int, # days simulated to reach entrainment
+                      dt: float, # time step in hours
+                      ) -> Tuple[np.ndarray, np.ndarray]: # entrained states at `end` with shape (num_states, n) and their DLMO time of the day
+    "Entrain the model to every schedule. Results for schedules without arbitrary light functions are cached"
+    keys = [None if schedule._hash_key() is None else (_model_key(model), schedule._hash_key(), end, transient_days, dt)
+            for schedule in schedules]
+    missing = [idx for idx, key in enumerate(keys) if key is None or key not in _ENTRAINED_CACHE]
+    computed = {}
+    if len(missing) > 0:
+        batch_condition = np.repeat(model._default_initial_condition[:, None], len(missing), axis=1)
+        # the transient only keeps its final state, the last days are stored to find the DLMOs
+        stored_steps = int(round(5 * 24.0 / dt))
+        transient_steps = int(round(transient_days * 24.0 / dt)) - stored_steps
+        time = end - dt * (transient_steps + stored_steps) + dt * np.arange(transient_steps + 1)
+        light = np.stack([schedules[idx](time) for idx in missing], axis=1)
+        trajectory = simulate_batch(model, time, batch_condition, light, save_every=transient_steps)
+        time = end - dt * stored_steps + dt * np.arange(stored_steps + 1)
+        light = np.stack([schedules[idx](time) for idx in missing], axis=1)
+        trajectory = simulate_batch(model, time, trajectory.states[-1], light)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            for member, idx in enumerate(missing):
+                dlmos = model.dlmos(trajectory.get_batch(member))
+                # a copy, so the cache does not keep the whole trajectory alive
+                computed[idx] = (trajectory.states[-1, :, member].copy(), _circular_mean(np.mod(dlmos, 24.0), 24.0))
+                if keys[idx] is not None:
+                    _ENTRAINED_CACHE[keys[idx]] = computed[idx]
+                    if len(_ENTRAINED_CACHE) > _ENTRAINED_CACHE_SIZE:
+                        _ENTRAINED_CACHE.popitem(last=False)
+    results = [computed[idx] if idx in computed else _ENTRAINED_CACHE[key] for idx, key in enumerate(keys)]
+    return np.stack([state for state, _ in results], axis=1), np.array([dlmo for _, dlmo in results])
+
+# %% ../nbs/api/12_entrainment.ipynb 22
+def reentrainment_time(model: CircadianModel, # model to simulate. Must have a single light input
+                       before: LightSchedule, # schedule the model is entrained to before the shift
+                       after: LightSchedule, # schedule after the shift, or a list of them to evaluate several shifts at once
+                       shift_time: float, # time at which `after` replaces `before` in hours
+                       tolerance: float=1.0, # largest distance in hours to the entrained DLMO of `after`
+                       settled_days: int=3, # number of consecutive DLMOs that must be within the tolerance
+                       max_days: int=60, # days simulated after the shift before giving up
+                       transient_days: int=60, # days simulated to find the entrained states
+                       chunk_days: int=5, # days simulated between convergence checks
+                       dt: float=0.1, # time step in hours
+                       ): # days from the shift to the first settled DLMO for each schedule in `after`. NaN if the model hasn't settled after `max_days`
+    "Days it takes the DLMO of a model to settle within a tolerance of its entrained time after switching schedules"
+    # input checking
+    if not isinstance(model, CircadianModel):
+        raise TypeError("model must be a CircadianModel")
+    if model._num_inputs != 1:
+        raise ValueError("model must have a single light input")
+    single = isinstance(after, LightSchedule)
+    schedules = [after] if single else list(after)
+    if not isinstance(before, LightSchedule) or len(schedules) == 0 or not all(isinstance(schedule, LightSchedule) for schedule in schedules):
+        raise TypeError("before and after must be LightSchedules")
+    if not isinstance(shift_time, (float, int)):
+        raise TypeError(f"shift_time must be a float or int, got {type(shift_time)}")
+    for value, name in [(settled_days, "settled_days"), (max_days, "max_days"), (transient_days, "transient_days"), (chunk_days, "chunk_days")]:
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(f"{name} must be a positive int")
+    if transient_days <= 5:
+        raise ValueError("transient_days must be larger than 5")
+    if tolerance <= 0 or dt <= 0:
+        raise ValueError("tolerance and dt must be positive")
+    # entrained states, cached across calls
+    initial_state, _ = _entrained_states(model, [before], float(shift_time), transient_days, dt)
+    _, targets = _entrained_states(model, schedules, float(shift_time), transient_days, dt)
+    # simulate the unsettled schedules in chunks until all of them settle
+    days = np.full(len(schedules), np.nan)
+    markers = [[] for _ in schedules]
+    active = np.arange(len(schedules))
+    states = np.repeat(initial_state, len(schedules), axis=1)
+    chunk_steps = int(round(chunk_days * 24.0 / dt))
+    tail_steps = int(round(24.0 / dt))
+    tail_time, tail_states = None, None
+    start = float(shift_time)
+    while len(active) > 0 and start < shift_time + 24.0 * max_days - dt / 2:
+        time = start + dt * np.arange(chunk_steps + 1)
+        light = np.stack([schedules[idx](time) for idx in active], axis=1)
+        trajectory = simulate_batch(model, time, states, light)
+        states = trajectory.states[-1]
+        time, chunk_states = trajectory.time, trajectory.states
+        # the last day of the previous chunk finds the markers at the boundary
+        if tail_time is not None:
+            time = np.concatenate([tail_time[:-1], time])
+            chunk_states = np.concatenate([tail_states[:-1], chunk_states])
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            for member, idx in enumerate(active):
+                dlmos = model.dlmos(DynamicalTrajectory._trusted(time, chunk_states[:, :, member]))
+                last = markers[idx][-1] if len(markers[idx]) > 0 else shift_time - 12.0
+                markers[idx].extend(dlmos[dlmos > last + 12.0])
+                within = np.abs(_day_error(np.array(markers[idx]), targets[idx])) <= tolerance
+                for k in range(len(within) - settled_days + 1):
+                    if np.all(within[k:k + settled_days]):
+                        days[idx] = (markers[idx][k] - shift_time) / 24.0
+                        break
+        unsettled = np.isnan(days[active])
+        active, states = active[unsettled], states[:, unsettled]
+        tail_time, tail_states = time[-tail_steps - 1:], chunk_states[-tail_steps - 1:, :, unsettled]
+        start = trajectory.time[-1]
+    return days[0] if single else days
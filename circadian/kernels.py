@@ -0,0 +1,222 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/api/11_kernels.ipynb.
+
+# %% auto 0
+__all__ = ['simulate', 'simulate_batch']
+
+# %% ../nbs/api/11_kernels.ipynb 4
+import numpy as np
+from numba import njit
+from .models import CircadianModel, DynamicalTrajectory, Forger99, Hannay19, Hannay19TP, Jewett99
+from .models import _time_input_checking, _light_input_checking, _initial_condition_input_checking, _positive_int_checking, _save_states_input_checking
+
+# %% ../nbs/api/11_kernels.ipynb 7
+@njit(nogil=True)
+def _forger99_derv(state, light, params, dydt):
+    "Right-hand-side of Forger99 for a single batch member"
+    taux, mu, G, alpha_0, beta, p, I0, k = params[0], params[1], params[2], params[3], params[4], params[5], params[6], params[7]
+    x = state[0]
+    xc = state[1]
+    n = state[2]
+    alpha = alpha_0 * (light / I0) ** p
+    Bhat = G * (1.0 - n) * alpha * (1 - 0.4 * x) * (1 - 0.4 * xc)
+    mu_term = mu * (xc - 4.0 / 3.0 * xc ** 3.0)
+    taux_term = (24.0 / (0.99669 * taux)) ** 2.0 + k * Bhat
+    dydt[0] = np.pi / 12.0 * (xc + Bhat)
+    dydt[1] = np.pi / 12.0 * (mu_term - x * taux_term)
+    dydt[2] = 60.0 * (alpha * (1.0 - n) - beta * n)
+
+
+@njit(nogil=True)
+def _jewett99_derv(state, light, params, dydt):
+    "Right-hand-side of Jewett99 for a single batch member"
+    taux, mu, G, beta, k, q, I0, p, alpha_0 = params[0], params[1], params[2], params[3], params[4], params[5], params[6], params[7], params[8]
+    x = state[0]
+    xc = state[1]
+    n = state[2]
+    alpha = alpha_0 * (light / I0) ** p
+    Bhat = G * alpha * (1 - n) * (1 - 0.4 * x) * (1 - 0.4 * xc)
+    mu_term = mu * (1.0/3.0 * x + 4.0/3.0 * x**3 - 256.0/105.0 * x**7)
+    taux_term = (24.0 / (0.99729 * taux)) ** 2 + k * Bhat
+    dydt[0] = np.pi/12 * (xc + mu_term + Bhat)
+    dydt[1] = np.pi/12 * (q * Bhat * xc - x * taux_term)
+    dydt[2] = 60.0 * (alpha * (1 - n) - beta * n)
+
+
+@njit(nogil=True)
+def _hannay19_derv(state, light, params, dydt):
+    "Right-hand-side of Hannay19 for a single batch member"
+    tau, K, gamma, Beta1, A1, A2 = params[0], params[1], params[2], params[3], params[4], params[5]
+    BetaL1, BetaL2, sigma, G, alpha_0, delta, p, I0 = params[6], params[7], params[8], params[9], params[10], params[11], params[12], params[13]
+    R = state[0]
+    Psi = state[1]
+    n = state[2]
+    alpha = alpha_0 * light ** p / (light ** p + I0)
+    Bhat = G * (1.0 - n) * alpha
+    A1_term_amp = A1 * 0.5 * Bhat * (1.0 - R ** 4.0) * np.cos(Psi + BetaL1)
+    A2_term_amp = A2 * 0.5 * Bhat * R * (1.0 - R ** 8.0) * np.cos(2.0 * Psi + BetaL2)
+    LightAmp = A1_term_amp + A2_term_amp
+    A1_term_phase = A1 * Bhat * 0.5 * (R ** 3.0 + 1.0 / R) * np.sin(Psi + BetaL1)
+    A2_term_phase = A2 * Bhat * 0.5 * (1.0 + R ** 8.0) * np.sin(2.0 * Psi + BetaL2)
+    LightPhase = sigma * Bhat - A1_term_phase - A2_term_phase
+    dydt[0] = -1.0 * gamma * R + K * np.cos(Beta1) / 2.0 * R * (1.0 - R ** 4.0) + LightAmp
+    dydt[1] = 2*np.pi/tau + K / 2.0 * np.sin(Beta1) * (1 + R ** 4.0) + LightPhase
+    dydt[2] = 60.0 * (alpha * (1.0 - n) - delta * n)
+
+
+@njit(nogil=True)
+def _hannay19tp_derv(state, light, params, dydt):
+    "Right-hand-side of Hannay19TP for a single batch member"
+    tauV, tauD, Kvv, Kdd, Kvd, Kdv, gamma, A1, A2 = params[0], params[1], params[2], params[3], params[4], params[5], params[6], params[7], params[8]
+    BetaL, BetaL2, sigma, G, alpha_0, delta, p, I0 = params[9], params[10], params[11], params[12], params[13], params[14], params[15], params[16]
+    Rv = state[0]
+    Rd = state[1]
+    Psiv = state[2]
+    Psid = state[3]
+    n = state[4]
+    alpha = alpha_0 * light ** p / (light ** p + I0)
+    Bhat = G * (1.0 - n) * alpha
+    A1_term_amp = A1 * 0.5 * Bhat * (1.0 - Rv ** 4.0) * np.cos(Psiv + BetaL)
+    A2_term_amp = A2 * 0.5 * Bhat * Rv * (1.0 - Rv ** 8.0) * np.cos(2.0 * Psiv + BetaL2)
+    LightAmp = A1_term_amp + A2_term_amp
+    A1_term_phase = A1 * Bhat * 0.5 * (Rv ** 3.0 + 1.0 / Rv) * np.sin(Psiv + BetaL)
+    A2_term_phase = A2 * Bhat * 0.5 * (1.0 + Rv ** 8.0) * np.sin(2.0 * Psiv + BetaL2)
+    LightPhase = sigma * Bhat - A1_term_phase - A2_term_phase
+    dydt[0] = -gamma * Rv + Kvv / 2.0 * Rv * (1 - Rv ** 4.0) + Kdv / 2.0 * Rd * (1 - Rv ** 4.0) * np.cos(Psid - Psiv) + LightAmp
+    dydt[1] = -gamma * Rd + Kdd / 2.0 * Rd * (1 - Rd ** 4.0) + Kvd / 2.0 * Rv * (1.0 - Rd ** 4.0) * np.cos(Psid - Psiv)
+    dydt[2] = 2.0 * np.pi / tauV + Kdv / 2.0 * Rd * (Rv ** 3.0 + 1.0 / Rv) * np.sin(Psid - Psiv) + LightPhase
+    dydt[3] = 2.0 * np.pi / tauD - Kvd / 2.0 * Rv * (Rd ** 3.0 + 1.0 / Rd) * np.sin(Psid - Psiv)
+    dydt[4] = 60.0 * (alpha * (1.0 - n) - delta * n)
+
+# %% ../nbs/api/11_kernels.ipynb 8
+_KERNEL_PARAMETERS = {
+    Forger99: ('taux', 'mu', 'G', 'alpha_0', 'beta', 'p', 'I0', 'k'),
+    Jewett99: ('taux', 'mu', 'G', 'beta', 'k', 'q', 'I0', 'p', 'alpha_0'),
+    Hannay19: ('tau', 'K', 'gamma', 'Beta1', 'A1', 'A2', 'BetaL1', 'BetaL2', 'sigma', 'G', 'alpha_0', 'delta', 'p', 'I0'),
+    Hannay19TP: ('tauV', 'tauD', 'Kvv', 'Kdd', 'Kvd', 'Kdv', 'gamma', 'A1', 'A2', 'BetaL', 'BetaL2', 'sigma', 'G', 'alpha_0', 'delta', 'p', 'I0'),
+}
+
+_KERNEL_DERIVATIVES = {
+    Forger99: _forger99_derv,
+    Jewett99: _jewett99_derv,
+    Hannay19: _hannay19_derv,
+    Hannay19TP: _hannay19tp_derv,
+}
+
+# %% ../nbs/api/11_kernels.ipynb 10
+@njit(nogil=True)
+def _rk4_kernel(derv, time, initial_condition, light, params, save_every, save_states, out):
+    "Fourth-order Runge-Kutta solver that integrates each batch member in turn and writes the saved states into `out`"
+    num_states, batch_size = initial_condition.shape
+    state = np.empty(num_states)
+    temp = np.empty(num_states)
+    k1 = np.empty(num_states)
+    k2 = np.empty(num_states)
+    k3 = np.empty(num_states)
+    k4 = np.empty(num_states)
+    for member in range(batch_size):
+        light_column = 0 if light.shape[1] == 1 else member
+        state[:] = initial_condition[:, member]
+        for state_idx in range(len(save_states)):
+            out[0, state_idx, member] = state[save_states[state_idx]]
+        for idx in range(1, len(time)):
+            dt = time[idx] - time[idx-1]
+            light_value = light[idx, light_column]
+            derv(state, light_value, params, k1)
+            for state_idx in range(num_states):
+                temp[state_idx] = state[state_idx] + k1[state_idx] * dt / 2.0
+            derv(temp, light_value, params, k2)
+            for state_idx in range(num_states):
+                temp[state_idx] = state[state_idx] + k2[state_idx] * dt / 2.0
+            derv(temp, light_value, params, k3)
+            for state_idx in range(num_states):
+                temp[state_idx] = state[state_idx] + k3[state_idx] * dt
+            derv(temp, light_value, params, k4)
+            for state_idx in range(num_states):
+                state[state_idx] = state[state_idx] + (dt / 6.0) * (k1[state_idx] + 2.0*k2[state_idx] + 2.0*k3[state_idx] + k4[state_idx])
+            if idx % save_every == 0:
+                for state_idx in range(len(save_states)):
+                    out[idx // save_every, state_idx, member] = state[save_states[state_idx]]
+
+# %% ../nbs/api/11_kernels.ipynb 11
+def simulate(model: CircadianModel, # model to simulate. Only its class and parameters are read, the model is never modified
+             time: np.ndarray, # time points for integration. Time difference between consecutive values determines step size of the solver
+             initial_condition: np.ndarray=None, # initial state of the model. If None, the model's default initial condition is used
+             input: np.ndarray=None, # light input for each time point. A 2D array provides one column per initial condition in a batch
+             save_every: int=1, # store one out of every `save_every` time points. The solver still steps through all of them
+             dtype: np.dtype=float, # floating point type of the stored states. The solver always works in float64
+             save_states: list=None, # indices of the states to store. If None, all states are stored
+             ) -> DynamicalTrajectory:
+    "Solve a model with a compiled solver that releases the GIL. Safe to call from several threads with the same model"
+    # input checking
+    if not isinstance(model, CircadianModel):
+        raise TypeError("model must be a CircadianModel")
+    if type(model) not in _KERNEL_DERIVATIVES:
+        supported = ", ".join(model_class.__name__ for model_class in _KERNEL_DERIVATIVES)
+        raise ValueError(f"simulate only supports the following models: {supported}")
+    _time_input_checking(time)
+    if input is None:
+        raise ValueError("a model input must be provided via the input argument")
+    if initial_condition is None:
+        initial_condition = model._default_initial_condition
+    else:
+        _initial_condition_input_checking(initial_condition, model._num_states)
+    _light_input_checking(input, initial_condition)
+    if input.shape[0] != len(time):
+        raise ValueError(f"input's first dimension must have length {len(time)} based on the time array provided")
+    _positive_int_checking(save_every, "save_every")
+    if not np.issubdtype(np.dtype(dtype), np.floating):
+        raise TypeError("dtype must be a floating point type")
+    saved_states = save_states
+    if save_states is None:
+        save_states = np.arange(model._num_states)
+    else:
+        _save_states_input_checking(save_states, model._num_states)
+        save_states = np.asarray(save_states, dtype=np.int64)
+    # snapshot of the parameters, later changes to the model don't affect this simulation
+    params = np.array([getattr(model, name) for name in _KERNEL_PARAMETERS[type(model)]], dtype=float)
+    batch_condition = np.asarray(initial_condition, dtype=float).reshape(model._num_states, -1)
+    light = np.asarray(input, dtype=float).reshape(len(time), -1)
+    saved_time = time[::save_every]
+    states = np.empty((len(saved_time), len(save_states), batch_condition.shape[1]), dtype=dtype)
+    _rk4_kernel(_KERNEL_DERIVATIVES[type(model)], np.asarray(time, dtype=float), batch_condition, light, params, save_every, save_states, states)
+    states = states.reshape(len(saved_time), len(save_states), *initial_condition.shape[1:])
+    return DynamicalTrajectory._trusted(saved_time, states, saved_states)
+
+# %% ../nbs/api/11_kernels.ipynb 12
+def simulate_batch(model: CircadianModel, # model to simulate. The model is never modified
+                   time: np.ndarray, # time points for integration
+                   initial_condition: np.ndarray, # initial states of the batch with shape (num_states, batch_size)
+                   input: np.ndarray, # model input with one column per batch member
+                   save_every: int=1, # store one out of every `save_every` time points
+                   dtype: np.dtype=float, # floating point type of the stored states
+                   save_states: list=None, # indices of the states to store. If None, all states are stored
+                   ) -> DynamicalTrajectory:
+    "Simulate a batch with the compiled solver when the model supports it, and with the model's own solver otherwise"
+    if type(model) in _KERNEL_DERIVATIVES:
+        return simulate(model, time, initial_condition, input, save_every=save_every, dtype=dtype, save_states=save_states)
+    # integrate stores the initial condition and the trajectory in the model, restore them afterwards
+    model_initial_condition, model_trajectory = model.initial_condition, model._trajectory
+    try:
+        return model.integrate(time, initial_condition, input, save_every=save_every, dtype=dtype, save_states=save_states)
+    finally:
+        model.initial_condition, model._trajectory = model_initial_condition, model_trajectory
+
+
+def _simulate_unchecked(model: CircadianModel, # model to simulate. The model is never modified
+                        time: np.ndarray, # time points for integration, already checked
+                        initial_condition: np.ndarray, # initial state of the model, or states of a batch with shape (num_states, batch_size)
+                        input: np.ndarray, # model input for each time point, already checked
+                        ) -> DynamicalTrajectory:
+    "Simulate inputs that the caller has already validated, with the compiled solver when the model supports it and the model's own stepper otherwise"
+    if type(model) in _KERNEL_DERIVATIVES:
+        params = np.array([getattr(model, name) for name in _KERNEL_PARAMETERS[type(model)]], dtype=float)
+        batch_condition = np.asarray(initial_condition, dtype=float).reshape(model._num_states, -1)
+        states = np.empty((len(time), model._num_states, batch_condition.shape[1]))
+        _rk4_kernel(_KERNEL_DERIVATIVES[type(model)], np.asarray(time, dtype=float), batch_condition,
+                    np.asarray(input, dtype=float).reshape(len(time), -1), params, 1, np.arange(model._num_states), states)
+        return DynamicalTrajectory._trusted(time, states.reshape(len(time), *np.shape(initial_condition)))
+    states = np.empty((len(time), *np.shape(initial_condition)))
+    states[0] = initial_condition
+    for idx in range(1, len(time)):
+        states[idx] = model.step_rk4(time[idx], states[idx-1], input[idx], time[idx] - time[idx-1])
+    return DynamicalTrajectory._trusted(time, states)
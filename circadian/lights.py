@@ -1,22 +1,384 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/api/01_lights.ipynb.
 
 # %% auto 0
-__all__ = ['LightSchedule']
+__all__ = ['LightSchedule', 'ScheduleBank']
 
 # %% ../nbs/api/01_lights.ipynb 4
+import json
 import inspect
+import functools
+import itertools
 import warnings
 import numpy as np
+import pandas as pd
 import pylab as plt
-from typing import Callable
+from typing import Callable, Tuple
+from collections import OrderedDict
+from .readers import WearableData
 from fastcore.basics import patch_to
 
 # %% ../nbs/api/01_lights.ipynb 5
+class _PiecewiseConstant:
+    "Light function that is constant between sorted breakpoints. `values[i]` holds from breakpoint `i-1` to breakpoint `i`. When `period` is given, the table describes a single period starting at 0"
+    def __init__(self,
+                 breakpoints: np.ndarray, # sorted times where the light value changes
+                 values: np.ndarray, # light values, one more than breakpoints. The first one holds before the first breakpoint
+                 period: float=None, # period in hours, if None, then the table is not repeated
+                 after: np.ndarray=None, # whether the value changes right after each breakpoint instead of at it. Defaults to all False
+                 ) -> None:
+        breakpoints = np.asarray(breakpoints, dtype=float)
+        values = np.asarray(values, dtype=float)
+        after = np.zeros(len(breakpoints), dtype=bool) if after is None else np.asarray(after, dtype=bool)
+        # drop breakpoints where the value doesn't change
+        keep = values[1:] != values[:-1]
+        self.breakpoints = breakpoints[keep]
+        self.after = after[keep]
+        self.values = np.concatenate((values[:1], values[1:][keep]))
+        self.period = period
+        self._cumulative_at = np.concatenate(([0], np.cumsum(~self.after)))
+
+    compiled = True
+
+    @property
+    def is_constant(self) -> bool:
+        return len(self.breakpoints) == 0
+
+    def _describe(self) -> list:
+        if self.is_constant:
+            return [f"Constant({self.values[0]:g} lux)"]
+        period = "" if self.period is None else f", period={self.period:g}"
+        return [f"Table({len(self.breakpoints)} breakpoints{period})"]
+
+    def __repr__(self) -> str:
+        return "\n".join(self._describe())
+
+    def _segment_index(self, time: np.ndarray, after) -> np.ndarray:
+        "Index of the segment at `time`, or right after `time` where `after` is True"
+        left = np.searchsorted(self.breakpoints, time, side='left')
+        right = np.searchsorted(self.breakpoints, time, side='right')
+        # breakpoints equal to time are passed when the value changes at them, or when looking right after time
+        passed_at_time = np.where(after, right - left, self._cumulative_at[right] - self._cumulative_at[left])
+        return left + passed_at_time
+
+    def __call__(self, time: np.ndarray) -> np.ndarray:
+        if self.period is not None:
+            time = np.mod(time, self.period)
+        return self.values[self._segment_index(time, False)]
+
+    def window(self, start: float, end: float) -> '_PiecewiseConstant':
+        "Non-periodic table that matches this one between `start` and `end`"
+        if self.period is None or self.is_constant:
+            return _PiecewiseConstant(self.breakpoints, self.values, after=self.after)
+        # unroll the periods that overlap the window
+        period = self.period
+        inside = ((self.breakpoints > 0.0) | ((self.breakpoints == 0.0) & self.after)) & (self.breakpoints < period)
+        period_breakpoints = np.concatenate(([0.0], self.breakpoints[inside]))
+        period_after = np.concatenate(([False], self.after[inside]))
+        period_values = self.values[self._segment_index(period_breakpoints, period_after)]
+        first_period, last_period = int(np.floor(start / period)), int(np.floor(end / period))
+        offsets = period * np.arange(first_period, last_period + 1)
+        breakpoints = (offsets[:, None] + period_breakpoints[None, :]).ravel()
+        after = np.tile(period_after, len(offsets))
+        values = np.tile(period_values, len(offsets))
+        return _PiecewiseConstant(breakpoints, np.concatenate((values[:1], values)), after=after)
+
+    @staticmethod
+    def compatible(first: '_PiecewiseConstant', second: '_PiecewiseConstant') -> bool:
+        "Whether two tables can be combined into a single table"
+        return first.period == second.period or first.is_constant or second.is_constant
+
+    @staticmethod
+    def combine(first: '_PiecewiseConstant', second: '_PiecewiseConstant', sign: float=1.0) -> '_PiecewiseConstant':
+        "Table of `first + sign * second`. The tables must be compatible"
+        period = first.period if not first.is_constant else second.period
+        breakpoints = np.concatenate((first.breakpoints, second.breakpoints))
+        after = np.concatenate((first.after, second.after))
+        order = np.lexsort((after, breakpoints))
+        breakpoints, after = breakpoints[order], after[order]
+        unique = np.ones(len(breakpoints), dtype=bool)
+        unique[1:] = (breakpoints[1:] != breakpoints[:-1]) | (after[1:] != after[:-1])
+        breakpoints, after = breakpoints[unique], after[unique]
+        first_idxs = np.concatenate(([0], first._segment_index(breakpoints, after)))
+        second_idxs = np.concatenate(([0], second._segment_index(breakpoints, after)))
+        values = first.values[first_idxs] + sign * second.values[second_idxs]
+        return _PiecewiseConstant(breakpoints, values, period, after)
+
+    @staticmethod
+    def stitch(first: '_PiecewiseConstant', second: '_PiecewiseConstant', timepoint: float) -> '_PiecewiseConstant':
+        "Non-periodic table that follows `first` before `timepoint` and `second` from it on. Both tables must be non-periodic"
+        before = first.breakpoints < timepoint
+        beyond = (second.breakpoints > timepoint) | ((second.breakpoints == timepoint) & second.after)
+        breakpoints = np.concatenate((first.breakpoints[before], [timepoint], second.breakpoints[beyond]))
+        after = np.concatenate((first.after[before], [False], second.after[beyond]))
+        values = np.concatenate((first.values[:np.count_nonzero(before) + 1],
+                                 second.values[second._segment_index(np.array([timepoint]), False)],
+                                 second.values[1:][beyond]))
+        return _PiecewiseConstant(breakpoints, values, after=after)
+
+    def shifted(self, offset: float) -> '_PiecewiseConstant':
+        "Non-periodic table delayed by `offset` hours"
+        return _PiecewiseConstant(self.breakpoints + offset, self.values, after=self.after)
+
+    def antiderivative(self,
+                       time: np.ndarray, # times to evaluate the antiderivative at
+                       transform: Callable=None, # function applied to the light values before integrating. If None, the light values are integrated
+                       ) -> np.ndarray:
+        "Antiderivative of the (transformed) light function. Differences between two times give exact integrals"
+        if self.period is not None and not self.is_constant:
+            # whole periods contribute the integral over one period
+            one_period = self.window(0.0, self.period)
+            period_integral = np.diff(one_period.antiderivative(np.array([0.0, self.period]), transform))[0]
+            periods = np.floor(time / self.period)
+            return periods * period_integral + one_period.antiderivative(time - periods * self.period, transform)
+        weights = self.values if transform is None else transform(self.values)
+        if self.is_constant:
+            return weights[0] * time
+        # antiderivative is zero at the first breakpoint
+        cumulative = np.concatenate(([0.0], np.cumsum(weights[1:-1] * np.diff(self.breakpoints))))
+        segment_idxs = np.searchsorted(self.breakpoints, time, side='right')
+        anchor_idxs = np.maximum(segment_idxs - 1, 0)
+        return cumulative[anchor_idxs] + weights[segment_idxs] * (time - self.breakpoints[anchor_idxs])
+
+
+def _describe_children(name: str, # name of the node
+                       children: list, # pairs of label and child node
+                       ) -> list:
+    "Lines describing a node of a light expression tree and its children"
+    lines = [name]
+    for child_idx, (label, child) in enumerate(children):
+        is_last = child_idx == len(children) - 1
+        child_lines = child._describe()
+        lines.append(("└─ " if is_last else "├─ ") + label + child_lines[0])
+        lines.extend(("   " if is_last else "│  ") + line for line in child_lines[1:])
+    return lines
+
+
+class _Function:
+    "Arbitrary light function, evaluated point by point"
+    compiled = False
+
+    def __init__(self, func: Callable) -> None:
+        self.func = func
+
+    def __call__(self, time: np.ndarray) -> np.ndarray:
+        return self.func(time)
+
+    def _describe(self) -> list:
+        return ["Function"]
+
+    def __repr__(self) -> str:
+        return "\n".join(self._describe())
+
+
+class _Periodic:
+    "Light function that repeats a function which can't be compiled into a table"
+    compiled = False
+
+    def __init__(self, child, period: float) -> None:
+        self.child = child
+        self.period = period
+
+    def __call__(self, time: np.ndarray) -> np.ndarray:
+        return self.child(np.mod(time, self.period))
+
+    def _describe(self) -> list:
+        return _describe_children(f"Periodic(period={self.period:g})", [("", self.child)])
+
+    def __repr__(self) -> str:
+        return "\n".join(self._describe())
+
+
+class _Samples:
+    "Light function that linearly interpolates measured samples. Outside the sampled range the light is `fill`"
+    compiled = False
+
+    def __init__(self,
+                 times: np.ndarray, # strictly increasing sample times in hours
+                 lux: np.ndarray, # light intensity at each sample time
+                 fill: float, # light intensity outside the sampled range
+                 ) -> None:
+        self.times = times
+        self.lux = lux
+        self.fill = fill
+
+    def __call__(self, time: np.ndarray) -> np.ndarray:
+        if len(self.times) == 1:
+            return np.where(time == self.times[0], self.lux[0], self.fill)
+        # index of the sample interval containing each time
+        idxs = np.clip(np.searchsorted(self.times, time, side='right') - 1, 0, len(self.times) - 2)
+        slopes = (self.lux[idxs + 1] - self.lux[idxs]) / (self.times[idxs + 1] - self.times[idxs])
+        light_values = self.lux[idxs] + slopes * (time - self.times[idxs])
+        return np.where((time < self.times[0]) | (time > self.times[-1]), self.fill, light_values)
+
+    def _describe(self) -> list:
+        return [f"Samples({len(self.times)} samples, linear)"]
+
+    def __repr__(self) -> str:
+        return "\n".join(self._describe())
+
+
+class _SmoothPulses:
+    "Light function given by a sum of pulses with tanh edges, `lux * (tanh(steepness * (t - start)) - tanh(steepness * (t - end))) / 2`"
+    compiled = False
+
+    def __init__(self,
+                 lux: np.ndarray, # light intensity of each pulse
+                 starts: np.ndarray, # start time of each pulse in hours
+                 ends: np.ndarray, # end time of each pulse in hours
+                 steepness: float, # steepness of the pulse edges
+                 ) -> None:
+        self.lux = lux
+        self.starts = starts
+        self.ends = ends
+        self.steepness = steepness
+
+    def __call__(self, time: np.ndarray) -> np.ndarray:
+        edges = np.tanh(self.steepness * (time[:, None] - self.starts[None, :])) - np.tanh(self.steepness * (time[:, None] - self.ends[None, :]))
+        return 0.5 * (edges @ self.lux)
+
+    def _describe(self) -> list:
+        return [f"SmoothPulses({len(self.lux)} pulses, steepness={self.steepness:g})"]
+
+    def __repr__(self) -> str:
+        return "\n".join(self._describe())
+
+
+class _Combination:
+    "Light function given by `first + sign * second`"
+    def __init__(self, first, second, sign: float) -> None:
+        self.first = first
+        self.second = second
+        self.sign = sign
+        self.compiled = first.compiled and second.compiled
+
+    def __call__(self, time: np.ndarray) -> np.ndarray:
+        return self.first(time) + self.sign * self.second(time)
+
+    def window(self, start: float, end: float) -> _PiecewiseConstant:
+        "Non-periodic table that matches this function between `start` and `end`. Only for compiled functions"
+        return _PiecewiseConstant.combine(self.first.window(start, end), self.second.window(start, end), self.sign)
+
+    def _describe(self) -> list:
+        return _describe_children("Sum" if self.sign > 0 else "Difference", [("", self.first), ("", self.second)])
+
+    def __repr__(self) -> str:
+        return "\n".join(self._describe())
+
+
+class _Piecewise:
+    "Light function that switches between children at increasing start times. Each child is only evaluated on its own time range, delayed by its offset"
+    def __init__(self,
+                 starts: list, # increasing start time of each child. The first one is -inf
+                 children: list, # light functions
+                 offsets: list, # delay applied to the time passed to each child
+                 ) -> None:
+        self.starts = np.asarray(starts, dtype=float)
+        self.children = list(children)
+        self.offsets = np.asarray(offsets, dtype=float)
+        self.compiled = all(child.compiled for child in self.children)
+
+    def __call__(self, time: np.ndarray) -> np.ndarray:
+        piece_idxs = np.searchsorted(self.starts, time, side='right') - 1
+        light_values = np.empty(time.shape)
+        for piece_idx in np.unique(piece_idxs):
+            in_piece = piece_idxs == piece_idx
+            light_values[in_piece] = self.children[piece_idx](time[in_piece] - self.offsets[piece_idx])
+        return light_values
+
+    def window(self, start: float, end: float) -> _PiecewiseConstant:
+        "Non-periodic table that matches this function between `start` and `end`. Only for compiled functions"
+        first_piece = np.searchsorted(self.starts, start, side='right') - 1
+        last_piece = np.searchsorted(self.starts, end, side='right') - 1
+        table = None
+        for piece_idx in range(first_piece, last_piece + 1):
+            piece_start = max(start, self.starts[piece_idx])
+            piece_end = end if piece_idx == last_piece else self.starts[piece_idx + 1]
+            offset = self.offsets[piece_idx]
+            piece = self.children[piece_idx].window(piece_start - offset, piece_end - offset).shifted(offset)
+            table = piece if table is None else _PiecewiseConstant.stitch(table, piece, self.starts[piece_idx])
+        return table
+
+    def _describe(self) -> list:
+        labels = []
+        for start, offset in zip(self.starts, self.offsets):
+            shift = f" shifted by {offset:g}" if offset != 0.0 else ""
+            labels.append(f"from {start:g}{shift}: ")
+        return _describe_children("Piecewise", list(zip(labels, self.children)))
+
+    def __repr__(self) -> str:
+        return "\n".join(self._describe())
+
+
+def _is_zero(expression) -> bool:
+    "Whether the expression is the constant 0 lux"
+    return isinstance(expression, _PiecewiseConstant) and expression.is_constant and expression.values[0] == 0.0
+
+
+def _combine_expressions(first, second, sign: float):
+    "Expression for the sum (`sign=1`) or difference (`sign=-1`) of two expressions. Tables are folded into a single table"
+    if isinstance(first, _PiecewiseConstant) and isinstance(second, _PiecewiseConstant) and _PiecewiseConstant.compatible(first, second):
+        return _PiecewiseConstant.combine(first, second, sign)
+    if _is_zero(second):
+        return first
+    if _is_zero(first) and sign > 0:
+        return second
+    return _Combination(first, second, sign)
+
+
+def _concatenate_expressions(first, second, timepoint: float, offset: float):
+    "Expression that follows `first` before `timepoint` and `second`, delayed by `offset`, from it on. Tables are folded into a single table and nested concatenations are flattened"
+    if isinstance(first, _PiecewiseConstant) and isinstance(second, _PiecewiseConstant) and first.period is None and second.period is None:
+        return _PiecewiseConstant.stitch(first, second.shifted(offset), timepoint)
+    # pieces of first that start before the timepoint
+    if isinstance(first, _Piecewise):
+        keep = first.starts < timepoint
+        starts, children, offsets = list(first.starts[keep]), [child for child, kept in zip(first.children, keep) if kept], list(first.offsets[keep])
+    else:
+        starts, children, offsets = [-np.inf], [first], [0.0]
+    # pieces of second from the timepoint on
+    if isinstance(second, _Piecewise):
+        second_starts = second.starts + offset
+        first_piece = np.searchsorted(second_starts, timepoint, side='right') - 1
+        starts += [timepoint] + list(second_starts[first_piece + 1:])
+        children += second.children[first_piece:]
+        offsets += list(second.offsets[first_piece:] + offset)
+    else:
+        starts.append(timepoint)
+        children.append(second)
+        offsets.append(offset)
+    return _Piecewise(starts, children, offsets)
+
+
+def _repeat_expression(expression, period: float):
+    "Expression that repeats `expression` between 0 and `period` every `period` hours. Compiled expressions are folded into a single periodic table"
+    if expression.compiled:
+        table = expression.window(0.0, period)
+        return _PiecewiseConstant(table.breakpoints, table.values, period, table.after)
+    return _Periodic(expression, period)
+
+
+def _records_constructor(constructor: Callable, # function that creates a LightSchedule
+                         ) -> Callable:
+    "Decorator that records the name and parameters of a built-in constructor in the schedules it creates"
+    signature = inspect.signature(constructor)
+    @functools.wraps(constructor)
+    def wrapper(*args, **kwargs):
+        schedule = constructor(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        parameters = {name: value.item() if isinstance(value, np.generic) else value
+                      for name, value in bound.arguments.items() if name != 'cls'}
+        schedule._constructor = {'name': constructor.__name__, 'parameters': parameters}
+        return schedule
+    return wrapper
+
+# %% ../nbs/api/01_lights.ipynb 6
 class LightSchedule:
     "Helper class for creating light schedules"
     def __init__(self, 
                  light: Callable[[float], float], # function that takes in a time value and returns a float, if a float is passed, then the light function is a constant set to that lux value 
                  period: float = None, # period in hours, if None, then the light pulse is not repeated. Must be positive
+                 vectorized: bool = False, # whether `light` takes and returns numpy arrays. Vectorized functions are evaluated on whole arrays instead of point by point
                  ) -> None:
         # period input checking
         period_err_msg = "`period` should be a positive `float` or `int`"
@@ -39,8 +401,8 @@ class LightSchedule:
                 # catches when the provided light value is negative
                 raise ValueError(light_input_err_msg)
             else:
-                # create a light function that is a constant set to the provided light value
-                light_fn = lambda t: light
+                # a constant set to the provided light value
+                expression = _PiecewiseConstant([], [light])
         else:
             if len(inspect.signature(light).parameters) != 1:
                 # catches when the provided light function does not take in a single parameter
@@ -52,13 +414,30 @@ class LightSchedule:
                 except:
                     # catches when the function created from light does not return values that can be cast to float
                     raise ValueError(light_input_err_msg)
-            # create a light function that is the provided light function
-            if period != None:
-                light_fn = lambda t: light(np.mod(t, period))
-            else:
-                light_fn = light
-        # create a vectorized version of the light function that can take in numpy arrays
-        self._func = np.vectorize(light_fn, otypes=[float])
+                if vectorized and np.shape(light(np.zeros(2))) != (2,):
+                    # catches when a vectorized function does not return one value per time
+                    raise ValueError("`light` should return one value per time when `vectorized` is True")
+        # expression tree used to evaluate the schedule
+        if isinstance(light, LightSchedule):
+            expression = light._expression if period == None else _repeat_expression(light._expression, period)
+        elif callable(light):
+            expression = _Function(light if vectorized else np.vectorize(light, otypes=[float]))
+            expression = expression if period == None else _Periodic(expression, period)
+        self._expression = expression
+
+    @classmethod
+    def _from_expression(cls,
+                         expression, # expression tree of the schedule
+                         ) -> 'LightSchedule':
+        "Create a schedule directly from an expression tree, skipping input checking"
+        schedule = cls.__new__(cls)
+        schedule._expression = expression
+        return schedule
+
+    @property
+    def _func(self):
+        "Point by point light function, built on demand from the expression tree"
+        return np.vectorize(lambda t: self._expression(np.array([t], dtype=float))[0], otypes=[float])
 
     def __call__(self,
                  time: np.ndarray, # time in hours 
@@ -79,13 +458,14 @@ class LightSchedule:
         except:
             raise ValueError(time_err_msg) 
         # calculate the light intensity at the provided times
-        light_values = self._func(time)
+        light_values = self._expression(time)
         # throw a warning if any of the light values are negative
         if np.any(light_values < 0):
             warnings.warn("Some light values are negative")
         return light_values
 
     @classmethod
+    @_records_constructor
     def from_pulse(cls,
                    lux: float, # light intensity of the pulse in lux. Must be nonnegative
                    start: float, # start time in hours 
@@ -133,16 +513,10 @@ class LightSchedule:
             raise ValueError(baseline_err_msg)
         else:
             baseline = float(baseline)
-        # create the light schedule
-        def fn(time):
-            baseline_zone = (time < start) | (time > start + duration)
-            light_zone = (time >= start) & (time <= start + duration)
-            conditions = [baseline_zone, light_zone]
-            values = [baseline, lux]
-            return np.piecewise(time, conditions, values)
-        return cls(fn, period=period)
+        # create the light schedule. The pulse includes its end point, so the baseline starts right after it
+        return cls._from_expression(_PiecewiseConstant([start, start + duration], [baseline, lux, baseline], period, after=[False, True]))
 
-# %% ../nbs/api/01_lights.ipynb 6
+# %% ../nbs/api/01_lights.ipynb 7
 @patch_to(LightSchedule)
 def __add__(self, 
             schedule: 'LightSchedule' # another LightSchedule object 
@@ -152,12 +526,9 @@ def __add__(self,
     schedule_err_msg = "`schedule` should be a `LightSchedule` object"
     if not isinstance(schedule, LightSchedule):
         raise TypeError(schedule_err_msg)
-    fn_1 = self._func
-    fn_2 = schedule._func
-    lux = lambda t: fn_1(t) + fn_2(t)
-    return LightSchedule(lux)
+    return LightSchedule._from_expression(_combine_expressions(self._expression, schedule._expression, 1.0))
 
-# %% ../nbs/api/01_lights.ipynb 7
+# %% ../nbs/api/01_lights.ipynb 8
 @patch_to(LightSchedule)
 def __sub__(self,
             schedule: 'LightSchedule' # another LightSchedule object
@@ -167,12 +538,9 @@ def __sub__(self,
     schedule_err_msg = "`schedule` should be a `LightSchedule` object"
     if not isinstance(schedule, LightSchedule):
         raise TypeError(schedule_err_msg)
-    fn_1 = self._func
-    fn_2 = schedule._func
-    lux = lambda t: fn_1(t) - fn_2(t)
-    return LightSchedule(lux)
+    return LightSchedule._from_expression(_combine_expressions(self._expression, schedule._expression, -1.0))
 
-# %% ../nbs/api/01_lights.ipynb 8
+# %% ../nbs/api/01_lights.ipynb 9
 @patch_to(LightSchedule)
 def concatenate_at(self,
                    schedule : 'LightSchedule', # another LightSchedule object
@@ -194,23 +562,171 @@ def concatenate_at(self,
     shift_schedule_err_msg = "`shift_schedule` should be a `bool`"
     if not isinstance(shift_schedule, bool):
         raise TypeError(shift_schedule_err_msg)
-    # create the new schedule
-    fn_1 = self._func
-    fn_2 = schedule._func
-    def fn(t):
-        func_1_zone = t < timepoint
-        func_2_zone = t >= timepoint
-        conditions = [func_1_zone, func_2_zone]
-        if shift_schedule:
-            # shift the schedule by the timepoint value
-            values = [fn_1(t), fn_2(t-timepoint)]
-        else:
-            # don't shift the schedule
-            values = [fn_1(t), fn_2(t)]
-        return np.piecewise(t, conditions, values)
-    return LightSchedule(fn)
+    # create the new schedule, `schedule` is only evaluated after the timepoint
+    offset = timepoint if shift_schedule else 0.0
+    return LightSchedule._from_expression(_concatenate_expressions(self._expression, schedule._expression, timepoint, offset))
+
+# %% ../nbs/api/01_lights.ipynb 10
+@patch_to(LightSchedule, as_prop=True)
+def expression(self):
+    "Expression tree used to evaluate the schedule. Printing it shows how the schedule is composed"
+    return self._expression
+
+# %% ../nbs/api/01_lights.ipynb 11
+@patch_to(LightSchedule)
+def _exact_integral(self,
+                    start: float, # start time of the windows in hours
+                    end: float, # end time of the windows in hours
+                    transform: Callable=None, # function applied to the light values before integrating
+                    ):
+    "Integrate the (transformed) light function exactly over one or many windows using the breakpoints of the schedule"
+    # start and end input checking
+    windows_err_msg = "`start` and `end` should be `float`, `int`, or 1d `numpy.ndarray` of the same length"
+    is_scalar = np.ndim(start) == 0 and np.ndim(end) == 0
+    try:
+        start = np.atleast_1d(np.asarray(start, dtype=float))
+        end = np.atleast_1d(np.asarray(end, dtype=float))
+    except:
+        raise TypeError(windows_err_msg)
+    if start.ndim != 1 or end.ndim != 1 or (len(start) != len(end) and len(start) != 1 and len(end) != 1):
+        raise ValueError(windows_err_msg)
+    if np.any(np.isnan(start)) or np.any(np.isnan(end)):
+        raise ValueError("`start` and `end` should not contain NaNs")
+    if np.any(end < start):
+        raise ValueError("`end` should be greater than or equal to `start`")
+    if not self._expression.compiled:
+        raise ValueError("exact integrals are only available for piecewise constant schedules")
+    expression = self._expression
+    if not isinstance(expression, _PiecewiseConstant):
+        # flatten the schedule into a single table over the windows
+        expression = expression.window(np.min(start), np.max(end))
+    integral = expression.antiderivative(end, transform) - expression.antiderivative(start, transform)
+    return float(integral[0]) if is_scalar else integral
+
+# %% ../nbs/api/01_lights.ipynb 12
+@patch_to(LightSchedule)
+def integral(self,
+             start: float, # start time in hours. Can be an array to integrate over many windows at once
+             end: float, # end time in hours. Can be an array to integrate over many windows at once
+             ) -> float: # light exposure in lux hours, an array if the windows are arrays
+    "Exact integral of the light intensity between `start` and `end`. Only for piecewise constant schedules"
+    return self._exact_integral(start, end)
+
+# %% ../nbs/api/01_lights.ipynb 13
+@patch_to(LightSchedule)
+def time_above(self,
+               threshold: float, # light intensity in lux
+               start: float, # start time in hours. Can be an array to evaluate many windows at once
+               end: float, # end time in hours. Can be an array to evaluate many windows at once
+               ) -> float: # time in hours, an array if the windows are arrays
+    "Exact time that the light intensity is strictly above `threshold` between `start` and `end`. Only for piecewise constant schedules"
+    threshold_err_msg = "`threshold` should be a `float` or `int`"
+    if not isinstance(threshold, (int, float)):
+        raise TypeError(threshold_err_msg)
+    return self._exact_integral(start, end, lambda values: (values > threshold).astype(float))
+
+# %% ../nbs/api/01_lights.ipynb 14
+_SAMPLE_CACHE_SIZE = 8 # number of sampled grids memoised by each schedule
+
+@patch_to(LightSchedule)
+def sample(self,
+           start: float, # start time in hours
+           end: float, # end time in hours, not included in the samples
+           dt: float, # time between samples in hours. Must be positive
+           ) -> Tuple[np.ndarray, np.ndarray]: # sampled times and light values
+    "Sample the schedule every `dt` hours between `start` and `end`. Periodic schedules are evaluated over a single period and tiled. Results are cached and returned as read-only arrays"
+    # input checking
+    if not isinstance(start, (float, int)):
+        raise TypeError(f"start must be a float or int, got {type(start)}")
+    if not isinstance(end, (float, int)):
+        raise TypeError(f"end must be a float or int, got {type(end)}")
+    if not isinstance(dt, (float, int)):
+        raise TypeError(f"dt must be a float or int, got {type(dt)}")
+    if dt <= 0:
+        raise ValueError(f"dt must be positive, got {dt}")
+    if end <= start:
+        raise ValueError("end must be greater than start")
+    key = (float(start), float(end), float(dt))
+    cache = self.__dict__.setdefault('_sample_cache', OrderedDict())
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    time = np.arange(start, end, dt)
+    period = getattr(self._expression, 'period', None)
+    samples_per_period = None if period is None else period / dt
+    if samples_per_period is not None and np.isclose(samples_per_period, np.round(samples_per_period)) and len(time) > np.round(samples_per_period):
+        # evaluate one period and repeat it
+        samples_per_period = int(np.round(samples_per_period))
+        light_values = np.resize(self(time[:samples_per_period]), len(time))
+    else:
+        light_values = self(time)
+    time.setflags(write=False)
+    light_values.setflags(write=False)
+    cache[key] = (time, light_values)
+    if len(cache) > _SAMPLE_CACHE_SIZE:
+        cache.popitem(last=False)
+    return time, light_values
+
+# %% ../nbs/api/01_lights.ipynb 15
+_SAMPLE_INTERPOLATIONS = ['previous', 'linear']
+
+@patch_to(LightSchedule, cls_method=True)
+def from_samples(cls,
+                 times: np.ndarray, # sample times in hours, or a wearable dataframe with a `light_estimate` column
+                 lux: np.ndarray=None, # light intensity at each sample time. Samples with NaN are replaced by `fill`. Must be None when `times` is a dataframe
+                 interpolation: str='previous', # 'previous' holds each sample until the next one, 'linear' interpolates between samples
+                 fill: float=0.0, # light intensity before the first and after the last sample
+                 ) -> 'LightSchedule':
+    "Define a light schedule from measured light samples. Wearable dataframes are converted to hours since midnight of the first sampled day"
+    # dataframe input
+    if isinstance(times, pd.DataFrame):
+        if lux is not None:
+            raise ValueError("`lux` should be None when `times` is a dataframe")
+        df = times
+        df.wearable.is_valid()
+        if 'light_estimate' not in df.columns:
+            raise ValueError("the dataframe should have a `light_estimate` column")
+        timestamps = pd.to_datetime(df['datetime'] if 'datetime' in df.columns else df['start'])
+        midnight = timestamps.min().normalize()
+        times = ((timestamps - midnight) / pd.Timedelta(hours=1)).to_numpy(dtype=float)
+        lux = df['light_estimate'].to_numpy(dtype=float)
+    # times and lux input checking
+    samples_err_msg = "`times` and `lux` should be 1d `numpy.ndarray` of `float` with the same nonzero length"
+    try:
+        times = np.array(times, dtype=float)
+        lux = np.array(lux, dtype=float)
+    except:
+        raise TypeError(samples_err_msg)
+    if times.ndim != 1 or lux.shape != times.shape or len(times) == 0:
+        raise ValueError(samples_err_msg)
+    if np.any(np.isnan(times)):
+        raise ValueError("`times` should not contain NaNs")
+    if np.any(lux < 0):
+        raise ValueError("`lux` should be nonnegative")
+    # interpolation input checking
+    if interpolation not in _SAMPLE_INTERPOLATIONS:
+        raise ValueError(f"`interpolation` should be one of {_SAMPLE_INTERPOLATIONS}")
+    # fill input checking
+    fill_err_msg = "`fill` should be a nonnegative `float` or `int`"
+    if not isinstance(fill, (int, float)):
+        raise TypeError(fill_err_msg)
+    elif fill < 0:
+        raise ValueError(fill_err_msg)
+    else:
+        fill = float(fill)
+    # sort the samples
+    order = np.argsort(times, kind='stable')
+    times, lux = times[order], np.where(np.isnan(lux[order]), fill, lux[order])
+    if np.any(np.diff(times) == 0):
+        raise ValueError("`times` should not contain duplicates")
+    if interpolation == 'previous':
+        # each sample holds until the next one, the last one only at its own time
+        expression = _PiecewiseConstant(np.append(times, times[-1]), np.concatenate(([fill], lux, [fill])),
+                                        after=np.append(np.zeros(len(times), dtype=bool), True))
+    else:
+        expression = _Samples(times, lux, fill)
+    return cls._from_expression(expression)
 
-# %% ../nbs/api/01_lights.ipynb 9
 @patch_to(LightSchedule)
 def plot(self, 
          plot_start_time: float, # start time of the plot in hours
@@ -242,8 +758,152 @@ def plot(self,
     ax.plot(t, vals, *args, **kwargs)
     return ax
 
-# %% ../nbs/api/01_lights.ipynb 10
+# %% ../nbs/api/01_lights.ipynb 16
+@patch_to(LightSchedule, cls_method=True)
+def from_smooth_pulses(cls,
+                       lux: np.ndarray, # light intensity of each pulse in lux
+                       starts: np.ndarray, # start time of each pulse in hours
+                       ends: np.ndarray, # end time of each pulse in hours. Must be greater than the start times
+                       steepness: float=30.0, # steepness of the tanh edges of the pulses
+                       ) -> 'LightSchedule':
+    "Define a light schedule as a sum of pulses with smooth tanh edges, like the ones used in experimental protocols"
+    # pulses input checking
+    pulses_err_msg = "`lux`, `starts`, and `ends` should be 1d `numpy.ndarray` of `float` with the same length"
+    try:
+        lux = np.atleast_1d(np.array(lux, dtype=float))
+        starts = np.atleast_1d(np.array(starts, dtype=float))
+        ends = np.atleast_1d(np.array(ends, dtype=float))
+    except:
+        raise TypeError(pulses_err_msg)
+    if lux.ndim != 1 or starts.shape != lux.shape or ends.shape != lux.shape:
+        raise ValueError(pulses_err_msg)
+    if np.any(ends <= starts):
+        raise ValueError("`ends` should be greater than `starts`")
+    # steepness input checking
+    steepness_err_msg = "`steepness` should be a positive `float` or `int`"
+    if not isinstance(steepness, (int, float)):
+        raise TypeError(steepness_err_msg)
+    elif steepness <= 0:
+        raise ValueError(steepness_err_msg)
+    return cls._from_expression(_SmoothPulses(lux, starts, ends, float(steepness)))
+
+# %% ../nbs/api/01_lights.ipynb 17
+def _expression_spec(expression) -> dict:
+    "JSON-able description of an expression tree. Arbitrary light functions can't be described"
+    if isinstance(expression, _PiecewiseConstant):
+        # constant tables don't depend on their period
+        period = None if expression.is_constant else expression.period
+        return {'type': 'table', 'breakpoints': expression.breakpoints.tolist(), 'values': expression.values.tolist(),
+                'after': expression.after.tolist(), 'period': period}
+    if isinstance(expression, _Samples):
+        return {'type': 'samples', 'times': expression.times.tolist(), 'lux': expression.lux.tolist(), 'fill': expression.fill}
+    if isinstance(expression, _SmoothPulses):
+        return {'type': 'smooth_pulses', 'lux': expression.lux.tolist(), 'starts': expression.starts.tolist(),
+                'ends': expression.ends.tolist(), 'steepness': expression.steepness}
+    if isinstance(expression, _Periodic):
+        return {'type': 'periodic', 'period': expression.period, 'child': _expression_spec(expression.child)}
+    if isinstance(expression, _Combination):
+        return {'type': 'combination', 'sign': float(expression.sign),
+                'first': _expression_spec(expression.first), 'second': _expression_spec(expression.second)}
+    if isinstance(expression, _Piecewise):
+        # the first piece always starts at -inf, which JSON can't represent
+        return {'type': 'piecewise', 'starts': expression.starts[1:].tolist(), 'offsets': expression.offsets.tolist(),
+                'children': [_expression_spec(child) for child in expression.children]}
+    raise ValueError("schedules created from arbitrary light functions can't be described by a spec")
+
+
+def _expression_from_spec(spec: dict):
+    "Expression tree described by a spec created with `_expression_spec`"
+    if spec['type'] == 'table':
+        return _PiecewiseConstant(spec['breakpoints'], spec['values'], spec['period'], spec['after'])
+    if spec['type'] == 'samples':
+        return _Samples(np.asarray(spec['times'], dtype=float), np.asarray(spec['lux'], dtype=float), float(spec['fill']))
+    if spec['type'] == 'smooth_pulses':
+        return _SmoothPulses(*(np.asarray(spec[name], dtype=float) for name in ('lux', 'starts', 'ends')), float(spec['steepness']))
+    if spec['type'] == 'periodic':
+        return _Periodic(_expression_from_spec(spec['child']), spec['period'])
+    if spec['type'] == 'combination':
+        return _Combination(_expression_from_spec(spec['first']), _expression_from_spec(spec['second']), spec['sign'])
+    if spec['type'] == 'piecewise':
+        return _Piecewise([-np.inf] + list(spec['starts']), [_expression_from_spec(child) for child in spec['children']], spec['offsets'])
+    raise ValueError(f"unknown expression type {spec['type']}")
+
+
+_SPEC_CONSTRUCTORS = ['from_pulse', 'Regular', 'ShiftWork', 'SlamShift', 'SocialJetlag']
+
+# %% ../nbs/api/01_lights.ipynb 18
+@patch_to(LightSchedule)
+def to_spec(self) -> dict:
+    "JSON-able specification of the schedule. Schedules from the built-in constructors record their parameters, the rest record their expression tree"
+    constructor = getattr(self, '_constructor', None)
+    if constructor is not None:
+        return {'constructor': constructor['name'], 'parameters': dict(constructor['parameters'])}
+    return {'expression': _expression_spec(self._expression)}
+
+
+@patch_to(LightSchedule, cls_method=True)
+def from_spec(cls,
+              spec: dict, # specification created by `LightSchedule.to_spec`
+              ) -> 'LightSchedule':
+    "Create a schedule from its specification"
+    spec_err_msg = "`spec` should be a `dict` created by `LightSchedule.to_spec`"
+    if not isinstance(spec, dict):
+        raise TypeError(spec_err_msg)
+    if 'constructor' in spec:
+        if spec['constructor'] not in _SPEC_CONSTRUCTORS:
+            raise ValueError(f"`constructor` should be one of {_SPEC_CONSTRUCTORS}")
+        return getattr(cls, spec['constructor'])(**spec.get('parameters', {}))
+    if 'expression' not in spec:
+        raise ValueError(spec_err_msg)
+    try:
+        expression = _expression_from_spec(spec['expression'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(spec_err_msg)
+    return cls._from_expression(expression)
+
+# %% ../nbs/api/01_lights.ipynb 19
+@patch_to(LightSchedule)
+def _hash_key(self):
+    "Canonical string of the expression tree, or None when the schedule has arbitrary light functions"
+    if '_hash_key_cache' not in self.__dict__:
+        try:
+            self._hash_key_cache = json.dumps(_expression_spec(self._expression), sort_keys=True)
+        except ValueError:
+            self._hash_key_cache = None
+    return self._hash_key_cache
+
+
 @patch_to(LightSchedule)
+def __eq__(self,
+           schedule: 'LightSchedule', # another LightSchedule object
+           ) -> bool:
+    "Schedules are equal when their expression trees are. Schedules with arbitrary light functions are only equal to schedules that share their expression"
+    if not isinstance(schedule, LightSchedule):
+        return NotImplemented
+    key, other_key = self._hash_key(), schedule._hash_key()
+    if key is None or other_key is None:
+        return self._expression is schedule._expression
+    return key == other_key
+
+
+@patch_to(LightSchedule)
+def __hash__(self) -> int:
+    key = self._hash_key()
+    return hash(id(self._expression)) if key is None else hash(key)
+
+
+@patch_to(LightSchedule)
+def __reduce__(self):
+    "Pickle schedules through their spec. Schedules with arbitrary light functions are pickled with their attributes"
+    try:
+        return (LightSchedule.from_spec, (self.to_spec(),))
+    except ValueError:
+        state = {name: value for name, value in self.__dict__.items() if name not in ('_sample_cache', '_hash_key_cache')}
+        return (LightSchedule.__new__, (LightSchedule,), state)
+
+# %% ../nbs/api/01_lights.ipynb 20
+@patch_to(LightSchedule)
+@_records_constructor
 def Regular(lux: float=150.0, # intensity of the light in lux
             lights_on: float=7.0, # time of the day for lights to come on in hours
             lights_off: float=23.0, # time of the day for lights to go off in hours
@@ -273,8 +933,9 @@ def Regular(lux: float=150.0, # intensity of the light in lux
     elif lights_off == lights_on:
         raise ValueError("lights_off and lights_on cannot be equal")
 
-# %% ../nbs/api/01_lights.ipynb 11
+# %% ../nbs/api/01_lights.ipynb 21
 @patch_to(LightSchedule)
+@_records_constructor
 def ShiftWork(lux: float=150.0, # lux intensity of the light. Must be a nonnegative float or int
               days_on: int=5, # number of days on the night shift. Must be a positive int
               days_off: int=2, # number of days off shift. Must be a positive int
@@ -344,8 +1005,9 @@ def ShiftWork(lux: float=150.0, # lux intensity of the light. Must be a nonnegat
     final_schedule = LightSchedule(total_schedule, period=workweek_period)
     return final_schedule
 
-# %% ../nbs/api/01_lights.ipynb 12
+# %% ../nbs/api/01_lights.ipynb 22
 @patch_to(LightSchedule)
+@_records_constructor
 def SlamShift(lux: float=150.0, # intensity of the light in lux
               shift: float=8.0, # shift in the light schedule in hours
               before_days: int=5, # days before the shift occurs 
@@ -388,8 +1050,9 @@ def SlamShift(lux: float=150.0, # intensity of the light in lux
     final_schedule = final_schedule.concatenate_at(schedule_after, first_lights_on_after, shift_schedule=False)
     return final_schedule
 
-# %% ../nbs/api/01_lights.ipynb 13
+# %% ../nbs/api/01_lights.ipynb 23
 @patch_to(LightSchedule)
+@_records_constructor
 def SocialJetlag(lux: float=150.0, # intensity of the light in lux
                  num_regular_days: int=5, # number of days with a regular schedule
                  num_jetlag_days: int=2, # number of days with a delayed schedule
@@ -433,3 +1096,148 @@ def SocialJetlag(lux: float=150.0, # intensity of the light in lux
     final_schedule = LightSchedule(total_schedule, period=overall_period)
         
     return final_schedule
+
+
+# %% ../nbs/api/01_lights.ipynb 24
+def _scale_expression(expression, scale: float):
+    "Expression of a compiled expression with its light values multiplied by `scale`"
+    if scale == 1.0:
+        return expression
+    if isinstance(expression, _PiecewiseConstant):
+        return _PiecewiseConstant(expression.breakpoints, scale * expression.values, expression.period, expression.after)
+    if isinstance(expression, _Combination):
+        return _Combination(_scale_expression(expression.first, scale), _scale_expression(expression.second, scale), expression.sign)
+    return _Piecewise(expression.starts, [_scale_expression(child, scale) for child in expression.children], expression.offsets)
+
+# %% ../nbs/api/01_lights.ipynb 25
+class ScheduleBank:
+    "Array-backed collection of piecewise constant light schedules that are evaluated together on a shared time grid"
+    def __init__(self,
+                 schedules: list, # piecewise constant LightSchedules
+                 parameters: list=None, # parameters that created each schedule, one dict per schedule
+                 ) -> None:
+        schedules_err_msg = "`schedules` should be a nonempty list of piecewise constant `LightSchedule` objects"
+        if not isinstance(schedules, (list, tuple)) or len(schedules) == 0:
+            raise TypeError(schedules_err_msg)
+        if not all(isinstance(schedule, LightSchedule) and schedule._expression.compiled for schedule in schedules):
+            raise ValueError(schedules_err_msg)
+        if parameters is not None and len(parameters) != len(schedules):
+            raise ValueError("`parameters` should have one entry per schedule")
+        # schedules sharing an expression are only evaluated once
+        structure_idxs = {}
+        for schedule in schedules:
+            structure_idxs.setdefault(id(schedule._expression), len(structure_idxs))
+        expressions = {id(schedule._expression): schedule._expression for schedule in schedules}
+        self._structures = list(expressions.values())
+        self._rows = np.array([structure_idxs[id(schedule._expression)] for schedule in schedules])
+        self._scales = np.ones(len(schedules))
+        self.parameters = None if parameters is None else list(parameters)
+
+    @classmethod
+    def _from_structures(cls,
+                         structures: list, # compiled expressions
+                         rows: np.ndarray, # index of the expression of each schedule
+                         scales: np.ndarray, # factor multiplying the light values of each schedule
+                         parameters: list=None, # parameters that created each schedule
+                         ) -> 'ScheduleBank':
+        "Create a bank directly from its arrays, skipping input checking"
+        bank = cls.__new__(cls)
+        bank._structures = list(structures)
+        bank._rows = np.asarray(rows)
+        bank._scales = np.asarray(scales, dtype=float)
+        bank.parameters = parameters
+        return bank
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, idx: int) -> LightSchedule:
+        "Schedule at position `idx` of the bank"
+        return LightSchedule._from_expression(_scale_expression(self._structures[self._rows[idx]], self._scales[idx]))
+
+    def _flat_table(self,
+                    start: float, # first time the table is evaluated at
+                    end: float, # last time the table is evaluated at
+                    ):
+        "Single table holding every structure side by side. Returns the table, the period and the offset of each structure"
+        breakpoints, after, values = [], [], [np.zeros(1)]
+        periods, offsets = np.full(len(self._structures), np.nan), np.zeros(len(self._structures))
+        next_start = 0.0
+        for structure_idx, expression in enumerate(self._structures):
+            period = getattr(expression, 'period', None)
+            if period is not None:
+                # periodic structures are queried within one period
+                table, periods[structure_idx], query_start, query_end = expression.window(0.0, period), period, 0.0, period
+            else:
+                table, query_start, query_end = expression.window(start, end), start, end
+            # each structure starts with its own breakpoint, right after the previous structure
+            row_start = min(query_start, table.breakpoints[0] if len(table.breakpoints) else query_start) - 1.0
+            row_end = max(query_end, table.breakpoints[-1] if len(table.breakpoints) else query_end) + 1.0
+            offsets[structure_idx] = next_start - row_start
+            breakpoints.append(np.concatenate(([row_start], table.breakpoints)) + offsets[structure_idx])
+            after.append(np.concatenate(([False], table.after)))
+            values.append(table.values)
+            next_start += row_end - row_start
+        table = _PiecewiseConstant(np.concatenate(breakpoints), np.concatenate(values), after=np.concatenate(after))
+        return table, periods, offsets
+
+    def __call__(self,
+                 time: np.ndarray, # time in hours
+                 ) -> np.ndarray: # light values with shape (len(time), len(bank))
+        "Light intensity of every schedule of the bank at the provided times"
+        time_err_msg = "`time` should be a nonempty 1d `numpy.ndarray` of `float`"
+        try:
+            time = np.atleast_1d(np.array(time, dtype=float))
+        except:
+            raise ValueError(time_err_msg)
+        if time.ndim != 1 or len(time) == 0:
+            raise ValueError(time_err_msg)
+        table, periods, offsets = self._flat_table(np.min(time), np.max(time))
+        # evaluate every structure in a single lookup
+        queries = np.where(np.isnan(periods)[None, :], time[:, None], np.mod(time[:, None], np.where(np.isnan(periods), 1.0, periods)[None, :]))
+        structure_values = table(queries + offsets[None, :])
+        return structure_values[:, self._rows] * self._scales[None, :]
+
+    def __repr__(self) -> str:
+        return f"ScheduleBank({len(self)} schedules, {len(self._structures)} distinct structures)"
+
+# %% ../nbs/api/01_lights.ipynb 26
+def _grid_method(factory: Callable, # function that creates a single schedule
+                 ) -> Callable:
+    "Create the `grid` method of a typical schedule factory"
+    def grid(**parameters) -> ScheduleBank:
+        # every combination of the given parameter values, the others keep their defaults
+        names = list(parameters.keys())
+        invalid_names = [name for name in names if name not in inspect.signature(factory).parameters]
+        if invalid_names:
+            raise TypeError(f"{factory.__name__} got unexpected parameters: {invalid_names}")
+        options = []
+        for name in names:
+            value = parameters[name]
+            value = value.tolist() if isinstance(value, np.ndarray) else value
+            options.append(list(value) if isinstance(value, (list, tuple)) else [value])
+        if any(len(values) == 0 for values in options):
+            raise ValueError("every parameter should have at least one value")
+        combinations = [dict(zip(names, combination)) for combination in itertools.product(*options)]
+        # schedules are linear in lux, so each structure is created once with unit lux and scaled
+        structures, structure_idxs, rows, scales = [], {}, [], []
+        for combination in combinations:
+            lux = combination.get('lux', inspect.signature(factory).parameters['lux'].default)
+            if not isinstance(lux, (float, int)):
+                raise TypeError(f"lux must be a nonnegative float or int, got {type(lux)}")
+            elif lux < 0.0:
+                raise ValueError(f"lux must be a nonnegative float or int, got {lux}")
+            key = tuple((name, value) for name, value in combination.items() if name != 'lux')
+            if key not in structure_idxs:
+                structure_idxs[key] = len(structures)
+                structures.append(factory(**dict(key), lux=1.0)._expression)
+            rows.append(structure_idxs[key])
+            scales.append(float(lux))
+        return ScheduleBank._from_structures(structures, rows, scales, combinations)
+    grid.__name__ = grid.__qualname__ = f"{factory.__name__}.grid"
+    grid.__doc__ = f"Create a bank with every combination of the given `{factory.__name__}` parameters. Each parameter takes a value or a list of values, the rest keep their defaults"
+    return grid
+
+
+for _factory in (LightSchedule.Regular, LightSchedule.ShiftWork, LightSchedule.SlamShift, LightSchedule.SocialJetlag):
+    _factory.grid = _grid_method(_factory)
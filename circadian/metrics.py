@@ -1,22 +1,103 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/api/04_metrics.ipynb.
 
 # %% auto 0
-__all__ = ['esri']
+__all__ = ['esri', 'IncrementalESRI']
 
 # %% ../nbs/api/04_metrics.ipynb 4
+import os
 import warnings
+import tempfile
+import time as timer
 import numpy as np
-from typing import List
+import multiprocessing as mp
+from typing import List, Callable
 from .models import Hannay19
+from .kernels import simulate
+from .parallel import _create_shared_array, _attach_shared_array, _batch_chunks
 from .lights import LightSchedule
 
 # %% ../nbs/api/04_metrics.ipynb 5
+_ESRI_CHUNK_POINTS = 2**22 # largest number of light values held by the windows of a chunk
+
+def _esri_parameter_checking(analysis_days: int, # number of days used to calculate ESRI
+                             esri_dt: float, # time resolution of the ESRI calculation in hours
+                             initial_amplitude: float, # initial amplitude for the simulation
+                             ) -> None:
+    "Validate the parameters shared by `esri` and `IncrementalESRI`"
+    if not isinstance(analysis_days, int):
+        raise TypeError(f'analysis_days must be an integer, not {type(analysis_days)}')
+    if analysis_days < 1:
+        raise ValueError(f'analysis_days must be greater than 0')
+    if not isinstance(esri_dt, (int, float)):
+        raise TypeError(f'esri_dt must be a float or an int, not {type(esri_dt)}')
+    if esri_dt <= 0:
+        raise ValueError(f'esri_dt must be greater than 0')
+    if not isinstance(initial_amplitude, (int, float)):
+        raise TypeError(f'initial_amplitude must be a float or an int, not {type(initial_amplitude)}')
+    if initial_amplitude < 0:
+        raise ValueError(f'initial_amplitude must be non-negative')
+
+
+def _window_light(time: np.ndarray, # uniformly spaced time points of the light schedule
+                  light_schedule: np.ndarray, # light schedule in lux
+                  window_start: np.ndarray, # start time of each window
+                  window_length: int, # number of time points in each window
+                  ) -> np.ndarray: # light of each window with shape (window_length, num_windows)
+    "Light of every analysis window. Windows that start on a time point are strided views of the light schedule"
+    dt = time[1] - time[0]
+    offsets = (window_start - time[0]) / dt
+    step = offsets[1] - offsets[0] if len(offsets) > 1 else 1.0
+    if np.allclose(offsets, np.round(offsets)) and np.isclose(step, np.round(step)) and np.round(step) >= 1:
+        # no copies, the batch member k reads the schedule from offset k*step onwards
+        windows = np.lib.stride_tricks.sliding_window_view(np.asarray(light_schedule, dtype=float), window_length)
+        first, step = int(np.round(offsets[0])), int(np.round(step))
+        return windows[first::step][:len(window_start)].T
+    window_time = window_start[None, :] + dt * np.arange(window_length)[:, None]
+    return np.interp(window_time, time, light_schedule)
+
+
+def _esri_windows(time: np.ndarray, # uniformly spaced time points of the light schedule
+                  light_schedule: np.ndarray, # light schedule in lux
+                  esri_time: np.ndarray, # start time of each window
+                  window_length: int, # number of time points in each window
+                  initial_amplitude: float, # initial amplitude for the simulation
+                  phase_at_midnight: float, # phase at midnight
+                  ) -> np.ndarray: # amplitude at the end of each window
+    "Integrate a batch of ESRI windows with the compiled solver"
+    model = Hannay19(params={'K': 0.0, 'gamma': 0.0}) # with these parameters, amplitude is constant in the absence of light
+    initial_phase = phase_at_midnight + np.mod(esri_time, 24.0) * np.pi / 12 # assumes regular schedule with wake at 8 am
+    initial_condition = np.stack([np.full(len(esri_time), initial_amplitude), initial_phase, np.zeros(len(esri_time))])
+    window_light = _window_light(time, light_schedule, esri_time, window_length)
+    simulation_time = (time[1] - time[0]) * np.arange(window_length)
+    trajectory = simulate(model, simulation_time, initial_condition, window_light, save_every=window_length - 1)
+    return trajectory.states[-1, 0] # model amplitude at the end of the simulation
+
+
+def _esri_chunk(task: dict, # description of the chunk of windows to integrate
+                ) -> tuple: # first and last window of the chunk, their ESRI values, and the seconds it took
+    "Integrate a chunk of ESRI windows reading the light from shared memory"
+    chunk_start_time = timer.perf_counter()
+    time_memory, time = _attach_shared_array(task['time'])
+    light_memory, light_schedule = _attach_shared_array(task['light'])
+    try:
+        values = _esri_windows(time, light_schedule, task['esri_time'], *task['window_parameters'])
+        # drop the views before closing the shared memory blocks
+        del time, light_schedule
+    finally:
+        time_memory.close()
+        light_memory.close()
+    return task['start'], task['end'], values, timer.perf_counter() - chunk_start_time
+
+
 def esri(time: np.ndarray, # time in hours to use for the simulation 
          light_schedule: np.ndarray, # light schedule in lux 
          analysis_days: int=4, # number of days used to calculate ESRI
          esri_dt: float=1.0, # time resolution of the ESRI calculation in hours
          initial_amplitude: float=0.1, # initial amplitude for the simulation. This is the ESRI value for constant darkness
          phase_at_midnight: float=1.65238233, # phase at midnight. Default value corresponds to a 8 hour darkness and 16 hour light schedule with wake at 8 am.
+         n_jobs: int=1, # number of processes. Windows are split in contiguous chunks that run in parallel when larger than 1
+         chunk_size: int=None, # number of windows per chunk. If None, a few chunks per process are used
+         chunk_report: Callable[[int, int, float], None]=None, # called with the first and last (excluded) window of every finished chunk and the seconds it took
          ) -> List: # list with ESRI timepoints and ESRI values. Negative ESRI values are turned into NaNs
         "Calculate the ESRI metric for a given light schedule. Follows the implementation from Moreno et al. 2023 'Validation of the Entrainment Signal Regularity Index and associations with children's changes in BMI'"
         # validate inputs
@@ -28,34 +109,163 @@ def esri(time: np.ndarray, # time in hours to use for the simulation
             raise ValueError(f'time and light_schedule must be the same length')
         if not np.all(np.isclose(np.diff(time), np.diff(time)[0])):
             raise ValueError(f'time must have a fixed time resolution (time between timepoints must be constant)')
-        if not isinstance(analysis_days, int):
-            raise TypeError(f'analysis_days must be an integer, not {type(analysis_days)}')
-        if analysis_days < 1:
-            raise ValueError(f'analysis_days must be greater than 0')
-        if not isinstance(esri_dt, (int, float)):
-            raise TypeError(f'esri_dt must be a float or an int, not {type(esri_dt)}')
-        if esri_dt <= 0:
-            raise ValueError(f'esri_dt must be greater than 0')
-        if not isinstance(initial_amplitude, (int, float)):
-            raise TypeError(f'initial_amplitude must be a float or an int, not {type(initial_amplitude)}')
-        if initial_amplitude < 0:
-            raise ValueError(f'initial_amplitude must be non-negative')
+        _esri_parameter_checking(analysis_days, esri_dt, initial_amplitude)
+        if not isinstance(n_jobs, int):
+            raise TypeError(f'n_jobs must be an integer, not {type(n_jobs)}')
+        if n_jobs < 1:
+            raise ValueError(f'n_jobs must be greater than 0')
+        if chunk_size is not None and not isinstance(chunk_size, int):
+            raise TypeError(f'chunk_size must be an integer, not {type(chunk_size)}')
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f'chunk_size must be greater than 0')
+        if chunk_report is not None and not callable(chunk_report):
+            raise TypeError(f'chunk_report must be callable')
         # calculate ESRI 
-        model = Hannay19(params={'K': 0.0, 'gamma': 0.0}) # with these parameters, amplitude is constant in the absence of light
         simulation_dt = np.diff(time)[0]
         esri_time = np.arange(time[0], time[-1] - analysis_days*24, esri_dt)
+        if len(esri_time) == 0:
+            return esri_time, np.zeros_like(esri_time)
+        window_length = len(np.arange(0.0, analysis_days*24, simulation_dt))
+        if chunk_size is None:
+            # a few chunks per process, each with a bounded light buffer
+            chunk_size = max(1, min(int(np.ceil(len(esri_time) / (4 * n_jobs))), _ESRI_CHUNK_POINTS // window_length))
+        chunks = _batch_chunks(len(esri_time), chunk_size)
         esri_array = np.zeros_like(esri_time)
-        for idx, t in enumerate(esri_time):
-            initial_phase = phase_at_midnight + np.mod(t, 24.0) * np.pi / 12 # assumes regular schedule with wake at 8 am
-            initial_condition = np.array([initial_amplitude, initial_phase, 0.0])
-            simulation_time = np.arange(t, t + analysis_days*24, simulation_dt)
-            simulation_light = np.interp(simulation_time, time, light_schedule)
-            trajectory = model(simulation_time, initial_condition, simulation_light)
-            esri_value = trajectory.states[-1, 0] # model amplitude at the end of the simulation
-            esri_array[idx] = esri_value
+        window_parameters = (window_length, float(initial_amplitude), phase_at_midnight)
+        def finish(start, end, values, seconds):
+            esri_array[start:end] = values
+            if chunk_report is not None:
+                chunk_report(start, end, seconds)
+        # the first chunk runs here, which also compiles the solver before the worker processes are forked
+        first_start, first_end = chunks[0]
+        chunk_start_time = timer.perf_counter()
+        finish(first_start, first_end, _esri_windows(time, light_schedule, esri_time[first_start:first_end], *window_parameters),
+               timer.perf_counter() - chunk_start_time)
+        if n_jobs == 1 or len(chunks) == 1:
+            for start, end in chunks[1:]:
+                chunk_start_time = timer.perf_counter()
+                finish(start, end, _esri_windows(time, light_schedule, esri_time[start:end], *window_parameters),
+                       timer.perf_counter() - chunk_start_time)
+        else:
+            # workers read the time and light arrays from shared memory
+            time_memory, shared_time = _create_shared_array(time.shape, float)
+            light_memory, shared_light = _create_shared_array(light_schedule.shape, float)
+            shared_time[:] = time
+            shared_light[:] = light_schedule
+            del shared_time, shared_light
+            tasks = [{'time': (time_memory.name, time.shape, float), 'light': (light_memory.name, light_schedule.shape, float),
+                      'start': start, 'end': end, 'esri_time': esri_time[start:end], 'window_parameters': window_parameters}
+                     for start, end in chunks[1:]]
+            try:
+                with mp.get_context().Pool(min(n_jobs, len(tasks))) as pool:
+                    for result in pool.imap_unordered(_esri_chunk, tasks):
+                        finish(*result)
+            finally:
+                for shared_memory in (time_memory, light_memory):
+                    shared_memory.close()
+                    shared_memory.unlink()
         # clean up any negative values
         esri_array[esri_array < 0] = np.NaN
         # if there's any NaNs, throw a warning thay probably dt was too small
         if np.any(np.isnan(esri_array)):
             warnings.warn(f'ESRI calculation failed for certain timepoints (NaN ESRI values). Try decreasing the time resolution of the `time` and `light_schedule` arrays.')
         return esri_time, esri_array
+
+# %% ../nbs/api/04_metrics.ipynb 6
+class IncrementalESRI:
+    "ESRI for light data that arrives in pieces. Only the windows newly covered by each piece are computed and only the light needed by the next windows is kept"
+    def __init__(self,
+                 dt: float, # time resolution of the light data in hours
+                 start: float=0.0, # time in hours of the first light sample
+                 analysis_days: int=4, # number of days used to calculate ESRI
+                 esri_dt: float=1.0, # time resolution of the ESRI calculation in hours
+                 initial_amplitude: float=0.1, # initial amplitude for the simulation. This is the ESRI value for constant darkness
+                 phase_at_midnight: float=1.65238233, # phase at midnight. Default value corresponds to a 8 hour darkness and 16 hour light schedule with wake at 8 am.
+                 ) -> None:
+        if not isinstance(dt, (int, float)):
+            raise TypeError(f'dt must be a float or an int, not {type(dt)}')
+        if dt <= 0:
+            raise ValueError(f'dt must be greater than 0')
+        if not isinstance(start, (int, float)):
+            raise TypeError(f'start must be a float or an int, not {type(start)}')
+        _esri_parameter_checking(analysis_days, esri_dt, initial_amplitude)
+        self.dt = float(dt)
+        self.start = float(start)
+        self.analysis_days = analysis_days
+        self.esri_dt = float(esri_dt)
+        self.initial_amplitude = float(initial_amplitude)
+        self.phase_at_midnight = float(phase_at_midnight)
+        self.num_samples = 0 # light samples received so far
+        self.num_windows = 0 # windows computed so far
+        self.tail_start = 0 # index of the first kept light sample
+        self.tail = np.zeros(0)
+
+    def __repr__(self):
+        return f"IncrementalESRI(samples: {self.num_samples}, windows: {self.num_windows})"
+
+    def update(self,
+               light: np.ndarray, # light in lux sampled every `dt` hours, continuing right after the previously received light
+               ) -> List: # list with the ESRI timepoints and ESRI values of the windows completed by this light. Negative ESRI values are turned into NaNs
+        "Add new light data and compute the ESRI of the windows it completes"
+        if not isinstance(light, np.ndarray) or light.ndim != 1:
+            raise TypeError(f'light must be a 1D numpy array')
+        self.tail = np.concatenate([self.tail, np.asarray(light, dtype=float)])
+        self.num_samples += len(light)
+        last_time = self.start + (self.num_samples - 1) * self.dt
+        # same windows as `esri` over all the light received so far
+        num_windows = len(np.arange(self.start, last_time - self.analysis_days*24, self.esri_dt))
+        esri_time = self.start + self.esri_dt * np.arange(self.num_windows, max(num_windows, self.num_windows))
+        esri_array = np.zeros_like(esri_time)
+        if len(esri_time) > 0:
+            tail_time = self.start + self.dt * np.arange(self.tail_start, self.num_samples)
+            window_length = len(np.arange(0.0, self.analysis_days*24, self.dt))
+            for start, end in _batch_chunks(len(esri_time), max(1, _ESRI_CHUNK_POINTS // window_length)):
+                esri_array[start:end] = _esri_windows(tail_time, self.tail, esri_time[start:end], window_length,
+                                                      self.initial_amplitude, self.phase_at_midnight)
+            self.num_windows = num_windows
+        # drop the light that comes before the next window
+        next_window = self.start + self.num_windows * self.esri_dt
+        first_needed = min(int(np.floor((next_window - self.start) / self.dt + 1e-9)), self.num_samples)
+        if first_needed > self.tail_start:
+            self.tail = self.tail[first_needed - self.tail_start:].copy()
+            self.tail_start = first_needed
+        esri_array[esri_array < 0] = np.NaN
+        if np.any(np.isnan(esri_array)):
+            warnings.warn(f'ESRI calculation failed for certain timepoints (NaN ESRI values). Try decreasing the time resolution of the `time` and `light_schedule` arrays.')
+        return esri_time, esri_array
+
+    def save(self,
+             path: str, # path of the `.npz` file storing the state
+             ) -> None:
+        "Store the state so that the computation can continue in another session"
+        if not isinstance(path, str):
+            raise TypeError("path must be a string")
+        directory = os.path.dirname(os.path.abspath(path))
+        # write to a temporary file first so an interrupted save never leaves a partial state
+        descriptor, temporary = tempfile.mkstemp(suffix='.npz', dir=directory)
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                np.savez(file, tail=self.tail, dt=self.dt, start=self.start, analysis_days=self.analysis_days,
+                         esri_dt=self.esri_dt, initial_amplitude=self.initial_amplitude,
+                         phase_at_midnight=self.phase_at_midnight, num_samples=self.num_samples,
+                         num_windows=self.num_windows, tail_start=self.tail_start)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    @classmethod
+    def load(cls,
+             path: str, # path of a `.npz` file written by `save`
+             ) -> 'IncrementalESRI':
+        "Restore a state stored with `save`"
+        if not isinstance(path, str):
+            raise TypeError("path must be a string")
+        with np.load(path) as stored:
+            stream = cls(float(stored['dt']), float(stored['start']), int(stored['analysis_days']),
+                         float(stored['esri_dt']), float(stored['initial_amplitude']), float(stored['phase_at_midnight']))
+            stream.num_samples = int(stored['num_samples'])
+            stream.num_windows = int(stored['num_windows'])
+            stream.tail_start = int(stored['tail_start'])
+            stream.tail = stored['tail'].copy()
+        return stream
@@ -44,14 +44,20 @@ class DynamicalTrajectory:
     "A class to store solutions of differential equation models that contains both the time points and the states"
     def __init__(self, 
                  time: np.ndarray, # time points
-                 states: np.ndarray # state at time points
+                 states: np.ndarray, # state at time points
+                 saved_states: list=None, # indices in the model's state vector of the stored states. If None, all states are stored
                  ) -> None:
         # input checking
         _time_input_checking(time)
         _state_input_checking(states, time)
+        if saved_states is not None:
+            if states.ndim < 2 or len(saved_states) != states.shape[1]:
+                raise ValueError("saved_states must have one index per stored state")
+            saved_states = tuple(int(state_idx) for state_idx in saved_states)
         
         self.time = time
         self.states = states
+        self.saved_states = saved_states
         self.num_states = states.shape[1]
         if states.ndim >= 3:
             self.batch_size = states.shape[2]
@@ -107,12 +113,127 @@ def get_batch(self, batch_idx: int) -> 'DynamicalTrajectory':
     if batch_idx < -1 or batch_idx >= self.batch_size:
         raise ValueError(f"batch_idx must be within -1 and {self.batch_size-1}, got {batch_idx}")
     if self.states.ndim >= 3:
-        return DynamicalTrajectory(self.time, self.states[:, :, batch_idx])
+        return DynamicalTrajectory._trusted(self.time, self.states[:, :, batch_idx], self.saved_states)
     else:
         # no batch dimension
-        return DynamicalTrajectory(self.time, self.states)
+        return DynamicalTrajectory._trusted(self.time, self.states, self.saved_states)
 
 # %% ../nbs/api/00_models.ipynb 14
+@patch_to(DynamicalTrajectory, cls_method=True)
+def from_file(cls,
+              time: np.ndarray, # time points
+              states_path: str, # path to a `.npy` file with the states, such as the one written by `CircadianModel.integrate`
+              mmap_mode: str='r', # memory-map mode passed to `np.load`. Use None to load the states into memory
+              saved_states: list=None, # indices in the model's state vector of the stored states. If None, all states are stored
+              ) -> 'DynamicalTrajectory':
+    "Create a trajectory whose states are read lazily from a `.npy` file on disk"
+    if not isinstance(states_path, str):
+        raise TypeError("states_path must be a string")
+    _time_input_checking(time)
+    states = np.load(states_path, mmap_mode=mmap_mode)
+    # only the header is checked, reading the states would load the whole file
+    if states.ndim < 2 or states.ndim > 3 or states.shape[0] != len(time):
+        raise ValueError("the stored states must have shape (len(time), num_states) or (len(time), num_states, batch_size)")
+    if saved_states is not None and len(saved_states) != states.shape[1]:
+        raise ValueError("saved_states must have one index per stored state")
+    return cls._trusted(time, states, saved_states)
+
+# %% ../nbs/api/00_models.ipynb 15
+@patch_to(DynamicalTrajectory, cls_method=True)
+def _trusted(cls,
+             time: np.ndarray, # time points, assumed to be a valid, monotonically increasing 1D array
+             states: np.ndarray, # state at time points, assumed to match `time`
+             saved_states: tuple=None, # indices in the model's state vector of the stored states. If None, all states are stored
+             ) -> 'DynamicalTrajectory':
+    "Create a trajectory skipping input checking. Only for internal callers that already guarantee valid inputs"
+    trajectory = cls.__new__(cls)
+    trajectory.time = time
+    trajectory.states = states
+    trajectory.saved_states = None if saved_states is None else tuple(int(state_idx) for state_idx in saved_states)
+    trajectory.num_states = states.shape[1]
+    if states.ndim >= 3:
+        trajectory.batch_size = states.shape[2]
+    else:
+        trajectory.batch_size = 1
+    return trajectory
+
+# %% ../nbs/api/00_models.ipynb 16
+@patch_to(DynamicalTrajectory)
+def window(self,
+           start_time: float, # start of the window in hours (inclusive)
+           end_time: float, # end of the window in hours (inclusive)
+           ) -> 'DynamicalTrajectory':
+    "Obtain the trajectory between `start_time` and `end_time`. Time and states are views into the original arrays, no copies are made"
+    # time input checking
+    if not isinstance(start_time, (int, float)):
+        raise TypeError("start_time must be int or float")
+    if not isinstance(end_time, (int, float)):
+        raise TypeError("end_time must be int or float")
+    start_idx = np.searchsorted(self.time, start_time, side='left')
+    end_idx = np.searchsorted(self.time, end_time, side='right')
+    if end_idx <= start_idx:
+        raise ValueError(f"window must contain at least one time point, got start_time={start_time} and end_time={end_time}")
+    return DynamicalTrajectory._trusted(self.time[start_idx:end_idx], self.states[start_idx:end_idx], self.saved_states)
+
+# %% ../nbs/api/00_models.ipynb 17
+@patch_to(DynamicalTrajectory, cls_method=True)
+def concat(cls,
+           trajectories: list, # trajectories to concatenate, ordered in time
+           ) -> 'DynamicalTrajectory':
+    "Concatenate trajectories in time. Only the seams between trajectories are checked. When a trajectory starts at the final time of the previous one, the repeated time point is dropped"
+    # input checking
+    if not isinstance(trajectories, (list, tuple)) or len(trajectories) == 0:
+        raise ValueError("trajectories must be a non-empty list of DynamicalTrajectory")
+    for trajectory in trajectories:
+        if not isinstance(trajectory, DynamicalTrajectory):
+            raise TypeError("trajectories must only contain DynamicalTrajectory objects")
+    state_shape = trajectories[0].states.shape[1:]
+    times = [trajectories[0].time]
+    states = [trajectories[0].states]
+    for previous, current in zip(trajectories[:-1], trajectories[1:]):
+        if current.states.shape[1:] != state_shape:
+            raise ValueError(f"trajectories must have the same state shape, got {state_shape} and {current.states.shape[1:]}")
+        if current.saved_states != trajectories[0].saved_states:
+            raise ValueError("trajectories must store the same states")
+        start_idx = 0
+        if current.time[0] == previous.time[-1]:
+            # chunk started from the last state of the previous one
+            start_idx = 1
+        elif current.time[0] < previous.time[-1]:
+            raise ValueError("trajectories must be ordered in time without overlaps")
+        times.append(current.time[start_idx:])
+        states.append(current.states[start_idx:])
+    return cls._trusted(np.concatenate(times), np.concatenate(states), trajectories[0].saved_states)
+
+# %% ../nbs/api/00_models.ipynb 18
+@patch_to(DynamicalTrajectory)
+def _state_position(self,
+                    state_idx: int, # index of the state in the model's state vector
+                    ) -> int: # position of the state in the stored states
+    "Position of a model state in `states`. Raises an error when the state wasn't stored"
+    if self.saved_states is None:
+        return state_idx
+    if state_idx not in self.saved_states:
+        raise ValueError(f"state {state_idx} was not stored in this trajectory, integrate with save_states including it")
+    return self.saved_states.index(state_idx)
+
+_STATE_CHUNK_BYTES = 2**26 # bytes of disk-backed states read at once
+
+@patch_to(DynamicalTrajectory)
+def _state(self,
+           state_idx: int, # index of the state in the model's state vector
+           ) -> np.ndarray: # values of the state at every time point
+    "Values of a model state along the trajectory, whichever states were stored. Disk-backed states are read in time chunks so only this state is held in memory"
+    position = self._state_position(state_idx)
+    if not isinstance(self.states, np.memmap):
+        return self.states[:, position]
+    values = np.empty((len(self.time), *self.states.shape[2:]), dtype=self.states.dtype)
+    chunk_length = max(1, _STATE_CHUNK_BYTES // max(self.states[:1].nbytes, 1))
+    for start in range(0, len(self.time), chunk_length):
+        values[start:start + chunk_length] = self.states[start:start + chunk_length, position]
+    return values
+
+# %% ../nbs/api/00_models.ipynb 19
 @patch_to(DynamicalTrajectory)
 # String method
 def __str__(self) -> str:
@@ -122,7 +243,7 @@ def __str__(self) -> str:
     output += f"States:\n{states_str}"
     return output
 
-# %% ../nbs/api/00_models.ipynb 17
+# %% ../nbs/api/00_models.ipynb 22
 def _parameter_input_checking(parameters):
     "Checks if parameters is a valid input for a circadian model"
     if not isinstance(parameters, dict):
@@ -174,12 +295,16 @@ def _model_input_checking(input, num_inputs, time):
         raise ValueError("input must not contain NaNs")
 
     
-def _light_input_checking(light):
-    "Checks if light is a valid input for a circadian model"
+def _light_input_checking(light, initial_condition=None):
+    "Checks if light is a valid input for a circadian model. 2D light arrays provide one column per initial condition in a batch"
     if not isinstance(light, np.ndarray):
         raise TypeError("light must be a numpy array")
-    if light.ndim != 1:
-        raise ValueError("light must be a 1D array")
+    light_shape_err_msg = "light must be a 1D array, or a 2D array with one column per initial condition"
+    if light.ndim == 2:
+        if initial_condition is None or initial_condition.ndim != 2 or light.shape[1] != initial_condition.shape[1]:
+            raise ValueError(light_shape_err_msg)
+    elif light.ndim != 1:
+        raise ValueError(light_shape_err_msg)
     if not np.issubdtype(light.dtype, np.number):
         raise TypeError("light must be numeric")
     if np.any(np.isnan(light)):
@@ -203,7 +328,21 @@ def _wake_input_checking(wake):
         raise ValueError("wake must be between 0 and 1")
     return True
 
-# %% ../nbs/api/00_models.ipynb 19
+
+def _save_states_input_checking(save_states, num_states):
+    "Checks if save_states is a valid selection of state indices for a circadian model"
+    if not isinstance(save_states, (list, tuple, np.ndarray)):
+        raise TypeError("save_states must be a list of state indices")
+    if len(save_states) == 0:
+        raise ValueError("save_states must not be empty")
+    for state_idx in save_states:
+        if not isinstance(state_idx, (int, np.integer)):
+            raise TypeError("save_states must only contain integers")
+        if state_idx < 0 or state_idx >= num_states:
+            raise ValueError(f"save_states must only contain indices between 0 and {num_states-1}")
+    return True
+
+# %% ../nbs/api/00_models.ipynb 24
 class CircadianModel(ABC):
     "Abstract base class for circadian models that defines the common interface for all implementations"
     def __init__(self, 
@@ -287,7 +426,7 @@ class CircadianModel(ABC):
     def initial_condition(self, value):
         self._initial_condition = value
 
-# %% ../nbs/api/00_models.ipynb 20
+# %% ../nbs/api/00_models.ipynb 25
 @patch_to(CircadianModel)
 def derv(self,
          t: float, # time
@@ -297,7 +436,7 @@ def derv(self,
     "Right-hand-side of the differential equation model with state and light as inputs"
     return NotImplementedError("derv is not implemented for this model")
 
-# %% ../nbs/api/00_models.ipynb 21
+# %% ../nbs/api/00_models.ipynb 26
 @patch_to(CircadianModel)
 def step_rk4(self,
              t: float, # time
@@ -313,12 +452,16 @@ def step_rk4(self,
     state = state + (dt / 6.0) * (k1 + 2.0*k2 + 2.0*k3 + k4)
     return state
 
-# %% ../nbs/api/00_models.ipynb 22
+# %% ../nbs/api/00_models.ipynb 27
 @patch_to(CircadianModel)
 def integrate(self,
               time: np.ndarray, # time points for integration. Time difference between consecutive values determines step size of the solver
               initial_condition: np.ndarray=None, # initial state of the model
               input: np.ndarray=None, # model input (such as light or wake) for each time point 
+              states_path: str=None, # path to a `.npy` file where states are written while integrating. If None, states are kept in memory
+              save_every: int=1, # store one out of every `save_every` time points. The solver still steps through all of them
+              dtype: np.dtype=float, # floating point type of the stored states. The solver always works in float64
+              save_states: list=None, # indices of the states to store. If None, all states are stored
               ) -> DynamicalTrajectory:
     "Solve the model for specific timepoints given initial conditions and model inputs"
     # input checking
@@ -331,12 +474,31 @@ def integrate(self,
         initial_condition = self._default_initial_condition
     else:
         _initial_condition_input_checking(initial_condition, self._num_states)
+    if states_path is not None and not isinstance(states_path, str):
+        raise TypeError("states_path must be a string")
+    _positive_int_checking(save_every, "save_every")
+    if not np.issubdtype(np.dtype(dtype), np.floating):
+        raise TypeError("dtype must be a floating point type")
+    saved_states = save_states
+    if save_states is None:
+        save_states = slice(None)
+        num_saved_states = self._num_states
+    else:
+        _save_states_input_checking(save_states, self._num_states)
+        save_states = np.asarray(save_states)
+        num_saved_states = len(save_states)
     
     self.initial_condition = initial_condition
     
     n = len(time)
-    sol = np.zeros((n, *initial_condition.shape))
-    sol[0,...] = initial_condition
+    saved_time = time[::save_every]
+    saved_shape = (len(saved_time), num_saved_states, *initial_condition.shape[1:])
+    if states_path is None:
+        sol = np.zeros(saved_shape, dtype=dtype)
+    else:
+        # disk-backed storage, states are paged out to the file as the solver advances
+        sol = np.lib.format.open_memmap(states_path, mode='w+', dtype=dtype, shape=saved_shape)
+    sol[0,...] = initial_condition[save_states,...]
     state = initial_condition
 
     for idx in range(1, n):
@@ -344,22 +506,29 @@ def integrate(self,
         dt = t - time[idx-1]
         input_value = input[idx,...]
         state = self.step_rk4(t, state, input_value, dt)
-        sol[idx,...] = state
+        if idx % save_every == 0:
+            sol[idx // save_every,...] = state[save_states,...]
+    if states_path is not None:
+        sol.flush()
     
-    self._trajectory = DynamicalTrajectory(time, sol)
+    self._trajectory = DynamicalTrajectory._trusted(saved_time, sol, saved_states)
     return self._trajectory
 
-# %% ../nbs/api/00_models.ipynb 23
+# %% ../nbs/api/00_models.ipynb 28
 @patch_to(CircadianModel)
 def __call__(self,
              time: np.ndarray, # time points for integration. Time difference between each consecutive pair of values determines step size of the solver
              initial_condition: np.ndarray=None, # initial state of the model
              input: np.ndarray=None, # model input (such as light or wake) for each time point
+             states_path: str=None, # path to a `.npy` file where states are written while integrating. If None, states are kept in memory
+             save_every: int=1, # store one out of every `save_every` time points. The solver still steps through all of them
+             dtype: np.dtype=float, # floating point type of the stored states. The solver always works in float64
+             save_states: list=None, # indices of the states to store. If None, all states are stored
              ):
     "Wrapper to integrate"
-    return self.integrate(time, initial_condition, input)
+    return self.integrate(time, initial_condition, input, states_path, save_every, dtype, save_states)
 
-# %% ../nbs/api/00_models.ipynb 24
+# %% ../nbs/api/00_models.ipynb 29
 @patch_to(CircadianModel)
 def get_parameters_array(self)-> np.array:
     "Returns the parameters for the model as a numpy array"
@@ -368,7 +537,7 @@ def get_parameters_array(self)-> np.array:
         parameter_array[idx] = value
     return parameter_array
 
-# %% ../nbs/api/00_models.ipynb 25
+# %% ../nbs/api/00_models.ipynb 30
 @patch_to(CircadianModel)
 def phase(self,
           trajectory: DynamicalTrajectory=None, # trajectory to calculate the phase for. If None, the phase is calculated for the current trajectory 
@@ -377,7 +546,7 @@ def phase(self,
     "Calculates the phase of the model at a given timepoint"
     raise NotImplementedError("phase is not implemented for this model")
 
-# %% ../nbs/api/00_models.ipynb 26
+# %% ../nbs/api/00_models.ipynb 31
 @patch_to(CircadianModel)
 def amplitude(self,
               trajectory: DynamicalTrajectory=None, # trajectory to calculate the amplitude for. If None, the amplitude is calculated for the current trajectory 
@@ -386,7 +555,14 @@ def amplitude(self,
     "Calculates the amplitude of the model at a given timepoint"
     raise NotImplementedError("amplitude is not implemented for this model")
 
-# %% ../nbs/api/00_models.ipynb 27
+# %% ../nbs/api/00_models.ipynb 32
+@patch_to(CircadianModel)
+def _cbt_signal(self,
+                trajectory: DynamicalTrajectory, # trajectory, possibly batched
+                ) -> Tuple[np.ndarray, float]: # signal whose peaks are the cbt minima and the time offset of the markers
+    "Signal whose peaks mark the core body temperature minimum"
+    raise NotImplementedError("cbt is not implemented for this model")
+
 @patch_to(CircadianModel)
 def cbt(self,
         trajectory: DynamicalTrajectory=None, # trajectory to calculate the cbt for. If None, the cbt is calculated for the current trajectory
@@ -394,7 +570,7 @@ def cbt(self,
     "Finds the core body temperature minumum markers along a trajectory"
     raise NotImplementedError("cbt is not implemented for this model")
 
-# %% ../nbs/api/00_models.ipynb 28
+# %% ../nbs/api/00_models.ipynb 33
 @patch_to(CircadianModel)
 def dlmos(self,
           trajectory: DynamicalTrajectory=None, # trajectory to calculate the dlmos for. If None, the dlmos are calculated for the current trajectory
@@ -402,7 +578,7 @@ def dlmos(self,
     "Finds the Dim Light Melatonin Onset (DLMO) markers along a trajectory"
     raise NotImplementedError("dlmo is not implemented for this model")
 
-# %% ../nbs/api/00_models.ipynb 29
+# %% ../nbs/api/00_models.ipynb 34
 @patch_to(CircadianModel)
 def equilibrate(self,
                 time: np.ndarray, # time points for integration. Time difference between each consecutive pair of values determines step size of the solver
@@ -428,7 +604,7 @@ def equilibrate(self,
     final_state = sol[-1, ...]
     return final_state
 
-# %% ../nbs/api/00_models.ipynb 30
+# %% ../nbs/api/00_models.ipynb 35
 def _get_default_initial_condition(
         model: CircadianModel, # model to calculate the default initial condition for
         num_loops: int=10 # number of times to loop the regular schedule
@@ -439,12 +615,10 @@ def _get_default_initial_condition(
         raise TypeError("model must be a CircadianModel")
     model._default_initial_condition = 0.5 * np.ones(model._num_states)
     schedule = LightSchedule.Regular(lights_on=8, lights_off=24)    
-    time = np.arange(0.0, 24.0, 0.1)
+    time, light_input = schedule.sample(0.0, 24.0, 0.1)
     if model._num_inputs == 1:
-        light_input = schedule(time)
         default_initial_condition = model.equilibrate(time, light_input, num_loops)
     elif model._num_inputs == 2:
-        light_input = schedule(time)
         wake_input = np.zeros_like(light_input)
         wake_input[light_input > 0] = 0
         wake_input[light_input == 0] = 1
@@ -462,7 +636,7 @@ def _check_cbtmin_spacing(
         # raise a warning
         warnings.warn(f"The data contains cbtmin markers that are spaced by less than {min_spacing} hours. Removal of duplicate cbtmin markers is recommended.")
 
-# %% ../nbs/api/00_models.ipynb 32
+# %% ../nbs/api/00_models.ipynb 37
 class Forger99(CircadianModel): 
     "Implementation of Forger's 1999 model from the article 'A simpler model of the human circadian pacemaker'"
     def __init__(self, params=None):
@@ -482,12 +656,16 @@ class Forger99(CircadianModel):
                   time: np.ndarray, # time points for integration. Time difference between each consecutive pair of values determines step size of the solver
                   initial_condition: np.ndarray=None, # initial state of the model
                   input: np.ndarray=None, # model input (such as light or wake) for each time point
+                  states_path: str=None, # path to a `.npy` file where states are written while integrating. If None, states are kept in memory
+                  save_every: int=1, # store one out of every `save_every` time points. The solver still steps through all of them
+                  dtype: np.dtype=float, # floating point type of the stored states. The solver always works in float64
+                  save_states: list=None, # indices of the states to store. If None, all states are stored
                   ) -> DynamicalTrajectory:
         "Solve the model for specific timepoints given initial conditions and model inputs"
         # input checking for Forger99
         if input is not None:
-            _light_input_checking(input)
-        return super().integrate(time, initial_condition, input)
+            _light_input_checking(input, initial_condition)
+        return super().integrate(time, initial_condition, input, states_path, save_every, dtype, save_states)
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -495,7 +673,7 @@ class Forger99(CircadianModel):
     def __str__(self) -> str:
         return "Forger99"
 
-# %% ../nbs/api/00_models.ipynb 33
+# %% ../nbs/api/00_models.ipynb 38
 @patch_to(Forger99)
 def derv(self, 
          t: float, # time
@@ -520,7 +698,7 @@ def derv(self,
 
      return dydt
 
-# %% ../nbs/api/00_models.ipynb 34
+# %% ../nbs/api/00_models.ipynb 39
 @patch_to(Forger99)
 def phase(self,
           trajectory: DynamicalTrajectory=None, # trajectory to calculate the phase. If None, the current trajectory is used
@@ -532,18 +710,18 @@ def phase(self,
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
     if time is None:
-        x = trajectory.states[:, 0]
-        y = -1.0 * trajectory.states[:, 1]
+        x = trajectory._state(0)
+        y = -1.0 * trajectory._state(1)
     else:
         if not isinstance(time, (float, int)):
             raise ValueError("time must be a float or an int")
         else:
             state = trajectory(time)
-            x = state[0] 
-            y = -1.0 * state[1]
+            x = state[trajectory._state_position(0)] 
+            y = -1.0 * state[trajectory._state_position(1)]
     return np.angle(x + complex(0,1) * y)
 
-# %% ../nbs/api/00_models.ipynb 35
+# %% ../nbs/api/00_models.ipynb 40
 @patch_to(Forger99)
 def amplitude(self,
               trajectory: DynamicalTrajectory=None, # trajectory to calculate the amplitude. If None, the current trajectory is used
@@ -555,18 +733,25 @@ def amplitude(self,
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
     if time is None:
-        x = trajectory.states[:, 0]
-        y = -1.0 * trajectory.states[:, 1]
+        x = trajectory._state(0)
+        y = -1.0 * trajectory._state(1)
     else:
         if not isinstance(time, (float, int)):
             raise ValueError("time must be a float or an int")
         else:
             state = trajectory(time)
-            x = state[0] 
-            y = -1.0 * state[1]
+            x = state[trajectory._state_position(0)] 
+            y = -1.0 * state[trajectory._state_position(1)]
     return np.sqrt(x**2 + y**2)
 
-# %% ../nbs/api/00_models.ipynb 36
+# %% ../nbs/api/00_models.ipynb 41
+@patch_to(Forger99)
+def _cbt_signal(self,
+                trajectory: DynamicalTrajectory, # trajectory, possibly batched
+                ) -> Tuple[np.ndarray, float]: # signal whose peaks are the cbt minima and the time offset of the markers
+    "Signal whose peaks mark the core body temperature minimum as the minimum of x"
+    return -1*trajectory._state(0), 0.0
+
 @patch_to(Forger99)
 def cbt(self,
         trajectory: DynamicalTrajectory=None, # trajectory to calculate the cbt. If None, the current trajectory is used
@@ -577,13 +762,13 @@ def cbt(self,
     else:
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
-    inverted_x = -1*trajectory.states[:,0]
+    inverted_x, offset = self._cbt_signal(trajectory)
     cbt_min_idxs, _ = find_peaks(inverted_x)
-    cbtmin_times = trajectory.time[cbt_min_idxs]
+    cbtmin_times = trajectory.time[cbt_min_idxs] + offset
     _check_cbtmin_spacing(cbtmin_times)
     return cbtmin_times
 
-# %% ../nbs/api/00_models.ipynb 37
+# %% ../nbs/api/00_models.ipynb 42
 @patch_to(Forger99)
 def dlmos(self,
           trajectory: DynamicalTrajectory=None, # trajectory to calculate the dlmo. If None, the current trajectory is used 
@@ -596,7 +781,7 @@ def dlmos(self,
             raise ValueError("trajectory must be a DynamicalTrajectory")
     return self.cbt(trajectory) - self.cbt_to_dlmo
 
-# %% ../nbs/api/00_models.ipynb 40
+# %% ../nbs/api/00_models.ipynb 45
 class Hannay19(CircadianModel):
     "Implementation of Hannay's 2019 single population model from the article 'Macroscopic models for human circadian rhythms'"
     def __init__(self, params=None):
@@ -617,12 +802,16 @@ class Hannay19(CircadianModel):
                 time: np.ndarray, # time points for integration. Time difference between each consecutive pair of values determines step size of the solver
                 initial_condition: np.ndarray=None, # initial state of the model
                 input: np.ndarray=None, # model input (such as light or wake) for each time point
+                states_path: str=None, # path to a `.npy` file where states are written while integrating. If None, states are kept in memory
+                save_every: int=1, # store one out of every `save_every` time points. The solver still steps through all of them
+                dtype: np.dtype=float, # floating point type of the stored states. The solver always works in float64
+                save_states: list=None, # indices of the states to store. If None, all states are stored
                 ) -> DynamicalTrajectory:
         "Solve the model for specific timepoints given initial conditions and model inputs"
         # input checking for Hannay19
         if input is not None:
-            _light_input_checking(input)
-        return super().integrate(time, initial_condition, input)
+            _light_input_checking(input, initial_condition)
+        return super().integrate(time, initial_condition, input, states_path, save_every, dtype, save_states)
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -630,7 +819,7 @@ class Hannay19(CircadianModel):
     def __str__(self) -> str:
         return "Hannay19"
 
-# %% ../nbs/api/00_models.ipynb 41
+# %% ../nbs/api/00_models.ipynb 46
 @patch_to(Hannay19)
 def derv(self,
          t: float, # time
@@ -660,7 +849,7 @@ def derv(self,
 
     return dydt
 
-# %% ../nbs/api/00_models.ipynb 42
+# %% ../nbs/api/00_models.ipynb 47
 @patch_to(Hannay19)
 def phase(self,
           trajectory: DynamicalTrajectory=None, # trajectory to calculate the phase. If None, the current trajectory is used
@@ -672,18 +861,18 @@ def phase(self,
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
     if time is None:
-        x = np.cos(trajectory.states[:, 1])
-        y = np.sin(trajectory.states[:, 1])
+        x = np.cos(trajectory._state(1))
+        y = np.sin(trajectory._state(1))
     else:
         if not isinstance(time, (float, int)):
             raise ValueError("time must be a float or an int")
         else:
             state = trajectory(time)
-            x = np.cos(state[1])
-            y = np.sin(state[1])
+            x = np.cos(state[trajectory._state_position(1)])
+            y = np.sin(state[trajectory._state_position(1)])
     return np.angle(x + complex(0,1) * y)
 
-# %% ../nbs/api/00_models.ipynb 43
+# %% ../nbs/api/00_models.ipynb 48
 @patch_to(Hannay19)
 def amplitude(self,
               trajectory: DynamicalTrajectory=None, # trajectory to calculate the amplitude. If None, the current trajectory is used
@@ -695,16 +884,23 @@ def amplitude(self,
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
     if time is None:
-        amplitude = trajectory.states[:, 0]
+        amplitude = trajectory._state(0)
     else:
         if not isinstance(time, (float, int)):
             raise ValueError("time must be a float or an int")
         else:
             state = trajectory(time)
-            amplitude = state[0] 
+            amplitude = state[trajectory._state_position(0)] 
     return amplitude
 
-# %% ../nbs/api/00_models.ipynb 44
+# %% ../nbs/api/00_models.ipynb 49
+@patch_to(Hannay19)
+def _cbt_signal(self,
+                trajectory: DynamicalTrajectory, # trajectory, possibly batched
+                ) -> Tuple[np.ndarray, float]: # signal whose peaks are the cbt minima and the time offset of the markers
+    "Signal whose peaks mark the core body temperature minimum as the times where the phase is pi"
+    return -np.cos(trajectory._state(1)), 0.0
+
 @patch_to(Hannay19)
 def cbt(self,
         trajectory: DynamicalTrajectory=None # trajectory to calculate the cbt. If None, the current trajectory is used
@@ -715,13 +911,13 @@ def cbt(self,
     else:
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
-    inverted_x = -np.cos(trajectory.states[:,1])
+    inverted_x, offset = self._cbt_signal(trajectory)
     cbt_min_idxs, _ = find_peaks(inverted_x)
-    cbtmin_times = trajectory.time[cbt_min_idxs]
+    cbtmin_times = trajectory.time[cbt_min_idxs] + offset
     _check_cbtmin_spacing(cbtmin_times)
     return cbtmin_times
 
-# %% ../nbs/api/00_models.ipynb 45
+# %% ../nbs/api/00_models.ipynb 50
 @patch_to(Hannay19)
 def dlmos(self,
           trajectory: DynamicalTrajectory=None # trajectory to calculate the dlmo. If None, the current trajectory is used
@@ -734,7 +930,7 @@ def dlmos(self,
             raise ValueError("trajectory must be a DynamicalTrajectory")
     return self.cbt(trajectory) - self.cbt_to_dlmo
 
-# %% ../nbs/api/00_models.ipynb 48
+# %% ../nbs/api/00_models.ipynb 53
 class Hannay19TP(CircadianModel):
     "Implementation of Hannay's 2019 two population model from the article 'Macroscopic models for human circadian rhythms'"
     def __init__(self, params=None):
@@ -757,12 +953,16 @@ class Hannay19TP(CircadianModel):
                 time: np.ndarray, # time points for integration. Time difference between each consecutive pair of values determines step size of the solver
                 initial_condition: np.ndarray=None, # initial state of the model
                 input: np.ndarray=None, # model input (such as light or wake) for each time point
+                states_path: str=None, # path to a `.npy` file where states are written while integrating. If None, states are kept in memory
+                save_every: int=1, # store one out of every `save_every` time points. The solver still steps through all of them
+                dtype: np.dtype=float, # floating point type of the stored states. The solver always works in float64
+                save_states: list=None, # indices of the states to store. If None, all states are stored
                 ) -> DynamicalTrajectory:
         "Solve the model for specific timepoints given initial conditions and model inputs"
         # input checking for Hannay19TP
         if input is not None:
-            _light_input_checking(input)
-        return super().integrate(time, initial_condition, input)
+            _light_input_checking(input, initial_condition)
+        return super().integrate(time, initial_condition, input, states_path, save_every, dtype, save_states)
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -770,7 +970,7 @@ class Hannay19TP(CircadianModel):
     def __str__(self) -> str:
         return "Hannay19TP"
 
-# %% ../nbs/api/00_models.ipynb 49
+# %% ../nbs/api/00_models.ipynb 54
 @patch_to(Hannay19TP)
 def derv(self,
          t: float, # time
@@ -804,7 +1004,7 @@ def derv(self,
 
      return dydt
 
-# %% ../nbs/api/00_models.ipynb 50
+# %% ../nbs/api/00_models.ipynb 55
 @patch_to(Hannay19TP)
 def phase(self,
           trajectory: DynamicalTrajectory=None, # trajectory to calculate the phase. If None, the current trajectory is used
@@ -817,18 +1017,18 @@ def phase(self,
             raise ValueError("trajectory must be a DynamicalTrajectory")
     if time is None:
         time = trajectory.time
-        x = np.cos(trajectory.states[:, 2])
-        y = np.sin(trajectory.states[:, 2])
+        x = np.cos(trajectory._state(2))
+        y = np.sin(trajectory._state(2))
     else:
         if not isinstance(time, (float, int)):
             raise ValueError("time must be a float or an int")
         else:
             state = trajectory(time)
-            x = np.cos(state[2])
-            y = np.sin(state[2])
+            x = np.cos(state[trajectory._state_position(2)])
+            y = np.sin(state[trajectory._state_position(2)])
     return np.angle(x + complex(0,1) * y)
 
-# %% ../nbs/api/00_models.ipynb 51
+# %% ../nbs/api/00_models.ipynb 56
 @patch_to(Hannay19TP)
 def amplitude(self,
               trajectory: DynamicalTrajectory=None, # trajectory to calculate the amplitude. If None, the current trajectory is used
@@ -841,16 +1041,23 @@ def amplitude(self,
             raise ValueError("trajectory must be a DynamicalTrajectory")
     if time is None:
         time = trajectory.time
-        amplitude = trajectory.states[:, 0]
+        amplitude = trajectory._state(0)
     else:
         if not isinstance(time, (float, int)):
             raise ValueError("time must be a float or an int")
         else:
             state = trajectory(time)
-            amplitude = state[0] 
+            amplitude = state[trajectory._state_position(0)] 
     return amplitude
 
-# %% ../nbs/api/00_models.ipynb 52
+# %% ../nbs/api/00_models.ipynb 57
+@patch_to(Hannay19TP)
+def _cbt_signal(self,
+                trajectory: DynamicalTrajectory, # trajectory, possibly batched
+                ) -> Tuple[np.ndarray, float]: # signal whose peaks are the cbt minima and the time offset of the markers
+    "Signal whose peaks mark the core body temperature minimum as the times where the phase is pi"
+    return -np.cos(trajectory._state(2)), 0.0
+
 @patch_to(Hannay19TP)
 def cbt(self,
         trajectory: DynamicalTrajectory=None, # trajectory to calculate the cbt. If None, the current trajectory is used
@@ -861,13 +1068,13 @@ def cbt(self,
     else:
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
-    inverted_x = -np.cos(trajectory.states[:,2])
+    inverted_x, offset = self._cbt_signal(trajectory)
     cbt_min_idxs, _ = find_peaks(inverted_x)
-    cbtmin_times = trajectory.time[cbt_min_idxs]
+    cbtmin_times = trajectory.time[cbt_min_idxs] + offset
     _check_cbtmin_spacing(cbtmin_times)
     return cbtmin_times
 
-# %% ../nbs/api/00_models.ipynb 53
+# %% ../nbs/api/00_models.ipynb 58
 @patch_to(Hannay19TP)
 def dlmos(self,
           trajectory: DynamicalTrajectory=None # trajectory to calculate the dlmo. If None, the current trajectory is used
@@ -880,7 +1087,7 @@ def dlmos(self,
             raise ValueError("trajectory must be a DynamicalTrajectory")
     return self.cbt(trajectory) - self.cbt_to_dlmo
 
-# %% ../nbs/api/00_models.ipynb 56
+# %% ../nbs/api/00_models.ipynb 61
 class Jewett99(CircadianModel):
     "Implementation of Jewett's 1999 model from the article 'Revised Limit Cycle Oscillator Model of Human Circadian Pacemaker'"
     def __init__(self, params=None):
@@ -900,12 +1107,16 @@ class Jewett99(CircadianModel):
                   time: np.ndarray, # time points for integration. Time difference between each consecutive pair of values determines step size of the solver
                   initial_condition: np.ndarray=None, # initial state of the model
                   input: np.ndarray=None, # model input (such as light or wake) for each time point
+                  states_path: str=None, # path to a `.npy` file where states are written while integrating. If None, states are kept in memory
+                  save_every: int=1, # store one out of every `save_every` time points. The solver still steps through all of them
+                  dtype: np.dtype=float, # floating point type of the stored states. The solver always works in float64
+                  save_states: list=None, # indices of the states to store. If None, all states are stored
                   ) -> DynamicalTrajectory:
         "Solve the model for specific timepoints given initial conditions and model inputs"
         # input checking for Jewett99
         if input is not None:
-            _light_input_checking(input)
-        return super().integrate(time, initial_condition, input)
+            _light_input_checking(input, initial_condition)
+        return super().integrate(time, initial_condition, input, states_path, save_every, dtype, save_states)
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -913,7 +1124,7 @@ class Jewett99(CircadianModel):
     def __str__(self) -> str:
         return "Jewett99"
 
-# %% ../nbs/api/00_models.ipynb 57
+# %% ../nbs/api/00_models.ipynb 62
 @patch_to(Jewett99)
 def derv(self,
          t: float, # time
@@ -938,7 +1149,7 @@ def derv(self,
     
     return dydt
 
-# %% ../nbs/api/00_models.ipynb 58
+# %% ../nbs/api/00_models.ipynb 63
 @patch_to(Jewett99)
 def phase(self,
           trajectory: DynamicalTrajectory=None, # trajectory to calculate the phase. If None, the current trajectory is used
@@ -950,18 +1161,18 @@ def phase(self,
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
     if time is None:
-        x = trajectory.states[:, 0]
-        y = -1.0 * trajectory.states[:, 1]
+        x = trajectory._state(0)
+        y = -1.0 * trajectory._state(1)
     else:
         if not isinstance(time, (float, int)):
             raise ValueError("time must be a float or an int")
         else:
             state = trajectory(time)
-            x = state[0] 
-            y = -1.0 * state[1]
+            x = state[trajectory._state_position(0)] 
+            y = -1.0 * state[trajectory._state_position(1)]
     return np.angle(x + complex(0,1) * y)
 
-# %% ../nbs/api/00_models.ipynb 59
+# %% ../nbs/api/00_models.ipynb 64
 @patch_to(Jewett99)
 def amplitude(self,
               trajectory: DynamicalTrajectory=None, # trajectory to calculate the amplitude. If None, the current trajectory is used
@@ -973,18 +1184,25 @@ def amplitude(self,
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
     if time is None:
-        x = trajectory.states[:, 0]
-        y = -1.0 * trajectory.states[:, 1]
+        x = trajectory._state(0)
+        y = -1.0 * trajectory._state(1)
     else:
         if not isinstance(time, (float, int)):
             raise ValueError("time must be a float or an int")
         else:
             state = trajectory(time)
-            x = state[0] 
-            y = -1.0 * state[1]
+            x = state[trajectory._state_position(0)] 
+            y = -1.0 * state[trajectory._state_position(1)]
     return np.sqrt(x**2 + y**2)
 
-# %% ../nbs/api/00_models.ipynb 60
+# %% ../nbs/api/00_models.ipynb 65
+@patch_to(Jewett99)
+def _cbt_signal(self,
+                trajectory: DynamicalTrajectory, # trajectory, possibly batched
+                ) -> Tuple[np.ndarray, float]: # signal whose peaks are the cbt minima and the time offset of the markers
+    "Signal whose peaks mark the core body temperature minimum as the minimum of x"
+    return -1*trajectory._state(0), self.phi_ref
+
 @patch_to(Jewett99)
 def cbt(self,
         trajectory: DynamicalTrajectory=None, # trajectory to calculate the cbt. If None, the current trajectory is used
@@ -995,13 +1213,13 @@ def cbt(self,
     else:
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
-    inverted_x = -1*trajectory.states[:,0]
+    inverted_x, offset = self._cbt_signal(trajectory)
     cbt_min_idxs, _ = find_peaks(inverted_x)
-    cbtmin_times = trajectory.time[cbt_min_idxs] + self.phi_ref
+    cbtmin_times = trajectory.time[cbt_min_idxs] + offset
     _check_cbtmin_spacing(cbtmin_times)
     return cbtmin_times
 
-# %% ../nbs/api/00_models.ipynb 61
+# %% ../nbs/api/00_models.ipynb 66
 @patch_to(Jewett99)
 def dlmos(self,
           trajectory: DynamicalTrajectory=None # trajectory to calculate the dlmo. If None, the current trajectory is used
@@ -1014,7 +1232,7 @@ def dlmos(self,
             raise ValueError("trajectory must be a DynamicalTrajectory")
     return self.cbt(trajectory) - self.cbt_to_dlmo
 
-# %% ../nbs/api/00_models.ipynb 64
+# %% ../nbs/api/00_models.ipynb 69
 class Hilaire07(CircadianModel):
     "Implementation of Hilaire's 2007 model from the article 'Addition of a non-photic component to a light-based mathematical model of the human circadian pacemaker'"
     def __init__(self, params=None):
@@ -1034,13 +1252,17 @@ class Hilaire07(CircadianModel):
                   time: np.ndarray, # time points for integration. Time difference between each consecutive pair of values determines step size of the solver
                   initial_condition: np.ndarray=None, # initial state of the model
                   input: np.ndarray=None, # model input (such as light or wake) for each time point
+                  states_path: str=None, # path to a `.npy` file where states are written while integrating. If None, states are kept in memory
+                  save_every: int=1, # store one out of every `save_every` time points. The solver still steps through all of them
+                  dtype: np.dtype=float, # floating point type of the stored states. The solver always works in float64
+                  save_states: list=None, # indices of the states to store. If None, all states are stored
                   ) -> DynamicalTrajectory:
         "Solve the model for specific timepoints given initial conditions and model inputs"
         # input checking for Jewett99
         if input is not None:
             _light_input_checking(input[0,...])
             _wake_input_checking(input[1,...])
-        return super().integrate(time, initial_condition, input)
+        return super().integrate(time, initial_condition, input, states_path, save_every, dtype, save_states)
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -1048,7 +1270,7 @@ class Hilaire07(CircadianModel):
     def __str__(self) -> str:
         return "Hilaire07"
 
-# %% ../nbs/api/00_models.ipynb 65
+# %% ../nbs/api/00_models.ipynb 70
 @patch_to(Hilaire07)
 def derv(self,
          t: float, # time
@@ -1088,7 +1310,7 @@ def derv(self,
      
      return dydt
 
-# %% ../nbs/api/00_models.ipynb 66
+# %% ../nbs/api/00_models.ipynb 71
 @patch_to(Hilaire07)
 def phase(self,
           trajectory: DynamicalTrajectory=None, # trajectory to calculate the phase. If None, the current trajectory is used
@@ -1100,18 +1322,18 @@ def phase(self,
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
     if time is None:
-        x = trajectory.states[:, 0]
-        y = -1.0 * trajectory.states[:, 1]
+        x = trajectory._state(0)
+        y = -1.0 * trajectory._state(1)
     else:
         if not isinstance(time, (float, int)):
             raise ValueError("time must be a float or an int")
         else:
             state = trajectory(time)
-            x = state[0] 
-            y = -1.0 * state[1]
+            x = state[trajectory._state_position(0)] 
+            y = -1.0 * state[trajectory._state_position(1)]
     return np.angle(x + complex(0,1) * y)
 
-# %% ../nbs/api/00_models.ipynb 67
+# %% ../nbs/api/00_models.ipynb 72
 @patch_to(Hilaire07)
 def amplitude(self,
               trajectory: DynamicalTrajectory=None, # trajectory to calculate the amplitude. If None, the current trajectory is used
@@ -1123,18 +1345,25 @@ def amplitude(self,
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
     if time is None:
-        x = trajectory.states[:, 0]
-        y = -1.0 * trajectory.states[:, 1]
+        x = trajectory._state(0)
+        y = -1.0 * trajectory._state(1)
     else:
         if not isinstance(time, (float, int)):
             raise ValueError("time must be a float or an int")
         else:
             state = trajectory(time)
-            x = state[0] 
-            y = -1.0 * state[1]
+            x = state[trajectory._state_position(0)] 
+            y = -1.0 * state[trajectory._state_position(1)]
     return np.sqrt(x**2 + y**2)
 
-# %% ../nbs/api/00_models.ipynb 68
+# %% ../nbs/api/00_models.ipynb 73
+@patch_to(Hilaire07)
+def _cbt_signal(self,
+                trajectory: DynamicalTrajectory, # trajectory, possibly batched
+                ) -> Tuple[np.ndarray, float]: # signal whose peaks are the cbt minima and the time offset of the markers
+    "Signal whose peaks mark the core body temperature minimum as the minimum of x"
+    return -1*trajectory._state(0), self.phi_ref
+
 @patch_to(Hilaire07)
 def cbt(self,
         trajectory: DynamicalTrajectory=None, # trajectory to calculate the cbt. If None, the current trajectory is used
@@ -1145,13 +1374,13 @@ def cbt(self,
     else:
         if not isinstance(trajectory, DynamicalTrajectory):
             raise ValueError("trajectory must be a DynamicalTrajectory")
-    inverted_x = -1*trajectory.states[:,0]
+    inverted_x, offset = self._cbt_signal(trajectory)
     cbt_min_idxs, _ = find_peaks(inverted_x)
-    cbtmin_times = trajectory.time[cbt_min_idxs] + self.phi_ref
+    cbtmin_times = trajectory.time[cbt_min_idxs] + offset
     _check_cbtmin_spacing(cbtmin_times)
     return cbtmin_times
 
-# %% ../nbs/api/00_models.ipynb 69
+# %% ../nbs/api/00_models.ipynb 74
 @patch_to(Hilaire07)
 def dlmos(self,
           trajectory: DynamicalTrajectory=None # trajectory to calculate the dlmo. If None, the current trajectory is used
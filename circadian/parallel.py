@@ -0,0 +1,302 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/api/10_parallel.ipynb.
+
+# %% auto 0
+__all__ = ['SimulationExecutor', 'compare_models']
+
+# %% ../nbs/api/10_parallel.ipynb 4
+import weakref
+import warnings
+import numpy as np
+import pandas as pd
+import multiprocessing as mp
+from typing import Callable
+from concurrent.futures import CancelledError
+from fastcore.basics import patch_to
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from .models import CircadianModel, DynamicalTrajectory, _time_input_checking, _positive_int_checking
+from .kernels import simulate_batch, _simulate_unchecked
+
+# %% ../nbs/api/10_parallel.ipynb 6
+def _create_shared_array(shape: tuple, # shape of the array
+                         dtype: np.dtype=float, # data type of the array
+                         ):
+    "Create a numpy array backed by a new shared memory block. Returns the block and the array"
+    size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+    shared_memory = SharedMemory(create=True, size=size)
+    array = np.ndarray(shape, dtype=dtype, buffer=shared_memory.buf)
+    return shared_memory, array
+
+
+def _attach_shared_array(spec: tuple, # name, shape, and dtype of the shared array
+                         ):
+    "Attach to an existing shared memory block. Returns the block and a numpy array viewing it"
+    name, shape, dtype = spec
+    shared_memory = SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=dtype, buffer=shared_memory.buf)
+    return shared_memory, array
+
+# %% ../nbs/api/10_parallel.ipynb 8
+_worker_model = None
+_worker_cancel_event = None
+
+def _init_worker(model: CircadianModel, # model kept warm in the worker process
+                 cancel_event, # event signaling that pending work should be skipped
+                 ):
+    "Initialize a worker process with its own copy of the model"
+    global _worker_model, _worker_cancel_event
+    _worker_model = model
+    _worker_cancel_event = cancel_event
+
+
+def _simulate_chunk(task: dict # description of the chunk of the batch to simulate
+                    ):
+    "Integrate a chunk of the batch and write the states into the shared output buffer"
+    if _worker_cancel_event.is_set():
+        return None
+    batch_start, batch_end = task['batch_start'], task['batch_end']
+    time_memory, time = _attach_shared_array(task['time'])
+    input_memory, input = _attach_shared_array(task['input'])
+    output_memory, output = _attach_shared_array(task['output'])
+    try:
+        if task['per_member_input']:
+            input = input[..., batch_start:batch_end]
+        # the compiled solver is used when available, the worker's model is never modified
+        trajectory = simulate_batch(_worker_model, time, task['initial_condition'], input,
+                                    save_every=task['save_every'],
+                                    dtype=output.dtype,
+                                    save_states=task['save_states'])
+        output[..., batch_start:batch_end] = trajectory.states
+        # drop the views before closing the shared memory blocks
+        del time, input, output, trajectory
+    finally:
+        time_memory.close()
+        input_memory.close()
+        output_memory.close()
+    return batch_start, batch_end
+
+# %% ../nbs/api/10_parallel.ipynb 10
+class SimulationExecutor:
+    "Run batched simulations of a model on a pool of worker processes that exchange inputs and states through shared memory"
+    def __init__(self,
+                 model: CircadianModel, # model to simulate. Each worker keeps its own copy
+                 n_workers: int=None, # number of worker processes. If None, the number of CPUs is used
+                 chunk_size: int=None, # number of batch members simulated per task. If None, the batch is split in four tasks per worker
+                 ) -> None:
+        if not isinstance(model, CircadianModel):
+            raise TypeError("model must be a CircadianModel")
+        if n_workers is None:
+            n_workers = mp.cpu_count()
+        _positive_int_checking(n_workers, "n_workers")
+        if chunk_size is not None:
+            _positive_int_checking(chunk_size, "chunk_size")
+        self.model = model
+        self.n_workers = n_workers
+        self.chunk_size = chunk_size
+        context = mp.get_context()
+        # start the resource tracker before the workers so that they share it with this process.
+        # Otherwise every worker tracks the shared blocks it attaches to and reports them as leaked
+        resource_tracker.ensure_running()
+        self._cancel_event = context.Event()
+        self._pool = context.Pool(n_workers, initializer=_init_worker, initargs=(model, self._cancel_event))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def cancel(self):
+        "Cancel the simulation that is currently running. Tasks that haven't started are skipped"
+        self._cancel_event.set()
+
+    def shutdown(self):
+        "Stop the worker processes"
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+# %% ../nbs/api/10_parallel.ipynb 11
+def _batch_chunks(batch_size: int, # total number of batch members
+                  chunk_size: int, # number of batch members per chunk
+                  ):
+    "Split a batch into contiguous chunks"
+    return [(start, min(start + chunk_size, batch_size)) for start in range(0, batch_size, chunk_size)]
+
+# %% ../nbs/api/10_parallel.ipynb 12
+@patch_to(SimulationExecutor)
+def run(self,
+        time: np.ndarray, # time points for integration. Time difference between consecutive values determines step size of the solver
+        initial_condition: np.ndarray, # initial states of the batch with shape (num_states, batch_size)
+        input: np.ndarray, # model input shared by the whole batch, or with an extra last dimension of length batch_size to provide one input per batch member
+        progress: Callable[[int, int], None]=None, # called with the number of finished and total batch members every time a task finishes
+        save_every: int=1, # store one out of every `save_every` time points
+        dtype: np.dtype=float, # floating point type of the stored states
+        save_states: list=None, # indices of the states to store. If None, all states are stored
+        ) -> DynamicalTrajectory: # batched trajectory viewing the shared output buffer
+    "Simulate the batch in parallel. The returned states live in shared memory that is freed once they are no longer referenced"
+    # input checking
+    if self._pool is None:
+        raise RuntimeError("the executor has been shut down")
+    _time_input_checking(time)
+    if not isinstance(initial_condition, np.ndarray) or initial_condition.ndim != 2:
+        raise ValueError("initial_condition must be a 2D numpy array with shape (num_states, batch_size)")
+    if not isinstance(input, np.ndarray):
+        raise TypeError("input must be a numpy array")
+    _positive_int_checking(save_every, "save_every")
+    if progress is not None and not callable(progress):
+        raise TypeError("progress must be callable")
+    batch_size = initial_condition.shape[1]
+    shared_input_ndim = 1 if self.model._num_inputs == 1 else 2
+    per_member_input = input.ndim == shared_input_ndim + 1
+    if per_member_input and input.shape[-1] != batch_size:
+        raise ValueError(f"input's last dimension must have length {batch_size} to match the initial conditions")
+    num_saved_states = self.model._num_states if save_states is None else len(save_states)
+    saved_time = time[::save_every]
+    output_shape = (len(saved_time), num_saved_states, batch_size)
+    chunk_size = self.chunk_size
+    if chunk_size is None:
+        chunk_size = max(1, int(np.ceil(batch_size / (4 * self.n_workers))))
+    # place inputs and outputs in shared memory
+    self._cancel_event.clear()
+    time_memory, shared_time = _create_shared_array(time.shape, float)
+    input_memory, shared_input = _create_shared_array(input.shape, float)
+    output_memory, states = _create_shared_array(output_shape, dtype)
+    shared_time[:] = time
+    shared_input[:] = input
+    del shared_time, shared_input
+    tasks = []
+    for batch_start, batch_end in _batch_chunks(batch_size, chunk_size):
+        tasks.append({
+            'time': (time_memory.name, time.shape, float),
+            'input': (input_memory.name, input.shape, float),
+            'output': (output_memory.name, output_shape, np.dtype(dtype)),
+            'initial_condition': initial_condition[:, batch_start:batch_end],
+            'per_member_input': per_member_input,
+            'batch_start': batch_start,
+            'batch_end': batch_end,
+            'save_every': save_every,
+            'save_states': save_states,
+        })
+    finished = 0
+    try:
+        for result in self._pool.imap_unordered(_simulate_chunk, tasks):
+            if result is None:
+                continue
+            batch_start, batch_end = result
+            finished += batch_end - batch_start
+            if progress is not None:
+                progress(finished, batch_size)
+    except BaseException:
+        # skip the remaining tasks
+        self._cancel_event.set()
+        del states
+        output_memory.close()
+        output_memory.unlink()
+        raise
+    finally:
+        for shared_memory in (time_memory, input_memory):
+            shared_memory.close()
+            shared_memory.unlink()
+    output_memory.unlink()
+    if self._cancel_event.is_set():
+        del states
+        output_memory.close()
+        raise CancelledError("the simulation was cancelled")
+    # the block is already unlinked, its memory is released once the states are garbage collected
+    weakref.finalize(states, output_memory.close)
+    return DynamicalTrajectory._trusted(saved_time.copy(), states, save_states)
+
+# %% ../nbs/api/10_parallel.ipynb 14
+def _model_markers(task: tuple, # model, time, light with one column per subject, and wake or None
+                   ) -> list: # DLMO times of every subject
+    "Simulate a cohort with a single model and find the DLMOs of every subject"
+    model, time, light, wake = task
+    # compare_models has already checked the inputs for every model
+    subjects = light.shape[1]
+    if model._num_inputs == 2:
+        # the wake input switches the model's sleep drive, which is evaluated one subject at a time
+        trajectories = [_simulate_unchecked(model, time, model._default_initial_condition, np.stack((light[:, subject], wake[:, subject]), axis=1))
+                        for subject in range(subjects)]
+    else:
+        batch_condition = np.repeat(model._default_initial_condition[:, None], subjects, axis=1)
+        trajectory = _simulate_unchecked(model, time, batch_condition, light)
+        trajectories = [trajectory.get_batch(subject) for subject in range(subjects)]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return [model.dlmos(trajectory) for trajectory in trajectories]
+
+
+def _align_markers(markers: dict, # marker times of each model
+                   reference: str, # name of the model the others are aligned to
+                   start: float, # first time of the simulation
+                   ) -> pd.DataFrame:
+    "Pair the markers of every model with the closest marker of the reference model"
+    reference_markers = np.asarray(markers[reference])
+    table = pd.DataFrame({'day': ((reference_markers - start) // 24.0).astype(int), reference: reference_markers})
+    for name, times in markers.items():
+        if name == reference:
+            continue
+        times = np.asarray(times)
+        aligned = np.full(len(reference_markers), np.nan)
+        if len(times) > 0:
+            # nearest marker on either side of each reference marker
+            right = np.clip(np.searchsorted(times, reference_markers), 0, len(times) - 1)
+            left = np.clip(right - 1, 0, len(times) - 1)
+            closest = np.where(np.abs(times[left] - reference_markers) < np.abs(times[right] - reference_markers), left, right)
+            aligned = np.where(np.abs(times[closest] - reference_markers) <= 12.0, times[closest], np.nan)
+        table[name] = aligned
+    for name in markers:
+        if name != reference:
+            table[f"{name} - {reference}"] = table[name] - table[reference]
+    return table
+
+# %% ../nbs/api/10_parallel.ipynb 15
+def compare_models(models, # models to compare, as a list or a dictionary of named models
+                   time: np.ndarray, # time points for integration, shared by every model
+                   input: np.ndarray, # light input for each time point, or a 2D array with one column per subject of a cohort
+                   wake: np.ndarray=None, # wake input (1 awake, 0 asleep) for models that need it, with the shape of `input`. If None, subjects are awake whenever there is light
+                   n_workers: int=None, # number of worker processes. If None, one per model up to the number of CPUs. With a single worker the models run in this process
+                   ): # table of the DLMOs of every model and their differences to the first model, or a list with one table per subject for cohort inputs
+    "Simulate several models on the same light input and align their DLMO predictions"
+    # input checking, done once for every model
+    if not isinstance(models, dict):
+        models = list(models)
+        names = [str(model) for model in models]
+        names = [name if names.count(name) == 1 else f"{name} ({idx})" for idx, name in enumerate(names)]
+        models = dict(zip(names, models))
+    if len(models) == 0 or not all(isinstance(model, CircadianModel) for model in models.values()):
+        raise TypeError("models must be a nonempty list or dictionary of CircadianModels")
+    if any(model._num_inputs > 2 for model in models.values()):
+        raise ValueError("models must take light, and optionally wake, as inputs")
+    _time_input_checking(time)
+    if not isinstance(input, np.ndarray):
+        raise TypeError("input must be a numpy array")
+    cohort = input.ndim == 2
+    light = input if cohort else input[:, None]
+    if light.ndim != 2 or light.shape[0] != len(time):
+        raise ValueError(f"input must be a 1D array or a 2D array with one column per subject, and have length {len(time)}")
+    if not np.issubdtype(light.dtype, np.number) or np.any(np.isnan(light)) or np.any(light < 0):
+        raise ValueError("input must be numeric, nonnegative, and not contain NaNs")
+    light = light.astype(float)
+    if wake is None:
+        wake = (light > 0).astype(float)
+    else:
+        if not isinstance(wake, np.ndarray) or wake.shape != input.shape:
+            raise ValueError("wake must be a numpy array with the shape of input")
+        wake = (wake if cohort else wake[:, None]).astype(float)
+    if n_workers is None:
+        n_workers = min(len(models), mp.cpu_count())
+    _positive_int_checking(n_workers, "n_workers")
+    # each model runs the whole cohort in its own worker
+    tasks = [(model, time, light, wake if model._num_inputs == 2 else None) for model in models.values()]
+    if n_workers == 1:
+        results = [_model_markers(task) for task in tasks]
+    else:
+        with mp.get_context().Pool(min(n_workers, len(tasks))) as pool:
+            results = pool.map(_model_markers, tasks)
+    reference = next(iter(models))
+    tables = [_align_markers({name: result[subject] for name, result in zip(models, results)}, reference, time[0])
+              for subject in range(light.shape[1])]
+    return tables if cohort else tables[0]
@@ -0,0 +1,279 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/api/13_planning.ipynb.
+
+# %% auto 0
+__all__ = ['plan_light', 'optimize_shiftwork', 'forecast']
+
+# %% ../nbs/api/13_planning.ipynb 4
+import time as timer
+from typing import Tuple
+import numpy as np
+import pandas as pd
+import warnings
+from .lights import LightSchedule, ScheduleBank
+from .models import CircadianModel, DynamicalTrajectory
+from .kernels import simulate_batch
+from .parallel import SimulationExecutor
+from .entrainment import _entrained_states, _simulate_cells, _cell_executor
+
+# %% ../nbs/api/13_planning.ipynb 6
+def _final_phase(model: CircadianModel, # model that was simulated
+                 trajectory: DynamicalTrajectory, # batched trajectory
+                 ) -> np.ndarray: # phase of each batch member at the last time point
+    "Phase of every member of a batched trajectory at its last time point"
+    return model.phase(DynamicalTrajectory._trusted(trajectory.time[-1:], trajectory.states[-1:]))[0]
+
+
+def _phase_direction(model: CircadianModel, # model to simulate
+                     time: np.ndarray, # time points of the reference simulation
+                     initial_condition: np.ndarray, # initial state of the model
+                     light: np.ndarray, # light input of the reference simulation
+                     ) -> Tuple[np.ndarray, float]: # final phase of the reference and the sign of the phase velocity
+    "Final phase of a reference simulation and whether the phase of the model grows with time"
+    trajectory = simulate_batch(model, time, initial_condition[:, None], light[:, None])
+    phase = model.phase(DynamicalTrajectory._trusted(trajectory.time[-2:], trajectory.states[-2:]))[:, 0]
+    return phase[-1], np.sign(np.angle(np.exp(1j * (phase[-1] - phase[0]))))
+
+# %% ../nbs/api/13_planning.ipynb 8
+_PLAN_KINDS = ['seek', 'avoid']
+
+def plan_light(model: CircadianModel, # model to simulate. Must have a single light input
+               target_shift: float, # desired phase shift in hours. Positive shifts are advances
+               baseline: LightSchedule, # light schedule followed outside of the intervention
+               initial_state: np.ndarray=None, # state of the model at `start`. If None, the model is entrained to `baseline`
+               start: float=0.0, # time at which the plan starts in hours
+               pulse_starts: np.ndarray=np.arange(0.0, 24.0, 0.5), # candidate start times of the intervention in hours after `start`
+               durations: np.ndarray=np.arange(0.5, 4.5, 0.5), # candidate durations of the intervention in hours
+               lux: float=10000.0, # light intensity added to the baseline when seeking light
+               kinds: list=None, # kinds of interventions: 'seek' adds bright light, 'avoid' darkens the baseline. If None, both are tried
+               horizon: float=48.0, # hours after `start` at which the phase shift is measured
+               n_best: int=10, # number of plans returned
+               tolerance: float=None, # stop early once `n_best` plans are within this many hours of the target. If None, every candidate is evaluated
+               time_budget: float=None, # stop early after this many seconds. If None, every candidate is evaluated
+               batch_size: int=2048, # number of candidates simulated together
+               dt: float=0.1, # time step in hours
+               ) -> pd.DataFrame: # best plans with their `kind`, `pulse_start`, `duration`, `shift`, `error` and `schedule`, ranked by error
+    "Search the timing and duration of a light intervention that shifts the clock by a target amount"
+    # input checking
+    if not isinstance(model, CircadianModel):
+        raise TypeError("model must be a CircadianModel")
+    if model._num_inputs != 1:
+        raise ValueError("model must have a single light input")
+    if not isinstance(baseline, LightSchedule):
+        raise TypeError("baseline must be a LightSchedule")
+    if not isinstance(target_shift, (float, int)):
+        raise TypeError(f"target_shift must be a float or int, got {type(target_shift)}")
+    pulse_starts = np.atleast_1d(np.asarray(pulse_starts, dtype=float))
+    durations = np.atleast_1d(np.asarray(durations, dtype=float))
+    if len(pulse_starts) == 0 or np.any(pulse_starts < 0):
+        raise ValueError("pulse_starts must be a nonempty array of nonnegative values")
+    if len(durations) == 0 or np.any(durations <= 0):
+        raise ValueError("durations must be a nonempty array of positive values")
+    if kinds is None:
+        kinds = _PLAN_KINDS
+    if len(kinds) == 0 or any(kind not in _PLAN_KINDS for kind in kinds):
+        raise ValueError(f"kinds must be a nonempty list with values in {_PLAN_KINDS}")
+    if lux < 0:
+        raise ValueError("lux must be nonnegative")
+    if horizon <= np.max(pulse_starts + durations[:, None]):
+        raise ValueError("horizon must end after every candidate intervention")
+    for value, name in [(n_best, "n_best"), (batch_size, "batch_size")]:
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(f"{name} must be a positive int")
+    if dt <= 0:
+        raise ValueError("dt must be positive")
+    if initial_state is None:
+        initial_state = _entrained_states(model, [baseline], float(start), 60, dt)[0][:, 0]
+    initial_state = np.asarray(initial_state, dtype=float)
+    # the baseline is sampled once and every candidate edits a copy of it
+    time = start + dt * np.arange(int(round(horizon / dt)) + 1)
+    baseline_light = baseline(time)
+    reference_phase, direction = _phase_direction(model, time, initial_state, baseline_light)
+    # shorter interventions come first so early stopping favours them
+    candidates = [(kind, pulse_start, duration) for duration in np.sort(durations) for kind in kinds for pulse_start in pulse_starts]
+    evaluated, shifts = 0, []
+    budget_start = timer.perf_counter()
+    while evaluated < len(candidates):
+        batch = candidates[evaluated:evaluated + batch_size]
+        seek = np.array([kind == 'seek' for kind, _, _ in batch])
+        pulse_start = start + np.array([candidate[1] for candidate in batch])
+        pulse_end = pulse_start + np.array([candidate[2] for candidate in batch])
+        # bright light pulses include their end, dark windows give way to the baseline at theirs
+        after_start = time[:, None] >= pulse_start[None, :]
+        window = np.where(seek[None, :], after_start & (time[:, None] <= pulse_end[None, :]), after_start & (time[:, None] < pulse_end[None, :]))
+        light = np.where(window, np.where(seek, baseline_light[:, None] + lux, 0.0), baseline_light[:, None])
+        batch_condition = np.repeat(initial_state[:, None], len(batch), axis=1)
+        trajectory = simulate_batch(model, time, batch_condition, light, save_every=len(time) - 1)
+        phase_difference = np.angle(np.exp(1j * (_final_phase(model, trajectory) - reference_phase)))
+        shifts.append(direction * phase_difference * 24.0 / (2 * np.pi))
+        evaluated += len(batch)
+        errors = np.abs(np.concatenate(shifts) - target_shift)
+        if tolerance is not None and np.sum(errors <= tolerance) >= n_best:
+            break
+        if time_budget is not None and timer.perf_counter() - budget_start > time_budget:
+            break
+    shifts = np.concatenate(shifts)
+    errors = np.abs(shifts - target_shift)
+    # ties are broken by the shortest intervention
+    durations_evaluated = np.array([candidate[2] for candidate in candidates[:evaluated]])
+    best = np.lexsort((durations_evaluated, errors))[:n_best]
+    plans = []
+    for idx in best:
+        kind, pulse_start, duration = candidates[idx]
+        pulse_start = start + pulse_start
+        if kind == 'seek':
+            schedule = baseline + LightSchedule.from_pulse(float(lux), float(pulse_start), float(duration))
+        else:
+            schedule = baseline.concatenate_at(LightSchedule(0.0), float(pulse_start), shift_schedule=False)
+            schedule = schedule.concatenate_at(baseline, float(pulse_start + duration), shift_schedule=False)
+        plans.append({'kind': kind, 'pulse_start': pulse_start, 'duration': duration,
+                      'shift': shifts[idx], 'error': errors[idx], 'schedule': schedule})
+    return pd.DataFrame(plans)
+
+# %% ../nbs/api/13_planning.ipynb 10
+def _dark_midpoints(time: np.ndarray, # time points sampled every dt from the start of a day
+                    light: np.ndarray, # light input with one column per schedule
+                    steps_per_day: int, # number of time points per day
+                    ) -> np.ndarray: # time of the day of the middle of the dark period with shape (days, n). NaN for days without darkness
+    "Circular mean of the dark times of every day of every schedule"
+    days = len(time) // steps_per_day
+    dark = (light[:days * steps_per_day] <= 0.0).reshape(days, steps_per_day, -1)
+    clock = np.exp(2j * np.pi * time[:steps_per_day] / 24.0)
+    angle = np.angle(np.einsum('dtn,t->dn', dark, clock))
+    return np.where(dark.any(axis=1), np.mod(angle * 24.0 / (2 * np.pi), 24.0), np.nan)
+
+
+def _shiftwork_scores(model: CircadianModel, # model to simulate
+                      bank: ScheduleBank, # candidate schedules
+                      initial_state: np.ndarray, # entrained state at the start of the schedules
+                      reference_amplitude: float, # mean amplitude of the model entrained to the reference schedule
+                      transient_days: int, # days simulated before the schedules are scored
+                      evaluation_days: int, # days over which the schedules are scored
+                      dt: float, # time step in hours
+                      executor: SimulationExecutor, # pool of workers shared by every batch, or None
+                      ) -> Tuple[np.ndarray, np.ndarray]: # misalignment in hours and relative amplitude loss of each schedule
+    "Simulate a batch of schedules from the same state and score their circadian disruption"
+    steps_per_day = int(round(24.0 / dt))
+    batch_condition = np.repeat(initial_state[:, None], len(bank), axis=1)
+    transient_steps = transient_days * steps_per_day
+    time = dt * np.arange(transient_steps + 1)
+    trajectory = _simulate_cells(model, time, batch_condition, bank(time), executor, save_every=transient_steps)
+    time = time[-1] + dt * np.arange(evaluation_days * steps_per_day + 1)
+    light = bank(time)
+    trajectory = _simulate_cells(model, time, trajectory.states[-1], light, executor)
+    amplitude_loss = 1.0 - np.mean(model.amplitude(trajectory), axis=0) / reference_amplitude
+    # distance of the CBT minimum of every day to the middle of that day's dark period
+    midpoints = _dark_midpoints(time, light, steps_per_day)
+    misalignment = np.full(len(bank), np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for member in range(len(bank)):
+            cbt = model.cbt(trajectory.get_batch(member))
+            days = ((cbt - time[0]) // 24.0).astype(int)
+            days = days[days < len(midpoints)]
+            cbt = cbt[:len(days)]
+            errors = np.abs(np.mod(cbt - midpoints[days, member] + 12.0, 24.0) - 12.0)
+            if np.any(np.isfinite(errors)):
+                misalignment[member] = np.nanmean(errors)
+    return misalignment, amplitude_loss
+
+# %% ../nbs/api/13_planning.ipynb 11
+_SHIFTWORK_OBJECTIVES = ['misalignment', 'amplitude_loss']
+
+def optimize_shiftwork(model: CircadianModel, # model to simulate. Must have a single light input
+                       search_space: dict, # values of the `LightSchedule.ShiftWork` parameters to search, each a value or a list of values
+                       objective: str='misalignment', # score to minimise, one of 'misalignment' or 'amplitude_loss'
+                       reference: LightSchedule=None, # schedule the model is entrained to before the shift work starts. If None, `LightSchedule.Regular()` is used
+                       transient_days: int=28, # days simulated before the schedules are scored
+                       evaluation_days: int=14, # days over which the schedules are scored
+                       n_best: int=10, # number of schedules returned
+                       batch_size: int=512, # number of schedules simulated together
+                       n_workers: int=1, # number of worker processes. With a single worker the simulations run in this process
+                       dt: float=0.1, # time step in hours
+                       ) -> pd.DataFrame: # best schedules with their parameters, `misalignment` in hours, and `amplitude_loss`, ranked by the objective
+    "Search the parameters of `LightSchedule.ShiftWork` for the schedules that disrupt the clock of a model the least"
+    # input checking
+    if not isinstance(model, CircadianModel):
+        raise TypeError("model must be a CircadianModel")
+    if model._num_inputs != 1:
+        raise ValueError("model must have a single light input")
+    if not isinstance(search_space, dict):
+        raise TypeError("search_space must be a dictionary of ShiftWork parameters")
+    if objective not in _SHIFTWORK_OBJECTIVES:
+        raise ValueError(f"objective must be one of {_SHIFTWORK_OBJECTIVES}")
+    if reference is None:
+        reference = LightSchedule.Regular()
+    if not isinstance(reference, LightSchedule):
+        raise TypeError("reference must be a LightSchedule")
+    for value, name in [(transient_days, "transient_days"), (evaluation_days, "evaluation_days"), (n_best, "n_best"),
+                        (batch_size, "batch_size"), (n_workers, "n_workers")]:
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(f"{name} must be a positive int")
+    if dt <= 0 or not np.isclose(24.0 / dt, round(24.0 / dt)):
+        raise ValueError("dt must be positive and divide a day")
+    bank = LightSchedule.ShiftWork.grid(**search_space)
+    # every candidate starts from the same cached entrained state
+    initial_state = _entrained_states(model, [reference], 0.0, 60, dt)[0][:, 0]
+    time = dt * np.arange(int(round(evaluation_days * 24.0 / dt)) + 1)
+    reference_amplitude = np.mean(model.amplitude(simulate_batch(model, time, initial_state[:, None], reference(time)[:, None])))
+    misalignment, amplitude_loss = np.zeros(len(bank)), np.zeros(len(bank))
+    with _cell_executor(model, n_workers) as executor:
+        for batch_start in range(0, len(bank), batch_size):
+            rows = slice(batch_start, batch_start + batch_size)
+            batch = ScheduleBank._from_structures(bank._structures, bank._rows[rows], bank._scales[rows])
+            misalignment[rows], amplitude_loss[rows] = _shiftwork_scores(model, batch, initial_state, reference_amplitude,
+                                                                         transient_days, evaluation_days, dt, executor)
+    scores = pd.DataFrame(bank.parameters)
+    scores['misalignment'] = misalignment
+    scores['amplitude_loss'] = amplitude_loss
+    return scores.sort_values(objective, kind='stable', na_position='last').head(n_best).reset_index(drop=True)
+
+# %% ../nbs/api/13_planning.ipynb 13
+_FORECAST_MARKERS = ['dlmo', 'cbt']
+
+def forecast(model: CircadianModel, # model to simulate. Must have a single light input
+             current_state: np.ndarray, # state of the model at `t0`, for example the last state of a simulation of a subject's wearable history
+             t0: float, # current time in hours
+             candidate_schedules, # light schedules of the possible futures, as a list or a dictionary of named schedules
+             horizon: float=168.0, # hours forecast after `t0`
+             markers: list=None, # markers to predict, 'dlmo' and/or 'cbt'. If None, only the DLMO is predicted
+             dt: float=0.1, # time step in hours
+             ) -> pd.DataFrame: # one row per predicted marker with its `candidate`, `marker`, `time`, `day` after `t0`, and `time_of_day`
+    "Forecast the circadian markers of a subject under several candidate futures branching from their current state"
+    # input checking
+    if not isinstance(model, CircadianModel):
+        raise TypeError("model must be a CircadianModel")
+    if model._num_inputs != 1:
+        raise ValueError("model must have a single light input")
+    current_state = np.asarray(current_state, dtype=float)
+    if current_state.shape != (model._num_states,):
+        raise ValueError(f"current_state must have shape ({model._num_states},)")
+    if not isinstance(t0, (float, int)):
+        raise TypeError(f"t0 must be a float or int, got {type(t0)}")
+    if not isinstance(candidate_schedules, dict):
+        candidate_schedules = dict(enumerate(candidate_schedules))
+    if len(candidate_schedules) == 0 or not all(isinstance(schedule, LightSchedule) for schedule in candidate_schedules.values()):
+        raise TypeError("candidate_schedules must be a nonempty list or dictionary of LightSchedules")
+    if markers is None:
+        markers = ['dlmo']
+    if len(markers) == 0 or any(marker not in _FORECAST_MARKERS for marker in markers):
+        raise ValueError(f"markers must be a nonempty list with values in {_FORECAST_MARKERS}")
+    if horizon <= 0 or dt <= 0:
+        raise ValueError("horizon and dt must be positive")
+    # sampled schedules are cached by each schedule, repeated forecasts skip their evaluation
+    samples = [schedule.sample(float(t0), float(t0) + horizon + dt / 2, dt) for schedule in candidate_schedules.values()]
+    time = samples[0][0]
+    light = np.stack([light for _, light in samples], axis=1)
+    batch_condition = np.repeat(current_state[:, None], len(candidate_schedules), axis=1)
+    trajectory = simulate_batch(model, time, batch_condition, light)
+    predictions = []
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for member, name in enumerate(candidate_schedules):
+            future = trajectory.get_batch(member)
+            for marker in markers:
+                marker_times = model.dlmos(future) if marker == 'dlmo' else model.cbt(future)
+                # DLMOs are placed before their CBT minimum and can predate the forecast
+                for marker_time in marker_times[marker_times >= t0]:
+                    predictions.append({'candidate': name, 'marker': marker, 'time': marker_time,
+                                        'day': int((marker_time - t0) // 24.0), 'time_of_day': np.mod(marker_time, 24.0)})
+    return pd.DataFrame(predictions, columns=['candidate', 'marker', 'time', 'day', 'time_of_day'])
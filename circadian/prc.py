@@ -2,13 +2,21 @@
 
 # %% auto 0
 __all__ = ['RimmerLightPulseLight', 'make_pulse', 'get_pulse', 'PhaseResponseCurveLight', 'heaviside', 'PRCFinder',
-           'IntensityResponseCurveLight', 'DosageResponseCurve']
+           'IntensityResponseCurveLight', 'DosageResponseCurve', 'compute_prc', 'ResponseCurve', 'ResponseCurveCache']
 
 # %% ../nbs/api/02_prc.ipynb 4
+import os
+import json
+import hashlib
+import tempfile
+import itertools
 import numpy as np
 import matplotlib.pyplot as plt
+from typing import Callable, Tuple
+from fastcore.basics import patch_to
 from .lights import LightSchedule
-from .models import CircadianModel, Hannay19
+from .models import CircadianModel, DynamicalTrajectory, Hannay19
+from .kernels import simulate_batch
 
 # %% ../nbs/api/02_prc.ipynb 5
 # TODO: Finish implementing this 
@@ -17,48 +25,38 @@ class RimmerLightPulseLight:
         pass 
 
     @staticmethod
-    def make_pulse_rimmer(t: float, 
-                          tstart: float, 
-                          tend: float):
-        val = 0.0
+    def schedule(tstart: float, # start time of the bright light pulse in hours
+                 tend: float, # end time of the bright light pulse in hours
+                 ramp_down: bool=True, # whether the light ramps down after the pulse
+                 ) -> LightSchedule:
+        "Bright light pulse that ramps up in 5 minute steps from 5000 lux during the 25 minutes before it starts, and optionally ramps down after it ends"
         steep = 100.0
         trans = 25.0/60.0
 
-        val += 9500*(0.5*np.tanh(steep*(t-tstart))-0.5*np.tanh(steep*(t-t)))
-
-        if ((t < tstart) and (t > tstart-trans)):
-            val = 5000.0
-            factor = np.floor((t-tstart+trans)*60.0/5.0)
-            val += factor*1000.0
+        def light(t):
+            val = 9500*(0.5*np.tanh(steep*(t-tstart))-0.5*np.tanh(steep*(t-tend)))  # main pulse
+            ramp_up = (t < tstart) & (t > tstart-trans)
+            val = np.where(ramp_up, 5000.0 + np.floor((t-tstart+trans)*60.0/5.0)*1000.0, val)
+            if ramp_down:
+                ramping_down = (t > tend) & (t < tend+trans)
+                val = np.where(ramping_down, 9500.0 - np.floor((t-tend)*60.0/5.0)*1000.0, val)
+            return val
 
-        if ((t > t) and (t < t+trans)):
-            val = 9500.0
-            factor = np.floor((t-t)*60.0/5.0)
-            val -= factor*1000.0
+        return LightSchedule(light, vectorized=True)
 
-        return(val)
+    @staticmethod
+    def make_pulse_rimmer(t: float, 
+                          tstart: float, 
+                          tend: float):
+        return _protocol_light(RimmerLightPulseLight.schedule(tstart, tend), t)
 
     @staticmethod
     def pulse_rimmer_start(t: float, 
                              tstart: float, 
                              tend: float):
-
-        val = 0.0
-        steep = 100.0
-        trans = 25.0/60.0
-
-        val += 9500*(0.5*np.tanh(steep*(t-tstart))-0.5 *
-                    np.tanh(steep*(t-t)))  # main pulse
-
-        if ((t < tstart) and (t > tstart-trans)):
-            val = 5000.0
-            factor = np.floor((t-tstart+trans)*60.0/5.0)
-            val += factor*1000.0
-
-        return(val)
+        return _protocol_light(RimmerLightPulseLight.schedule(tstart, tend, ramp_down=False), t)
 
 # %% ../nbs/api/02_prc.ipynb 6
-# TODO: Replace the use of these two functions with LightSchedules
 def make_pulse(t, tstart, tend, steep: float=30.0):
     return 0.5*np.tanh(steep*(t-tstart))-0.5*np.tanh(steep*(t-tend))
 
@@ -70,70 +68,80 @@ def get_pulse(t: float,
 
     if repeat:
         t = np.fmod(t, 24.0)
-    if t < 0.0:
-        t += 24.0
+    t = np.where(t < 0.0, t + 24.0, t)
 
     light_value = Intensity*make_pulse(t, t1, t2)
     return np.abs(light_value)
 
+def _protocol_light(schedule: LightSchedule, # light schedule of the protocol
+                    t: float, # time in hours, a float or an array
+                    ):
+    "Evaluate a protocol light schedule, returning a float for scalar times"
+    light_values = schedule(np.ravel(t)).reshape(np.shape(t))
+    return float(light_values) if np.ndim(t) == 0 else light_values
+
 # %% ../nbs/api/02_prc.ipynb 7
 class PhaseResponseCurveLight:
     def __init__(self) -> None:
          pass 
-     
-    def light_khalsa(t: float, 
-                     CR: float):
-        # Implement a Khalsa Light Schedule give a parameter for the initial CR length */
 
+    @staticmethod
+    def khalsa_schedule(CR: float # length of the initial constant routine in hours
+                        ) -> LightSchedule:
+        "Light schedule of the Khalsa et al. phase response curve protocol"
         low_light = 15.0  # from the paper
-        val = low_light*make_pulse(t, 0.0, CR)+low_light*make_pulse(t,
-                                                                    CR+8.0, CR+24.0)+low_light*make_pulse(t, CR+32.0, CR+1000.0)
-        val += 9985.0*make_pulse(t, CR+8.0+4.65, CR+8.0+11.35)
-        return(val)
-
-    def light_hilaire(t: float,
-                      CR: float):
+        return LightSchedule.from_smooth_pulses([low_light, low_light, low_light, 9985.0],
+                                                [0.0, CR+8.0, CR+32.0, CR+8.0+4.65],
+                                                [CR, CR+24.0, CR+1000.0, CR+8.0+11.35])
 
+    @staticmethod
+    def hilaire_schedule(CR: float # length of the initial constant routine in hours
+                         ) -> LightSchedule:
+        "Light schedule of the St Hilaire et al. phase response curve protocol"
         low_light = 3.0  # amount of light during CR (verified 1/16/17)
-        val = low_light*make_pulse(t, 0, CR)+low_light*make_pulse(t,
-                                                                CR+8, CR+24)+low_light*make_pulse(t, CR+32, CR+1000)
-        val += 7997*make_pulse(t, CR+8+7.5, CR+8+8.5)
-        return(val)
-
-    def light_amplitude_resetting(t: float, 
-                  CR: float):
+        return LightSchedule.from_smooth_pulses([low_light, low_light, low_light, 7997.0],
+                                                [0.0, CR+8.0, CR+32.0, CR+8.0+7.5],
+                                                [CR, CR+24.0, CR+1000.0, CR+8.0+8.5])
 
+    @staticmethod
+    def amplitude_resetting_schedule(CR: float # length of the initial constant routine in hours
+                                     ) -> LightSchedule:
+        "Light schedule of the amplitude resetting protocol with two bright light stimuli"
         roomLight = 150.0
         afterLight = 150.0
         beforeLight = 150.0
-        val = 0.0
-
-        val += beforeLight*make_pulse(t, 0, CR)
-        val += roomLight*make_pulse(t, CR+8, CR+24)
-        val += 0.02*make_pulse(t, 0+24.0, CR+24.0)+roomLight * \
-            make_pulse(t, CR+8+24.0, CR+48.0)
-        val += afterLight*make_pulse(t, CR+48.0+8.0, CR+24+48.0+1000)
-        val += 9850*make_pulse(t, CR+8+8-2.5, CR+8+8+2.5) + \
-            9850*make_pulse(t, CR+8+8-2.5+24.0, CR+8+8+2.5+24.0)
-        return(val)
-    
-    def light_czeiler_type0(t: float, CR: float):
+        return LightSchedule.from_smooth_pulses([beforeLight, roomLight, 0.02, roomLight, afterLight, 9850.0, 9850.0],
+                                                [0.0, CR+8.0, 24.0, CR+8.0+24.0, CR+48.0+8.0, CR+8.0+8.0-2.5, CR+8.0+8.0-2.5+24.0],
+                                                [CR, CR+24.0, CR+24.0, CR+48.0, CR+24.0+48.0+1000.0, CR+8.0+8.0+2.5, CR+8.0+8.0+2.5+24.0])
+
+    @staticmethod
+    def czeiler_type0_schedule(CR: float # length of the initial constant routine in hours
+                               ) -> LightSchedule:
+        "Light schedule of the Czeisler et al. type 0 resetting protocol with three bright light stimuli"
         roomLight = 150.0
         afterLight = 150.0  # 150.0
         beforeLight = 150.0  # 150.0
+        return LightSchedule.from_smooth_pulses([beforeLight, roomLight, 0.02, roomLight, 0.02, roomLight, afterLight, 9850.0, 9850.0, 9850.0],
+                                                [0.0, CR+8.0, 24.0, CR+8.0+24.0, 48.0, CR+8.0+48.0, CR+24.0+48.0+8.0,
+                                                 CR+8.0+8.0-2.5, CR+8.0+8.0-2.5+24.0, CR+8.0+8.0-2.5+48.0],
+                                                [CR, CR+24.0, CR+24.0, CR+24.0+24.0, CR+48.0, CR+24.0+48.0, CR+24.0+48.0+1000.0,
+                                                 CR+8.0+8.0+2.5, CR+8.0+8.0+2.5+24.0, CR+8.0+8.0+2.5+48.0])
+     
+    def light_khalsa(t: float, 
+                     CR: float):
+        # Implement a Khalsa Light Schedule give a parameter for the initial CR length */
+        return _protocol_light(PhaseResponseCurveLight.khalsa_schedule(CR), t)
 
-        val = 0.0
+    def light_hilaire(t: float,
+                      CR: float):
+        return _protocol_light(PhaseResponseCurveLight.hilaire_schedule(CR), t)
 
-        val += beforeLight*make_pulse(t, 0, CR)
-        val += roomLight*make_pulse(t, CR+8, CR+24)
-        val += 0.02*make_pulse(t, 0+24.0, CR+24.0)+roomLight * \
-            make_pulse(t, CR+8+24.0, CR+24+24.0)
-        val += 0.02*make_pulse(t, 0+48.0, CR+48.0)+roomLight * \
-            make_pulse(t, CR+8+48.0, CR+24+48.0)
-        val += afterLight*make_pulse(t, CR+24+48.0+8.0, CR+24+48.0+1000)
-        val += 9850*make_pulse(t, CR+8+8-2.5, CR+8+8+2.5)+9850*make_pulse(t, CR+8+8 -
-                                                                        2.5+24.0, CR+8+8+2.5+24.0)+9850*make_pulse(t, CR+8+8-2.5+48.0, CR+8+8+2.5+48.0)
-        return(val)
+    def light_amplitude_resetting(t: float, 
+                  CR: float):
+        return _protocol_light(PhaseResponseCurveLight.amplitude_resetting_schedule(CR), t)
+    
+    def light_czeiler_type0(t: float, CR: float):
+        return _protocol_light(PhaseResponseCurveLight.czeiler_type0_schedule(CR), t)
 
 # %% ../nbs/api/02_prc.ipynb 8
 def heaviside(x: float) -> float:
@@ -180,7 +188,7 @@ class PRCFinder:
         CRFinal = 30.0
         tend = 72.0 + 8.0 + 30.0 + CRFinal
         time = np.arange(0, tend, 0.10)
-        light_vals = np.array([PhaseResponseCurveLight.light_czeiler_type0(t, CRlength) for t in time])
+        light_vals = PhaseResponseCurveLight.czeiler_type0_schedule(CRlength)(time)
         trajectory = model(time, initial_value, light_vals)
         CBT = model.cbt()
         shift = (CBT[0] - CBT[-1]) % 24.0 #finds a neg number between zero and -24.0
@@ -199,7 +207,8 @@ class IntensityResponseCurveLight:
          pass
      
     @staticmethod
-    def light_intensity(t, Intensity):
+    def intensity_schedule(Intensity: float # light intensity of the stimulus in lux
+                           ) -> LightSchedule:
         """
         Define the light schedule for the dosage response curve experiments. All light exposures started at phi 6.75 hours
         before Tmin and lasted 6.5 hours of varying intensities
@@ -211,20 +220,20 @@ class IntensityResponseCurveLight:
         stimulus_light_level = Intensity
 
         w = 50.0  # length of the constant routine, should be approx 50 hours, did have 50.0-9.50
-        val = 0.0
-        val += cr_light_level*make_pulse(t, 0, w)  # 50 hour constant routine
-        val += sleep_light_level*make_pulse(t, w, w+8.0)  # eight hour sleep bout
-        val += wake_stimulus_light_level * \
-            make_pulse(t, w+8.0, w+24.0)  # wake/stimulus period
-        val += (stimulus_light_level-wake_stimulus_light_level)*make_pulse(t, w+16.0 -
-                                                                        3.25, w+16.0+3.25)  # the stimulus centered during the 16 hours of wakefulness
-        # sleep period following stimulus
-        val += sleep_light_level*make_pulse(t, w+24.0, w+32.0)
-        # final cr to assess the phase shift induced
-        val += cr_light_level*make_pulse(t, w+32.0, w+32.0+30.0)
-
+        return LightSchedule.from_smooth_pulses(
+            [cr_light_level,  # 50 hour constant routine
+             sleep_light_level,  # eight hour sleep bout
+             wake_stimulus_light_level,  # wake/stimulus period
+             stimulus_light_level-wake_stimulus_light_level,  # the stimulus centered during the 16 hours of wakefulness
+             sleep_light_level,  # sleep period following stimulus
+             cr_light_level],  # final cr to assess the phase shift induced
+            [0.0, w, w+8.0, w+16.0-3.25, w+24.0, w+32.0],
+            [w, w+8.0, w+24.0, w+16.0+3.25, w+32.0, w+32.0+30.0])
         # Stimulus should start 5.25 hours after phase zero, so that it is centered 3.5 hours before Tmin
-        return(val)
+
+    @staticmethod
+    def light_intensity(t, Intensity):
+        return _protocol_light(IntensityResponseCurveLight.intensity_schedule(Intensity), t)
 
 # %% ../nbs/api/02_prc.ipynb 11
 class DosageResponseCurve:
@@ -233,36 +242,387 @@ class DosageResponseCurve:
          pass
      
     @staticmethod
-    def light_dosage(t: float, length: float):
-        # Implement the Light Schedule for Chang et al's Dosage Response Curve */
+    def dosage_schedule(length: float # duration of the light stimulus in hours
+                        ) -> LightSchedule:
+        "Light schedule of Chang et al's Dosage Response Curve protocol"
         CR1 = 48.0  # approx 50.0
         CR2 = 30.0
         CR_light_level = 1.0
         stimulus_light_level = 10000.0
         wake_light_level = 3.0
 
-        val = 0.0
-        val += CR_light_level*make_pulse(t, 0.0, CR1)
-        val += wake_light_level*make_pulse(t, CR1+8.0, CR1+8.0+16.0)
+        stimulus_center = CR1+8.0+8.5
         if (length == 0.2):
-            val += stimulus_light_level * \
-                make_pulse(t, CR1+8.0+8.5-length/2.0-12.0/60.0,
-                            CR1+8.0+8.5+length/2.0-12.0/60.0)
-        else:
-            val += stimulus_light_level * \
-                make_pulse(t, CR1+8.0+8.5-length/2.0, CR1+8.0+8.5+length/2.0)
+            stimulus_center -= 12.0/60.0
+        return LightSchedule.from_smooth_pulses([CR_light_level, wake_light_level, stimulus_light_level, CR_light_level],
+                                                [0.0, CR1+8.0, stimulus_center-length/2.0, CR1+32.0],
+                                                [CR1, CR1+8.0+16.0, stimulus_center+length/2.0, CR1+32.0+30.0])
 
-        val += CR_light_level*make_pulse(t, CR1+32.0, CR1+32.0+30.0)
+    @staticmethod
+    def light_dosage(t: float, length: float):
+        # Implement the Light Schedule for Chang et al's Dosage Response Curve */
+        return _protocol_light(DosageResponseCurve.dosage_schedule(length), t)
 
-        return(val)
+    @staticmethod
+    def dosage_day1_schedule() -> LightSchedule:
+        "Light schedule of the prep day just before the constant routine in the Chang et al Duration Response Curve protocol"
+        # 90 lux until 8 hours, then dimmed to 3 lux until 16 hours included, repeated every day
+        return LightSchedule.from_pulse(90.0, 0.0, 16.0, period=24.0) - LightSchedule.from_pulse(87.0, 8.0, 8.0, period=24.0)
 
     @staticmethod
     def light_dosage_day1(t):
         # Implement the prep day just before the constant routine in the Chang et al Duration Response Curve protocol */
-        s = t % 24.0
-        val = 0.0
-        if (s < 8.0):
-            val = 90.0
-        if ((s >= 8.0) and (s <= 16.0)):
-            val = 3.0
-        return(val)
+        return _protocol_light(DosageResponseCurve.dosage_day1_schedule(), t)
+
+# %% ../nbs/api/02_prc.ipynb 12
+def _first_and_last_cbt(model: CircadianModel, # model that was simulated
+                        trajectory: DynamicalTrajectory, # batched trajectory
+                        ) -> Tuple[np.ndarray, np.ndarray]: # first and last CBT minimum of each batch member
+    "First and last core body temperature minimum of every member of a batched trajectory, found in one pass over the whole batch"
+    batch_size = trajectory.states.shape[2]
+    first_cbt, last_cbt = np.full(batch_size, np.nan), np.full(batch_size, np.nan)
+    try:
+        signal, offset = model._cbt_signal(trajectory)
+    except NotImplementedError:
+        # models without a batched cbt signal are searched one member at a time
+        for member in range(batch_size):
+            cbt = model.cbt(trajectory.get_batch(member))
+            if len(cbt) > 0:
+                first_cbt[member], last_cbt[member] = cbt[0], cbt[-1]
+        return first_cbt, last_cbt
+    # local maxima of the signal, with shape (num_time_points - 2, batch_size)
+    peaks = (signal[1:-1] > signal[:-2]) & (signal[1:-1] > signal[2:])
+    found = peaks.any(axis=0)
+    first_idx = np.argmax(peaks, axis=0) + 1
+    last_idx = len(peaks) - np.argmax(peaks[::-1], axis=0)
+    first_cbt[found] = trajectory.time[first_idx[found]] + offset
+    last_cbt[found] = trajectory.time[last_idx[found]] + offset
+    return first_cbt, last_cbt
+
+
+def _protocol_cbt(model: CircadianModel, # model to simulate
+                  schedules: list, # light schedule of each batch member
+                  time: np.ndarray, # time points for integration
+                  initial_condition: np.ndarray, # initial state shared by the batch
+                  ) -> Tuple[np.ndarray, np.ndarray]: # first and last CBT minimum of each batch member
+    "Simulate one batch member per light schedule and find their first and last CBT minimum"
+    light = np.stack([schedule(time) for schedule in schedules], axis=1)
+    batch_condition = np.repeat(initial_condition[:, None], len(schedules), axis=1)
+    return _first_and_last_cbt(model, simulate_batch(model, time, batch_condition, light))
+
+
+def _phase_shifts(first_cbt: np.ndarray, # first CBT minimum of each simulation
+                  last_cbt: np.ndarray, # last CBT minimum of each simulation
+                  ) -> np.ndarray: # phase shifts in hours between -12 and 12. Positive shifts are advances
+    "Phase shifts measured between the first and last CBT minimum modulo 24 hours"
+    shifts = np.mod(first_cbt - last_cbt, 24.0)
+    return np.where(shifts > 12.0, shifts - 24.0, shifts)
+
+# %% ../nbs/api/02_prc.ipynb 13
+def compute_prc(model: CircadianModel, # model to simulate
+                protocol: Callable[[float], LightSchedule], # function returning the light schedule of the protocol for a given length of the initial constant routine, such as `PhaseResponseCurveLight.khalsa_schedule`
+                stimulus_phases: np.ndarray, # phases of the center of the stimulus in hours after the first CBT minimum
+                initial_condition: np.ndarray=None, # state of the model at the start of the protocol. If None, the model's default initial condition is used
+                stimulus_offset: float=16.0, # hours between the end of the initial constant routine and the center of the stimulus
+                duration: float=110.0, # hours simulated after the longest initial constant routine
+                min_cr_length: float=6.0, # shortest initial constant routine in hours
+                dt: float=0.1, # time step in hours
+                ) -> Tuple[np.ndarray, np.ndarray]: # measured phases of the stimuli and phase shifts in hours. Positive shifts are advances
+    "Compute a phase response curve by simulating every stimulus timing of a protocol in a single batched integration"
+    # input checking
+    if not isinstance(model, CircadianModel):
+        raise TypeError("model must be a CircadianModel")
+    if not callable(protocol):
+        raise TypeError("protocol must be a callable that returns a LightSchedule")
+    stimulus_phases = np.atleast_1d(np.asarray(stimulus_phases, dtype=float))
+    if stimulus_phases.ndim != 1 or len(stimulus_phases) == 0 or not np.all(np.isfinite(stimulus_phases)):
+        raise ValueError("stimulus_phases must be a nonempty 1D array of finite values")
+    if initial_condition is None:
+        initial_condition = model._default_initial_condition
+    for value, name in [(stimulus_offset, "stimulus_offset"), (duration, "duration"), (min_cr_length, "min_cr_length"), (dt, "dt")]:
+        if not isinstance(value, (float, int)):
+            raise TypeError(f"{name} must be a float or int, got {type(value)}")
+    if duration <= 0 or dt <= 0 or min_cr_length <= 0:
+        raise ValueError("duration, min_cr_length, and dt must be positive")
+    # the first CBT minimum happens during the initial constant routine, before any stimulus
+    reference_cr_length = min_cr_length + 24.0
+    reference_time = np.arange(0.0, reference_cr_length, dt)
+    reference_light = protocol(reference_cr_length)(reference_time)
+    reference = simulate_batch(model, reference_time, initial_condition[:, None], reference_light[:, None])
+    reference_cbt, _ = _first_and_last_cbt(model, reference)
+    if np.isnan(reference_cbt[0]):
+        raise ValueError("no CBT minimum found during the initial constant routine, try increasing min_cr_length")
+    # constant routine lengths that place the stimuli at the requested phases
+    cr_lengths = min_cr_length + np.mod(reference_cbt[0] + stimulus_phases - stimulus_offset - min_cr_length, 24.0)
+    time = np.arange(0.0, np.max(cr_lengths) + duration, dt)
+    _, last_cbt = _protocol_cbt(model, [protocol(cr_length) for cr_length in cr_lengths], time, initial_condition)
+    # phases and shifts are measured from the unperturbed minimum. A simulation's own first minimum can come after its stimulus starts
+    phases = np.mod(cr_lengths + stimulus_offset - reference_cbt[0], 24.0)
+    return phases, _phase_shifts(np.full(len(cr_lengths), reference_cbt[0]), last_cbt)
+
+# %% ../nbs/api/02_prc.ipynb 18
+def _linear_weights(grid: np.ndarray, # increasing grid of an axis
+                    values: np.ndarray, # query values along the axis
+                    ) -> Tuple[np.ndarray, np.ndarray]: # index of the lower neighbor and weight of the upper neighbor
+    "Neighbors and weights of linear interpolation on a grid, clamping queries outside of it"
+    if len(grid) == 1:
+        return np.zeros(values.shape, dtype=int), np.zeros(values.shape)
+    values = np.clip(values, grid[0], grid[-1])
+    index = np.clip(np.searchsorted(grid, values, side='right') - 1, 0, len(grid) - 2)
+    weight = (values - grid[index]) / (grid[index + 1] - grid[index])
+    return index, weight
+
+# %% ../nbs/api/02_prc.ipynb 19
+class ResponseCurve:
+    "Phase shifts of a model on a grid of stimulus parameters, with multilinear interpolation between grid points"
+    def __init__(self,
+                 axes: dict, # increasing grid of each stimulus parameter, such as `{'phase': phases}`
+                 shifts: np.ndarray, # phase shifts in hours with one dimension per axis
+                 period: float=24.0, # period of the `phase` axis in hours. Interpolation along it wraps around
+                 ) -> None:
+        if not isinstance(axes, dict) or len(axes) == 0:
+            raise TypeError("axes must be a nonempty dictionary")
+        self.axes = {name: np.asarray(grid, dtype=float) for name, grid in axes.items()}
+        self.shifts = np.asarray(shifts, dtype=float)
+        if self.shifts.shape != tuple(len(grid) for grid in self.axes.values()):
+            raise ValueError("shifts must have one dimension per axis with the length of its grid")
+        for name, grid in self.axes.items():
+            if grid.ndim != 1 or len(grid) == 0 or np.any(np.diff(grid) <= 0):
+                raise ValueError(f"the grid of {name} must be a nonempty increasing 1D array")
+        self.period = period
+        # phase grids are padded with the wrapped neighbors of their ends
+        self._grids = []
+        self._table = self.shifts
+        for axis, (name, grid) in enumerate(self.axes.items()):
+            if name == 'phase':
+                wrapped = np.mod(grid, period)
+                grid, order, repeated = np.unique(wrapped, return_index=True, return_inverse=True)
+                # grids with both ends of the period, like 0 and 24, repeat a phase whose shifts must agree
+                if len(grid) < len(wrapped) and not np.allclose(np.take(self._table, order[repeated], axis=axis), self._table):
+                    raise ValueError("phases that wrap to the same value must have the same shifts")
+                grid = np.concatenate([[grid[-1] - period], grid, [grid[0] + period]])
+                order = np.concatenate([[order[-1]], order, [order[0]]])
+                self._table = np.take(self._table, order, axis=axis)
+            self._grids.append(grid)
+
+    def __call__(self,
+                 *coordinates, # value of every axis, in the order of `axes`. Arrays are broadcast together
+                 ) -> np.ndarray: # interpolated phase shifts in hours
+        if len(coordinates) != len(self._grids):
+            raise ValueError(f"expected {len(self._grids)} coordinates ({', '.join(self.axes)}), got {len(coordinates)}")
+        coordinates = np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in coordinates])
+        neighbors = []
+        for name, grid, values in zip(self.axes, self._grids, coordinates):
+            if name == 'phase':
+                values = np.mod(values, self.period)
+            neighbors.append(_linear_weights(grid, values))
+        shifts = np.zeros(coordinates[0].shape)
+        for corner in itertools.product((0, 1), repeat=len(neighbors)):
+            weight = np.ones(coordinates[0].shape)
+            index = []
+            for upper, (lower_index, upper_weight) in zip(corner, neighbors):
+                weight = weight * (upper_weight if upper else 1.0 - upper_weight)
+                index.append(np.minimum(lower_index + upper, self._table.shape[len(index)] - 1))
+            shifts += weight * self._table[tuple(index)]
+        return shifts[()] if shifts.ndim == 0 else shifts
+
+    def __repr__(self) -> str:
+        axes = ', '.join(f"{name}: {len(grid)}" for name, grid in self.axes.items())
+        return f"ResponseCurve({axes})"
+
+# %% ../nbs/api/02_prc.ipynb 20
+_CACHE_VERSION = 1
+_PRC_SPEC_LENGTHS = (6.0, 12.0, 18.0)
+
+
+def _default_cache_directory() -> str:
+    "User cache directory of circadian, following the XDG convention"
+    root = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(root, 'circadian', 'response_curves')
+
+
+def _protocol_spec(protocol: Callable[[float], LightSchedule], # function returning the light schedule of the protocol
+                   arguments: tuple, # arguments at which the protocol is sampled
+                   ) -> list: # canonical strings of the sampled schedules
+    "Identify a protocol by the light schedules it produces"
+    spec = []
+    for argument in arguments:
+        key = protocol(argument)._hash_key()
+        if key is None:
+            raise ValueError("protocols with arbitrary light functions can't be cached, build their schedules from arrays")
+        spec.append(key)
+    return spec
+
+
+def _pulse_protocol(intensity: float, # light intensity of the stimulus in lux
+                    duration: float, # duration of the stimulus in hours
+                    background: float, # light intensity outside of the stimulus in lux
+                    stimulus_offset: float, # hours between the end of the initial constant routine and the center of the stimulus
+                    ) -> Callable[[float], LightSchedule]:
+    "Protocol with a single stimulus of given intensity and duration over a constant background"
+    def protocol(CR):
+        center = CR + stimulus_offset
+        return LightSchedule.from_smooth_pulses([background, intensity - background],
+                                                [0.0, center - duration/2.0],
+                                                [CR + 1000.0, center + duration/2.0])
+    return protocol
+
+# %% ../nbs/api/02_prc.ipynb 21
+class ResponseCurveCache:
+    "On-disk cache of the phase, intensity, and dosage response curves of models"
+    def __init__(self,
+                 directory: str=None, # directory where the curves are stored. If None, `$XDG_CACHE_HOME/circadian/response_curves` is used
+                 ) -> None:
+        if directory is None:
+            directory = _default_cache_directory()
+        if not isinstance(directory, str):
+            raise TypeError("directory must be a string")
+        self.directory = directory
+        self._curves = {}
+
+    def _path(self, model, curve, key):
+        "File storing the curve with the given key"
+        return os.path.join(self.directory, f"{type(model).__name__}-{curve}-{key[:16]}.npz")
+
+    def _key(self, model, curve, initial_condition, **description):
+        "Hash of everything that determines a curve"
+        if not isinstance(model, CircadianModel):
+            raise TypeError("model must be a CircadianModel")
+        if initial_condition is None:
+            initial_condition = model._default_initial_condition
+        description.update(version=_CACHE_VERSION, curve=curve, model=type(model).__name__,
+                           parameters={name: float(value) for name, value in model.parameters.items()},
+                           initial_condition=np.asarray(initial_condition, dtype=float).tolist())
+        return hashlib.sha256(json.dumps(description, sort_keys=True, default=float).encode()).hexdigest()
+
+    def _load_or_compute(self, model, curve, key, compute):
+        "Return the curve from memory or disk, or compute and store it"
+        if key in self._curves:
+            return self._curves[key]
+        path = self._path(model, curve, key)
+        if os.path.exists(path):
+            with np.load(path) as stored:
+                if str(stored['key']) == key:
+                    names = [str(name) for name in stored['axes']]
+                    response = ResponseCurve({name: stored[f'axis_{name}'] for name in names}, stored['shifts'])
+                    self._curves[key] = response
+                    return response
+        response = compute()
+        os.makedirs(self.directory, exist_ok=True)
+        arrays = {f'axis_{name}': grid for name, grid in response.axes.items()}
+        # write to a temporary file first so concurrent sessions never read partial curves
+        descriptor, temporary = tempfile.mkstemp(suffix='.npz', dir=self.directory)
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                np.savez(file, key=np.array(key), axes=np.array(list(response.axes)), shifts=response.shifts, **arrays)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+        self._curves[key] = response
+        return response
+
+    def clear(self):
+        "Remove every stored curve"
+        self._curves = {}
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith('.npz'):
+                    os.remove(os.path.join(self.directory, name))
+
+# %% ../nbs/api/02_prc.ipynb 22
+@patch_to(ResponseCurveCache)
+def prc(self,
+        model: CircadianModel, # model to simulate
+        protocol: Callable[[float], LightSchedule]=PhaseResponseCurveLight.khalsa_schedule, # function returning the light schedule of the protocol for a given length of the initial constant routine
+        stimulus_phases: np.ndarray=np.arange(0.0, 24.0, 0.5), # phases of the center of the stimulus in hours after the first CBT minimum
+        initial_condition: np.ndarray=None, # state of the model at the start of the protocol. If None, the model's default initial condition is used
+        **kwargs, # additional arguments of `compute_prc`
+        ) -> ResponseCurve: # phase shifts on the measured stimulus phases
+    "Phase response curve of a protocol, computed with `compute_prc` the first time it is requested"
+    stimulus_phases = np.atleast_1d(np.asarray(stimulus_phases, dtype=float))
+    key = self._key(model, 'prc', initial_condition, phases=stimulus_phases.tolist(), options=kwargs,
+                    protocol=_protocol_spec(protocol, _PRC_SPEC_LENGTHS))
+    def compute():
+        phases, shifts = compute_prc(model, protocol, stimulus_phases, initial_condition=initial_condition, **kwargs)
+        # neighboring stimuli can land on the same measured phase
+        phases, index = np.unique(phases, return_index=True)
+        return ResponseCurve({'phase': phases}, shifts[index])
+    return self._load_or_compute(model, 'prc', key, compute)
+
+
+def _protocol_response(model: CircadianModel, # model to simulate
+                       schedules: list, # light schedule of each stimulus
+                       initial_condition: np.ndarray, # state of the model at the start of the protocol
+                       duration: float, # hours simulated
+                       dt: float, # time step in hours
+                       ) -> np.ndarray: # phase shift of each schedule
+    "Phase shifts of protocols with fixed stimulus timing, simulated in a single batch"
+    if initial_condition is None:
+        initial_condition = model._default_initial_condition
+    time = np.arange(0.0, duration, dt)
+    return _phase_shifts(*_protocol_cbt(model, schedules, time, initial_condition))
+
+
+@patch_to(ResponseCurveCache)
+def irc(self,
+        model: CircadianModel, # model to simulate
+        intensities: np.ndarray=np.geomspace(1.0, 10000.0, 17), # light intensities of the stimulus in lux
+        initial_condition: np.ndarray=None, # state of the model at the start of the protocol. If None, the model's default initial condition is used
+        duration: float=112.0, # hours simulated
+        dt: float=0.1, # time step in hours
+        ) -> ResponseCurve: # phase shifts on the intensities
+    "Intensity response curve of the `IntensityResponseCurveLight` protocol"
+    intensities = np.sort(np.atleast_1d(np.asarray(intensities, dtype=float)))
+    key = self._key(model, 'irc', initial_condition, intensities=intensities.tolist(), duration=duration, dt=dt,
+                    protocol=_protocol_spec(IntensityResponseCurveLight.intensity_schedule, intensities[:1]))
+    def compute():
+        schedules = [IntensityResponseCurveLight.intensity_schedule(intensity) for intensity in intensities]
+        return ResponseCurve({'intensity': intensities}, _protocol_response(model, schedules, initial_condition, duration, dt))
+    return self._load_or_compute(model, 'irc', key, compute)
+
+
+@patch_to(ResponseCurveCache)
+def drc(self,
+        model: CircadianModel, # model to simulate
+        durations: np.ndarray=np.arange(0.5, 8.5, 0.5), # durations of the stimulus in hours
+        initial_condition: np.ndarray=None, # state of the model at the start of the protocol. If None, the model's default initial condition is used
+        duration: float=110.0, # hours simulated
+        dt: float=0.1, # time step in hours
+        ) -> ResponseCurve: # phase shifts on the stimulus durations
+    "Dosage response curve of the `DosageResponseCurve` protocol"
+    durations = np.sort(np.atleast_1d(np.asarray(durations, dtype=float)))
+    key = self._key(model, 'drc', initial_condition, durations=durations.tolist(), duration=duration, dt=dt,
+                    protocol=_protocol_spec(DosageResponseCurve.dosage_schedule, durations[:1]))
+    def compute():
+        schedules = [DosageResponseCurve.dosage_schedule(length) for length in durations]
+        return ResponseCurve({'duration': durations}, _protocol_response(model, schedules, initial_condition, duration, dt))
+    return self._load_or_compute(model, 'drc', key, compute)
+
+
+@patch_to(ResponseCurveCache)
+def surface(self,
+            model: CircadianModel, # model to simulate
+            stimulus_phases: np.ndarray=np.arange(0.0, 24.0, 1.0), # phases of the center of the stimulus in hours after the first CBT minimum
+            intensities: np.ndarray=np.array([100.0, 1000.0, 10000.0]), # light intensities of the stimulus in lux
+            durations: np.ndarray=np.array([1.0, 3.0, 6.5]), # durations of the stimulus in hours
+            background: float=10.0, # light intensity outside of the stimulus in lux
+            initial_condition: np.ndarray=None, # state of the model at the start of the protocol. If None, the model's default initial condition is used
+            **kwargs, # additional arguments of `compute_prc`
+            ) -> ResponseCurve: # phase shifts on the grid of phases, intensities, and durations
+    "Phase shifts of single light pulses over a grid of phases, intensities, and durations"
+    stimulus_phases = np.sort(np.mod(np.atleast_1d(np.asarray(stimulus_phases, dtype=float)), 24.0))
+    intensities = np.sort(np.atleast_1d(np.asarray(intensities, dtype=float)))
+    durations = np.sort(np.atleast_1d(np.asarray(durations, dtype=float)))
+    stimulus_offset = kwargs.get('stimulus_offset', 16.0)
+    key = self._key(model, 'surface', initial_condition, phases=stimulus_phases.tolist(), intensities=intensities.tolist(),
+                    durations=durations.tolist(), options=kwargs,
+                    protocol=_protocol_spec(_pulse_protocol(intensities[0], durations[0], background, stimulus_offset), _PRC_SPEC_LENGTHS))
+    def compute():
+        shifts = np.zeros((len(stimulus_phases), len(intensities), len(durations)))
+        for i, intensity in enumerate(intensities):
+            for j, length in enumerate(durations):
+                protocol = _pulse_protocol(intensity, length, background, stimulus_offset)
+                _, shifts[:, i, j] = compute_prc(model, protocol, stimulus_phases, initial_condition=initial_condition, **kwargs)
+        return ResponseCurve({'phase': stimulus_phases, 'intensity': intensities, 'duration': durations}, shifts)
+    return self._load_or_compute(model, 'surface', key, compute)
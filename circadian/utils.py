@@ -128,23 +128,23 @@ def cal_days_diff(a, b):
 def interpolateLinear(t, xvals, yvals):
     """Implement a faster method to get linear interprolations of the light functions"""
 
-    if (t >= xvals[-1]):
+    if (t > xvals[-1]):
         return (0.0)
-    if (t <= xvals[0]):
+    if (t < xvals[0]):
         t += 24.0
 
-    i = np.searchsorted(xvals, t) - 1
+    i = min(max(np.searchsorted(xvals, t, side='right') - 1, 0), len(xvals) - 2)
     ans = (yvals[i + 1] - yvals[i]) / \
-          ((xvals[i + 1] - xvals[i]) * (t - xvals[i])) + yvals[i]
+          (xvals[i + 1] - xvals[i]) * (t - xvals[i]) + yvals[i]
     return (ans)
 
 
 @jit(nopython=True)
 def interpolateLinearExt(t, xvals, yvals):
     """Implement a faster method to get linear interprolations of the light functions, exclude non-full days"""
-    i = np.searchsorted(xvals, t) - 1
+    i = min(max(np.searchsorted(xvals, t, side='right') - 1, 0), len(xvals) - 2)
     ans = (yvals[i + 1] - yvals[i]) / \
-          ((xvals[i + 1] - xvals[i]) * (t - xvals[i])) + yvals[i]
+          (xvals[i + 1] - xvals[i]) * (t - xvals[i]) + yvals[i]
     return (ans)
 
 